@@ -5,6 +5,52 @@ Pytest configuration file
 import sys
 from pathlib import Path
 
+import pytest
+
 # Add the project root to the Python path
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
+
+
+@pytest.fixture(autouse=True)
+def isolated_ai_cache(tmp_path, monkeypatch):
+    """Keep AI caches and the jobs database created during tests out of data/"""
+    import src.jobs
+    import src.kv_store
+    from src.config import Config
+
+    monkeypatch.setattr(Config, "AI_CACHE_DIR", str(tmp_path / "ai_cache"))
+    monkeypatch.setattr(Config, "ANALYSIS_DB", str(tmp_path / "analysis.sqlite3"))
+    monkeypatch.setattr(Config, "JOBS_DB", str(tmp_path / "jobs.sqlite3"))
+    monkeypatch.setattr(src.kv_store, "analysis_store", None)
+    monkeypatch.setattr(src.jobs, "job_runner", None)
+
+
+@pytest.fixture
+def reload_stats(tmp_path, monkeypatch):
+    """Reload the app from an edited copy of the stats file.
+
+    Call with a function that edits the loaded stats dict in place; the
+    original data is reloaded afterwards.
+    """
+    import json
+
+    from src.app import app
+    from src.config import Config
+
+    original = Config.STATS_FILE
+
+    def reload(edit):
+        with open(original) as f:
+            stats = json.load(f)
+        edit(stats)
+        path = tmp_path / "stats.json"
+        path.write_text(json.dumps(stats))
+        monkeypatch.setattr(Config, "STATS_FILE", str(path))
+        with app.test_client() as client:
+            assert client.post("/api/reload-data").status_code == 200
+
+    yield reload
+    monkeypatch.setattr(Config, "STATS_FILE", original)
+    with app.test_client() as client:
+        client.post("/api/reload-data")
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Memory benchmark: JSON dict layout vs compact records.
+
+Generates a synthetic 20-season archive, loads it the way DataManager does
+(json.loads), and measures the Python heap retained by each layout with
+tracemalloc.
+
+Usage:
+    python scripts/benchmark_memory.py [--seasons 20] [--games 25]
+"""
+
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.records import compact_games, format_pct, intern_game_strings
+
+OPPONENTS = [
+    "Banks", "De La Salle", "Gladstone", "Horizon", "Jefferson", "Knappa",
+    "Mid Pacific", "OES", "Pleasant Hill", "Regis", "Scappoose", "Tillamook",
+    "Western", "Westside", "Riverdale", "Catlin Gabel",
+]
+LAST_NAMES = [
+    "Lomber", "Post", "Bonnett", "Schaal", "Frank", "Galan", "Reed", "Ortiz",
+    "Nguyen", "Baker", "Hayes", "Kim", "Lopez", "Marsh", "Price", "Stone",
+]
+
+
+def synthetic_archive(seasons: int, games_per_season: int, seed: int = 7) -> str:
+    """Build a multi-season archive as JSON text in the vc_stats layout"""
+    rng = random.Random(seed)
+    games = []
+    game_id = 1
+    for season in range(seasons):
+        roster = [
+            f"{chr(65 + rng.randrange(26))} {rng.choice(LAST_NAMES)}{season}"
+            for _ in range(12)
+        ]
+        for g in range(games_per_season):
+            player_stats = []
+            for number, name in enumerate(roster):
+                fga = rng.randint(0, 20)
+                fg = rng.randint(0, fga)
+                fg3a = rng.randint(0, fga)
+                fg3 = rng.randint(0, min(fg, fg3a))
+                fta = rng.randint(0, 10)
+                ft = rng.randint(0, fta)
+                player_stats.append(
+                    {
+                        "number": number,
+                        "name": name,
+                        "fg_made": fg,
+                        "fg_att": fga,
+                        "fg_pct": format_pct(fg, fga),
+                        "fg3_made": fg3,
+                        "fg3_att": fg3a,
+                        "fg3_pct": format_pct(fg3, fg3a),
+                        "ft_made": ft,
+                        "ft_att": fta,
+                        "ft_pct": format_pct(ft, fta),
+                        "oreb": rng.randint(0, 5),
+                        "dreb": rng.randint(0, 8),
+                        "fouls": rng.randint(0, 5),
+                        "stl": rng.randint(0, 5),
+                        "to": rng.randint(0, 6),
+                        "blk": rng.randint(0, 3),
+                        "asst": rng.randint(0, 8),
+                        "pts": 2 * (fg - fg3) + 3 * fg3 + ft,
+                        "plus_minus": rng.randint(-20, 20),
+                    }
+                )
+            vc_score = sum(p["pts"] for p in player_stats)
+            opp_score = rng.randint(35, 90)
+            games.append(
+                {
+                    "gameId": game_id,
+                    "date": f"Dec {g % 28 + 1}, {2006 + season}",
+                    "opponent": rng.choice(OPPONENTS),
+                    "location": rng.choice(["home", "away"]),
+                    "vc_score": vc_score,
+                    "opp_score": opp_score,
+                    "result": "W" if vc_score > opp_score else "L",
+                    "team_stats": {
+                        "fg": sum(p["fg_made"] for p in player_stats),
+                        "fga": sum(p["fg_att"] for p in player_stats),
+                        "fg3": sum(p["fg3_made"] for p in player_stats),
+                        "fg3a": sum(p["fg3_att"] for p in player_stats),
+                        "ft": sum(p["ft_made"] for p in player_stats),
+                        "fta": sum(p["ft_att"] for p in player_stats),
+                        "oreb": sum(p["oreb"] for p in player_stats),
+                        "dreb": sum(p["dreb"] for p in player_stats),
+                        "reb": sum(p["oreb"] + p["dreb"] for p in player_stats),
+                        "asst": sum(p["asst"] for p in player_stats),
+                        "to": sum(p["to"] for p in player_stats),
+                        "stl": sum(p["stl"] for p in player_stats),
+                        "blk": sum(p["blk"] for p in player_stats),
+                        "fouls": sum(p["fouls"] for p in player_stats),
+                    },
+                    "player_stats": player_stats,
+                }
+            )
+            game_id += 1
+    return json.dumps({"games": games})
+
+
+def measure(build) -> int:
+    """Bytes of Python heap still held by the object build() returns"""
+    gc.collect()
+    tracemalloc.start()
+    obj = build()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del obj
+    return current
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seasons", type=int, default=20)
+    parser.add_argument("--games", type=int, default=25)
+    args = parser.parse_args()
+
+    text = synthetic_archive(args.seasons, args.games)
+
+    def dict_layout():
+        return json.loads(text)["games"]
+
+    def interned_layout():
+        games = json.loads(text)["games"]
+        intern_game_strings(games)
+        return games
+
+    def compact_layout():
+        return compact_games(json.loads(text)["games"])
+
+    games = json.loads(text)["games"]
+    lines = sum(len(g["player_stats"]) for g in games)
+    assert [g.to_dict() for g in compact_games(games)] == games
+    del games
+
+    print(f"Synthetic archive: {args.seasons} seasons, {args.games} games/season, "
+          f"{lines} player lines ({len(text) / 1e6:.1f} MB JSON)")
+
+    baseline = measure(dict_layout)
+    for label, size in [
+        ("dict layout", baseline),
+        ("dict layout, interned strings", measure(interned_layout)),
+        ("compact records", measure(compact_layout)),
+    ]:
+        print(f"  {label:32s} {size / 1e6:8.2f} MB  ({size / baseline:5.1%})")
+
+
+if __name__ == "__main__":
+    main()
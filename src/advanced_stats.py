@@ -4,7 +4,9 @@ Calculates comprehensive metrics from box score data.
 """
 
 import statistics
-from typing import Dict, List, Any, Optional
+from typing import Callable, Dict, List, Any, Optional, Tuple
+
+from src.running_stats import RunningStats
 
 # Constants
 FREE_THROW_POSSESSION_FACTOR = 0.44
@@ -14,15 +16,49 @@ SECONDARY_SCORER_THRESHOLD = 10.0
 TURNOVER_THRESHOLD = 13
 FG_PERCENTAGE_THRESHOLD = 44.0
 
+# Display labels for the team stats swept by calculate_stat_thresholds
+STAT_LABELS = {
+    "fg": "FGM",
+    "fga": "FGA",
+    "fg3": "3PM",
+    "fg3a": "3PA",
+    "ft": "FTM",
+    "fta": "FTA",
+    "oreb": "OREB",
+    "dreb": "DREB",
+    "reb": "REB",
+    "asst": "AST",
+    "to": "TO",
+    "stl": "STL",
+    "blk": "BLK",
+    "fouls": "Fouls",
+    "fg_pct": "FG%",
+    "fg3_pct": "3P%",
+    "ft_pct": "FT%",
+}
+SHOOTING_PCTS = {
+    "fg_pct": ("fg", "fga"),
+    "fg3_pct": ("fg3", "fg3a"),
+    "ft_pct": ("ft", "fta"),
+}
+
 
 class AdvancedStatsCalculator:
     """Calculate advanced metrics from box score data"""
 
-    def __init__(self, stats_data: Dict):
+    def __init__(
+        self,
+        stats_data: Dict,
+        game_logs: Optional[Callable[[str], List[Dict]]] = None,
+        running_stats: Optional[RunningStats] = None,
+    ):
         self.stats_data = stats_data
         self.games = stats_data.get("games", [])
         self.season_team_stats = stats_data.get("season_team_stats", {})
         self.season_player_stats = stats_data.get("season_player_stats", {})
+        self._game_logs = game_logs
+        # Per-game means/variances, kept by the data manager when available
+        self.running_stats = running_stats or RunningStats(self.games)
 
     # =========================================================================
     # Team Stats
@@ -199,10 +235,10 @@ class AdvancedStatsCalculator:
         est_poss = fga + 0.44 * fta + to
         to_rate = (to / est_poss * 100) if est_poss > 0 else 0
 
-        # Game logs for consistency
-        game_logs = self.stats_data.get("player_game_logs", {}).get(player_name, [])
-        pts_list = [g.get("stats", g).get("pts", 0) for g in game_logs]
-        pts_variance = self._variance(pts_list)
+        # Consistency from the running per-game accumulators
+        pts_stat = self.running_stats.player(player_name, "pts")
+        pts_variance = pts_stat.variance if pts_stat else 0
+        game_logs = self._player_game_logs(player_name)
 
         # Clutch games
         clutch_games = [
@@ -406,52 +442,56 @@ class AdvancedStatsCalculator:
             "total_losses": len(losses),
         }
 
+    def calculate_stat_thresholds(self) -> List[Dict]:
+        """Best win/loss cut point for every team stat, most decisive first.
+
+        Each stat's games are sorted once and every cut between distinct
+        values is scored in a single pass (O(n log n) per stat), keeping the
+        cut with the lowest weighted Gini impurity. The rule describes the
+        side of the cut with the better record.
+        """
+        thresholds = []
+        for stat in STAT_LABELS:
+            samples = []
+            for g in self.games:
+                value = self._game_stat(g, stat)
+                if value is not None and g.get("result") in ("W", "L"):
+                    samples.append((value, g["result"] == "W"))
+            best = _best_cut(samples)
+            if best is not None:
+                thresholds.append({"stat": stat, "label": STAT_LABELS[stat], **best})
+        return sorted(thresholds, key=lambda t: t["gain"], reverse=True)
+
     def calculate_volatility_metrics(self) -> Dict:
-        """Calculate variance and consistency metrics"""
-        game_pts = [g["vc_score"] for g in self.games]
-        game_fg = [
-            g["team_stats"]["fg"] / g["team_stats"]["fga"] * 100
-            for g in self.games
-            if g["team_stats"]["fga"] > 0
-        ]
-        game_tos = [g["team_stats"]["to"] for g in self.games]
+        """Calculate variance and consistency metrics from running accumulators"""
+        team = self.running_stats.team
+        pts = team["vc_score"]
 
         team_volatility = {
-            "ppg_std_dev": (
-                round(statistics.stdev(game_pts), 1) if len(game_pts) > 1 else 0
-            ),
-            "ppg_range": f"{min(game_pts)}-{max(game_pts)}" if game_pts else "0-0",
-            "fg_pct_std_dev": (
-                round(statistics.stdev(game_fg), 1) if len(game_fg) > 1 else 0
-            ),
-            "to_std_dev": (
-                round(statistics.stdev(game_tos), 1) if len(game_tos) > 1 else 0
-            ),
+            "ppg_std_dev": round(pts.stdev, 1),
+            "ppg_range": f"{pts.min}-{pts.max}" if pts.count else "0-0",
+            "fg_pct_std_dev": round(team["fg_pct"].stdev, 1),
+            "to_std_dev": round(team["to"].stdev, 1),
         }
 
-        # Top 5 scorers volatility
-        top_scorers = sorted(
+        # Every player with more than one game, top scorers first
+        scorers = sorted(
             self.season_player_stats.values(),
             key=lambda x: x.get("ppg", 0),
             reverse=True,
-        )[:5]
+        )
 
         player_volatility = []
-        logs = self.stats_data.get("player_game_logs", {})
-
-        for p in top_scorers:
-            name = p.get("name")
-            if not name or name not in logs:
-                continue
 
-            pts_list = [g.get("stats", g).get("pts", 0) for g in logs[name]]
-            if len(pts_list) > 1:
+        for p in scorers:
+            stat = self.running_stats.player(p.get("name"), "pts")
+            if stat is not None and stat.count > 1:
                 player_volatility.append(
                     {
-                        "name": name,
+                        "name": p["name"],
                         "ppg": p.get("ppg", 0),
-                        "std_dev": round(statistics.stdev(pts_list), 1),
-                        "range": f"{min(pts_list)}-{max(pts_list)}",
+                        "std_dev": round(stat.stdev, 1),
+                        "range": f"{stat.min}-{stat.max}",
                     }
                 )
 
@@ -460,8 +500,10 @@ class AdvancedStatsCalculator:
             "player_volatility": player_volatility,
         }
 
-    def generate_auto_insights(self) -> List[str]:
-        """Generate data-driven insights"""
+    def generate_auto_insights(
+        self, thresholds: Optional[List[Dict]] = None
+    ) -> List[str]:
+        """Generate data-driven insights; pass cached thresholds to reuse them"""
         insights = []
         patterns = self.calculate_win_loss_patterns()
 
@@ -480,12 +522,14 @@ class AdvancedStatsCalculator:
                 f"In losses: {patterns['loss_conditions']['avg_to']:.1f} TO vs {patterns['win_conditions']['avg_to']:.1f} in wins"
             )
 
-        insights.append(
-            f"Record with TO ≤ 13: {patterns['threshold_records']['to_13_or_less']}"
-        )
-        insights.append(
-            f"Record with FG% ≥ 44%: {patterns['threshold_records']['fg_44_or_higher']}"
-        )
+        if thresholds is None:
+            thresholds = self.calculate_stat_thresholds()
+        for t in thresholds[:2]:
+            unit = "%" if t["stat"] in SHOOTING_PCTS else ""
+            insights.append(
+                f"Record with {t['label']} {t['rule']} {t['cut']}{unit}: "
+                f"{t['record']} ({t['other_record']} otherwise)"
+            )
 
         return insights
 
@@ -493,14 +537,19 @@ class AdvancedStatsCalculator:
     # Helpers
     # =========================================================================
 
-    def _variance(self, values: List[float]) -> float:
-        """Calculate variance safely"""
-        if len(values) < 2:
-            return 0
-        try:
-            return statistics.variance(values)
-        except:
-            return 0
+    def _player_game_logs(self, player_name: str) -> List[Dict]:
+        """Game logs from the data manager, or from stats_data if none given"""
+        if self._game_logs is not None:
+            return self._game_logs(player_name)
+        return self.stats_data.get("player_game_logs", {}).get(player_name, [])
+
+    def _game_stat(self, game: Dict, stat: str) -> Optional[float]:
+        """A team stat for one game; shooting percentages need attempts"""
+        ts = game.get("team_stats", {})
+        if stat in SHOOTING_PCTS:
+            made, att = SHOOTING_PCTS[stat]
+            return ts[made] / ts[att] * 100 if ts.get(att) else None
+        return ts.get(stat)
 
     def _classify_role(self, ppg: float, rpg: float, apg: float, usage: float) -> str:
         """Classify player role based on stats"""
@@ -517,3 +566,47 @@ class AdvancedStatsCalculator:
         elif ppg < 8 and rpg < 5 and apg < 3:
             return "Role Player"
         return "All-Around"
+
+
+def _best_cut(samples: List[Tuple[float, bool]]) -> Optional[Dict]:
+    """Sweep sorted (value, won) pairs for the cut that best splits W from L"""
+    samples = sorted(samples)
+    n = len(samples)
+    wins = sum(won for _, won in samples)
+    if wins in (0, n):
+        return None
+
+    def impurity(count, won):
+        # count * Gini impurity of a side with `won` wins
+        return count - (won * won + (count - won) ** 2) / count
+
+    best = None
+    left_n = left_w = 0
+    for i, (value, won) in enumerate(samples[:-1]):
+        left_n += 1
+        left_w += won
+        if samples[i + 1][0] == value:
+            continue
+        right_n, right_w = n - left_n, wins - left_w
+        score = impurity(left_n, left_w) + impurity(right_n, right_w)
+        if best is None or score < best[0]:
+            best = (score, i, left_n, left_w, right_n, right_w)
+    if best is None:
+        return None
+
+    score, i, left_n, left_w, right_n, right_w = best
+    low = (left_w, left_n - left_w, samples[i][0], "≤")
+    high = (right_w, right_n - right_w, samples[i + 1][0], "≥")
+    if right_w / right_n > left_w / left_n:
+        low, high = high, low
+    won, lost, cut, rule = low
+    other_won, other_lost = high[0], high[1]
+    return {
+        "rule": rule,
+        "cut": round(cut, 1),
+        "record": f"{won}-{lost}",
+        "win_pct": round(won / (won + lost) * 100, 1),
+        "other_record": f"{other_won}-{other_lost}",
+        "other_win_pct": round(other_won / (other_won + other_lost) * 100, 1),
+        "gain": round((impurity(n, wins) - score) / n, 4),
+    }
@@ -2,74 +2,332 @@
 OpenAI API integration for AI-powered basketball analysis
 """
 
+import hashlib
+import json
 import logging
+import os
+import random
+import re
+import threading
+import time
 import requests
-from typing import Optional, List, Dict, Any
-from src.config import Config, EXCLUDED_PLAYERS, MAX_TOKENS
+from collections import OrderedDict
+from concurrent.futures import Future
+from contextlib import contextmanager
+from datetime import date, datetime, timezone
+from email.utils import parsedate_to_datetime
+from requests.adapters import HTTPAdapter
+from typing import Optional, List, Dict, Any, Iterator
+from src.config import Config, CONTEXT_TOKENS, EXCLUDED_PLAYERS, MAX_TOKENS
+from src.export import parse_game_date
+
+try:
+    import fcntl
+except ImportError:  # Windows: coalescing stays per-process
+    fcntl = None
 
 logger = logging.getLogger(__name__)
 
+# Rate limiting and transient server errors are worth retrying
+RETRY_STATUSES = {429, 500, 502, 503, 504}
 
-class AIService:
-    """Handles all OpenAI API interactions"""
+# Share of ResponseCache.max_files kept when the disk tier is trimmed
+EVICT_TO = 0.9
+
+
+class ResponseCache:
+    """Content-addressed cache of model replies.
+
+    Keys are a hash of everything that determines the reply (model, messages
+    including the system prompt, temperature, max_tokens). Entries live in a
+    size-bounded in-memory LRU backed by one JSON file per key on disk, so
+    they survive restarts and are shared between workers. Both tiers expire
+    entries after ``ttl`` seconds.
+    """
+
+    def __init__(self, directory: str, ttl: float, max_entries: int, max_files: int):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_files = max_files
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Files on disk as last counted plus writes since; None until counted
+        self._file_count: Optional[int] = None
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(payload: Dict[str, Any]) -> str:
+        fields = {
+            k: payload.get(k)
+            for k in ("model", "messages", "temperature", "max_tokens")
+        }
+        raw = json.dumps(fields, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._memory.move_to_end(key)
+                    return entry[1]
+                del self._memory[key]
+
+        try:
+            with open(self._path(key)) as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            return None
+        expires_at = stored.get("created_at", 0) + self.ttl
+        if expires_at <= now:
+            self._remove_file(key)
+            return None
+        self._remember(key, expires_at, stored["response"])
+        return stored["response"]
+
+    def set(self, key: str, response: str):
+        now = time.time()
+        self._remember(key, now + self.ttl, response)
+
+        # Write to a temp file and rename so readers never see partial JSON
+        tmp_path = f"{self._path(key)}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump({"created_at": now, "response": response}, f)
+            os.replace(tmp_path, self._path(key))
+        except OSError as e:
+            logger.warning(f"AI cache write failed: {e}")
+            return
+
+        with self._lock:
+            if self._file_count is not None:
+                self._file_count += 1
+            over_limit = self._file_count is None or self._file_count > self.max_files
+        if over_limit:
+            self._evict_files()
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._file_count = None
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".json"):
+                self._remove_file(entry.name[:-5])
+
+    @contextmanager
+    def lock(self, key: str, timeout: float):
+        """Cross-process lock for one key, held while one worker fills it.
+
+        Each key has its own lock file, so unrelated requests never wait on
+        each other. The holder removes the file once the reply is cached: a
+        worker that still takes the old lock re-checks the cache and finds
+        the reply, so no second upstream call is made.
+        Yields False (unlocked) if the lock cannot be taken within timeout,
+        so a wedged worker delays callers rather than blocking them forever.
+        """
+        if fcntl is None:
+            yield False
+            return
+        lock_dir = os.path.join(self.directory, "locks")
+        lock_path = os.path.join(lock_dir, f"{key}.lock")
+        try:
+            os.makedirs(lock_dir, exist_ok=True)
+            fd = os.open(lock_path, os.O_RDWR | os.O_CREAT)
+        except OSError as e:
+            logger.warning(f"AI cache lock unavailable: {e}")
+            yield False
+            return
+
+        try:
+            deadline = time.monotonic() + timeout
+            while True:
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    locked = True
+                    break
+                except BlockingIOError:
+                    if time.monotonic() >= deadline:
+                        locked = False
+                        break
+                    time.sleep(0.05)
+            try:
+                yield locked
+            finally:
+                if locked:
+                    if os.path.exists(self._path(key)):
+                        try:
+                            os.remove(lock_path)
+                        except OSError:
+                            pass
+                    fcntl.flock(fd, fcntl.LOCK_UN)
+        finally:
+            os.close(fd)
+
+    def _remember(self, key: str, expires_at: float, response: str):
+        with self._lock:
+            self._memory[key] = (expires_at, response)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def _evict_files(self):
+        """Count the cache files and, beyond max_files, drop the oldest.
+
+        set() only calls this once its running count passes max_files, and
+        eviction goes down to EVICT_TO of the limit, so a full cache is
+        rescanned every tenth of max_files writes rather than on each one.
+        Entries that other workers remove during the scan are skipped.
+        """
+        files = []
+        try:
+            for entry in os.scandir(self.directory):
+                if not entry.name.endswith(".json"):
+                    continue
+                try:
+                    files.append((entry.stat().st_mtime, entry.name[:-5]))
+                except OSError:
+                    continue
+        except OSError:
+            return
+        if len(files) > self.max_files:
+            keep = int(self.max_files * EVICT_TO)
+            files.sort()
+            for _, key in files[: len(files) - keep]:
+                self._remove_file(key)
+            files = files[len(files) - keep :]
+        with self._lock:
+            self._file_count = len(files)
+
+    def _remove_file(self, key: str):
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+
+class BaseAIService:
+    """Settings, payloads and error handling shared by the sync and async clients"""
 
     def __init__(self):
         self.api_key = Config.OPENAI_API_KEY
         self.api_url = Config.OPENAI_API_URL
         self.model = Config.OPENAI_MODEL
         self.timeout = Config.OPENAI_TIMEOUT
+        self.max_retries = Config.OPENAI_MAX_RETRIES
+        self.backoff_base = Config.OPENAI_BACKOFF_BASE
+        self.backoff_max = Config.OPENAI_BACKOFF_MAX
+        self.cache = ResponseCache(
+            Config.AI_CACHE_DIR,
+            Config.AI_CACHE_TTL,
+            Config.AI_CACHE_MAX_ENTRIES,
+            Config.AI_CACHE_MAX_FILES,
+        )
 
     @property
     def is_configured(self) -> bool:
         """Check if OpenAI API is configured"""
         return bool(self.api_key)
 
-    def call_api(
-        self,
-        system_prompt: str,
-        user_message: str,
-        max_tokens: int = 1500,
-        temperature: float = 0.7,
-        model: Optional[str] = None,
-    ) -> str:
-        """Make API call to OpenAI"""
-        if not self.is_configured:
-            raise ValueError("OpenAI API key not configured")
-
-        headers = {
+    @property
+    def _headers(self) -> Dict[str, str]:
+        return {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json",
         }
 
-        payload = {
+    @staticmethod
+    def _history_messages(
+        system_prompt: str, message: str, history: List[Dict[str, str]]
+    ) -> List[Dict[str, str]]:
+        """System prompt, the last 10 history turns, then the new message"""
+        messages = [{"role": "system", "content": system_prompt}]
+        for msg in history[-10:]:
+            messages.append(
+                {"role": msg.get("role", "user"), "content": msg.get("content", "")}
+            )
+        messages.append({"role": "user", "content": message})
+        return messages
+
+    def _payload(
+        self,
+        messages: List[Dict[str, str]],
+        max_tokens: int,
+        temperature: float,
+        model: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        return {
             "model": model or self.model,
-            "messages": [
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_message},
-            ],
+            "messages": messages,
             "temperature": temperature,
             "max_tokens": max_tokens,
         }
 
-        try:
-            response = requests.post(
-                self.api_url, headers=headers, json=payload, timeout=self.timeout
-            )
-            response.raise_for_status()
-            data = response.json()
-            return data["choices"][0]["message"]["content"]
+    def _retry_delay(self, attempt: int, retry_after: Optional[str]) -> Optional[float]:
+        """Seconds to wait before the next attempt, or None to give up.
+
+        A Retry-After header is honored as given; if it asks for longer than
+        backoff_max the request fails now instead of holding the caller.
+        Otherwise the wait is exponential with full jitter.
+        """
+        if retry_after:
+            delay = _parse_retry_after(retry_after)
+            if delay is not None:
+                return delay if delay <= self.backoff_max else None
+        ceiling = min(self.backoff_max, self.backoff_base * 2**attempt)
+        return random.uniform(0, ceiling)
+
+    def _handle_http_error(self, error: Exception):
+        """Handle HTTP errors from OpenAI API (requests or httpx status errors)"""
+        status = error.response.status_code
+        if status == 429:
+            logger.error("OpenAI API rate limit exceeded")
+            raise APIError("AI service rate limit - please wait a moment")
+        elif status == 401:
+            logger.error("OpenAI API authentication failed")
+            raise APIError("AI service authentication error")
+        else:
+            logger.error(f"OpenAI API HTTP error: {error}")
+            raise APIError("AI service error - please try again")
 
-        except requests.exceptions.Timeout:
-            logger.error("OpenAI API timeout")
-            raise APIError("AI service timeout - please try again")
-        except requests.exceptions.HTTPError as e:
-            self._handle_http_error(e)
-        except requests.exceptions.RequestException as e:
-            logger.error(f"OpenAI API request failed: {e}")
-            raise APIError("AI service connection error")
-        except (KeyError, IndexError) as e:
-            logger.error(f"OpenAI API response format error: {e}")
-            raise APIError("AI service response error")
+
+class AIService(BaseAIService):
+    """Handles all OpenAI API interactions"""
+
+    def __init__(self):
+        super().__init__()
+        self.session = self._build_session(Config.OPENAI_POOL_SIZE)
+        self._inflight: Dict[str, Future] = {}
+        self._inflight_lock = threading.Lock()
+
+    @staticmethod
+    def _build_session(pool_size: int) -> requests.Session:
+        """Keep-alive session so calls reuse pooled TCP/TLS connections"""
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def call_api(
+        self,
+        system_prompt: str,
+        user_message: str,
+        max_tokens: int = 1500,
+        temperature: float = 0.7,
+        model: Optional[str] = None,
+        use_cache: bool = True,
+    ) -> str:
+        """Make API call to OpenAI"""
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_message},
+        ]
+        return self._complete(messages, max_tokens, temperature, model, use_cache)
 
     def call_with_history(
         self,
@@ -77,61 +335,229 @@ class AIService:
         message: str,
         history: List[Dict[str, str]],
         max_tokens: int = 1000,
+        use_cache: bool = True,
     ) -> str:
         """Make API call with conversation history"""
+        messages = self._history_messages(system_prompt, message, history)
+        return self._complete(messages, max_tokens, 0.7, use_cache=use_cache)
+
+    def _complete(
+        self,
+        messages: List[Dict[str, str]],
+        max_tokens: int,
+        temperature: float,
+        model: Optional[str] = None,
+        use_cache: bool = True,
+    ) -> str:
+        """Send a chat completion request and return the reply text.
+
+        Identical requests are answered from the response cache, and concurrent
+        misses for the same request share one upstream call; use_cache=False
+        skips both (the fresh reply is still stored).
+        """
         if not self.is_configured:
             raise ValueError("OpenAI API key not configured")
 
-        messages = [{"role": "system", "content": system_prompt}]
+        payload = self._payload(messages, max_tokens, temperature, model)
+        cache_key = self.cache.key(payload)
+        if not use_cache:
+            return self._fetch(payload, cache_key)
+
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+        return self._single_flight(payload, cache_key)
+
+    def _single_flight(self, payload: Dict[str, Any], cache_key: str) -> str:
+        """Coalesce concurrent cache misses for one key into one upstream call.
+
+        Within the process, followers wait on the leader's Future. Across
+        gunicorn workers, leaders serialize on the cache's lock file and
+        re-check the disk cache once they hold it.
+        """
+        with self._inflight_lock:
+            flight = self._inflight.get(cache_key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[cache_key] = Future()
+        if not leader:
+            return flight.result()
 
-        # Add recent history
-        for msg in history[-10:]:
-            messages.append(
-                {"role": msg.get("role", "user"), "content": msg.get("content", "")}
-            )
+        try:
+            lock_timeout = self.timeout * (self.max_retries + 1)
+            with self.cache.lock(cache_key, lock_timeout):
+                content = self.cache.get(cache_key)
+                if content is None:
+                    content = self._fetch(payload, cache_key)
+        except BaseException as e:
+            flight.set_exception(e)
+            raise
+        else:
+            flight.set_result(content)
+            return content
+        finally:
+            with self._inflight_lock:
+                del self._inflight[cache_key]
+
+    def _fetch(self, payload: Dict[str, Any], cache_key: str) -> str:
+        """Call the API and store the reply under cache_key"""
+        with self._api_errors():
+            data = self._post(payload)
+            content = data["choices"][0]["message"]["content"]
+            _log_token_usage(payload, data.get("usage"))
+            self.cache.set(cache_key, content)
+            return content
+
+    def stream_api(
+        self,
+        system_prompt: str,
+        user_message: str,
+        max_tokens: int = 1500,
+        temperature: float = 0.7,
+        model: Optional[str] = None,
+        use_cache: bool = True,
+    ) -> Iterator[str]:
+        """Like call_api, but yields the reply in pieces as it is generated"""
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_message},
+        ]
+        return self._stream(messages, max_tokens, temperature, model, use_cache)
 
-        messages.append({"role": "user", "content": message})
+    def stream_with_history(
+        self,
+        system_prompt: str,
+        message: str,
+        history: List[Dict[str, str]],
+        max_tokens: int = 1000,
+        use_cache: bool = True,
+    ) -> Iterator[str]:
+        """Like call_with_history, but yields the reply in pieces"""
+        messages = self._history_messages(system_prompt, message, history)
+        return self._stream(messages, max_tokens, 0.7, use_cache=use_cache)
 
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json",
-        }
+    def _stream(
+        self,
+        messages: List[Dict[str, str]],
+        max_tokens: int,
+        temperature: float,
+        model: Optional[str] = None,
+        use_cache: bool = True,
+    ) -> Iterator[str]:
+        """Yield reply text deltas using the API's stream mode.
 
-        payload = {
-            "model": self.model,
-            "messages": messages,
-            "temperature": 0.7,
-            "max_tokens": max_tokens,
-        }
+        A cached reply is yielded whole. A stream that runs to completion is
+        stored in the response cache under the same key as a normal call.
+        """
+        if not self.is_configured:
+            raise ValueError("OpenAI API key not configured")
 
+        payload = self._payload(messages, max_tokens, temperature, model)
+        cache_key = self.cache.key(payload)
+        if use_cache:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                yield cached
+                return
+
+        parts = []
+        _log_token_usage(payload)
+        with self._api_errors():
+            with self._send({**payload, "stream": True}, stream=True) as response:
+                for line in response.iter_lines():
+                    if not line.startswith(b"data:"):
+                        continue
+                    data = line[5:].strip()
+                    if data == b"[DONE]":
+                        break
+                    delta = json.loads(data)["choices"][0].get("delta", {})
+                    if delta.get("content"):
+                        parts.append(delta["content"])
+                        yield delta["content"]
+        self.cache.set(cache_key, "".join(parts))
+
+    @contextmanager
+    def _api_errors(self):
+        """Translate transport and response errors into APIError"""
         try:
-            response = requests.post(
-                self.api_url, headers=headers, json=payload, timeout=self.timeout
-            )
-            response.raise_for_status()
-            data = response.json()
-            return data["choices"][0]["message"]["content"]
-
+            yield
         except requests.exceptions.Timeout:
+            logger.error("OpenAI API timeout")
             raise APIError("AI service timeout - please try again")
         except requests.exceptions.HTTPError as e:
             self._handle_http_error(e)
         except requests.exceptions.RequestException as e:
             logger.error(f"OpenAI API request failed: {e}")
             raise APIError("AI service connection error")
+        except (KeyError, IndexError, ValueError) as e:
+            logger.error(f"OpenAI API response format error: {e}")
+            raise APIError("AI service response error")
+
+    def _post(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """POST to the API and return the decoded JSON reply"""
+        return self._send(payload).json()
+
+    def _send(self, payload: Dict[str, Any], stream: bool = False) -> requests.Response:
+        """POST to the API, retrying 429/5xx with backoff"""
+        attempt = 0
+        while True:
+            response = self.session.post(
+                self.api_url,
+                headers=self._headers,
+                json=payload,
+                timeout=self.timeout,
+                stream=stream,
+            )
+            if response.status_code in RETRY_STATUSES and attempt < self.max_retries:
+                delay = self._retry_delay(attempt, response.headers.get("Retry-After"))
+                if delay is not None:
+                    logger.warning(
+                        f"OpenAI API returned {response.status_code}, "
+                        f"retrying in {delay:.2f}s ({attempt + 1}/{self.max_retries})"
+                    )
+                    response.close()
+                    time.sleep(delay)
+                    attempt += 1
+                    continue
+            if not response.ok:
+                response.close()
+            response.raise_for_status()
+            return response
 
-    def _handle_http_error(self, error: requests.exceptions.HTTPError):
-        """Handle HTTP errors from OpenAI API"""
-        status = error.response.status_code
-        if status == 429:
-            logger.error("OpenAI API rate limit exceeded")
-            raise APIError("AI service rate limit - please wait a moment")
-        elif status == 401:
-            logger.error("OpenAI API authentication failed")
-            raise APIError("AI service authentication error")
-        else:
-            logger.error(f"OpenAI API HTTP error: {error}")
-            raise APIError("AI service error - please try again")
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for English prompt text (about 4 characters each)"""
+    return (len(text) + 3) // 4
+
+
+def _log_token_usage(payload: Dict[str, Any], usage: Optional[Dict] = None):
+    """Log estimated prompt size, plus the API's own counts when reported"""
+    estimate = sum(estimate_tokens(m.get("content", "")) for m in payload["messages"])
+    message = (
+        f"AI call: ~{estimate} prompt tokens estimated, "
+        f"max_tokens={payload.get('max_tokens')}"
+    )
+    if usage:
+        message += (
+            f", usage prompt={usage.get('prompt_tokens')}"
+            f" completion={usage.get('completion_tokens')}"
+        )
+    logger.info(message)
+
+
+def _parse_retry_after(value: str) -> Optional[float]:
+    """Parse Retry-After as delta-seconds or an HTTP date"""
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max((when - datetime.now(timezone.utc)).total_seconds(), 0.0)
 
 
 class APIError(Exception):
@@ -140,26 +566,68 @@ class APIError(Exception):
     pass
 
 
-def build_stats_context(data_manager) -> str:
-    """Generate comprehensive stats context for AI analysis.
+def build_stats_context(data_manager, compact: bool = False) -> str:
+    """Stats context for AI prompts, built once per data version.
 
-    This function always accesses the current data from data_manager,
-    including any newly added games and updated player statistics.
-    Call data_manager.reload() first if you need to refresh from files.
+    The text is memoized on the data manager, so it stays current: a reload
+    bumps the data version and the next call rebuilds it. ``compact`` drops
+    per-game team lines and top scorers and shortens player lines, for
+    prompts that need the season picture rather than the box scores.
     """
-    games = sorted(data_manager.games, key=lambda x: x["gameId"])
-    season_stats = data_manager.season_team_stats
+    key = "stats_context:compact" if compact else "stats_context:full"
+    return data_manager.memoize(key, lambda: _stats_context(data_manager, compact))
 
+
+def _stats_context(data_manager, compact: bool) -> str:
+    season_stats = data_manager.season_team_stats
     if not season_stats:
         return "No season statistics available"
 
-    total_games = season_stats.get("win", 0) + season_stats.get("loss", 0)
-    win_pct = (season_stats.get("win", 0) / total_games * 100) if total_games > 0 else 0
+    games = sorted(data_manager.games, key=lambda x: x["gameId"])
+    wins, losses = season_stats.get("win", 0), season_stats.get("loss", 0)
+    total_games = wins + losses
+    win_pct = (wins / total_games * 100) if total_games > 0 else 0
+    players = sorted(
+        (
+            (name, stats)
+            for name, stats in data_manager.season_player_stats.items()
+            if name not in EXCLUDED_PLAYERS
+        ),
+        key=lambda x: x[1].get("ppg", 0),
+        reverse=True,
+    )
+
+    if compact:
+        lines = [
+            "Valley Catholic Varsity Basketball - 2025-2026 Season Stats",
+            f"Record: {wins}-{losses} ({win_pct:.1f}%)",
+            f"Team: {season_stats.get('ppg', 0):.1f}PPG"
+            f" {season_stats.get('rpg', 0):.1f}RPG"
+            f" {season_stats.get('apg', 0):.1f}APG"
+            f" {season_stats.get('to_pg', 0):.1f}TOPG"
+            f" {season_stats.get('fg_pct', 0):.1f}%FG"
+            f" {season_stats.get('fg3_pct', 0):.1f}%3P"
+            f" {season_stats.get('ft_pct', 0):.1f}%FT",
+            f"Games ({len(games)}):",
+        ]
+        lines.extend(
+            f"G{g.get('gameId')} {g.get('date')} vs {g.get('opponent')}:"
+            f" {g.get('result')} {g.get('vc_score')}-{g.get('opp_score')}"
+            for g in games
+        )
+        lines.append("Players:")
+        lines.extend(
+            f"{name}: {stats.get('games', 0)}GP {stats.get('ppg', 0):.1f}PPG"
+            f" {stats.get('rpg', 0):.1f}RPG {stats.get('apg', 0):.1f}APG"
+            f" {stats.get('fg_pct', 0):.1f}%FG"
+            for name, stats in players
+        )
+        return "\n".join(lines)
 
-    context = f"""
+    parts = [f"""
 Valley Catholic Varsity Basketball - 2025-2026 Season Stats
 
-TEAM RECORD: {season_stats.get('win', 0)}-{season_stats.get('loss', 0)}
+TEAM RECORD: {wins}-{losses}
 Win Percentage: {win_pct:.1f}%
 
 TEAM SEASON AVERAGES:
@@ -174,47 +642,266 @@ TEAM SEASON AVERAGES:
 - Free Throw %: {season_stats.get('ft_pct', 0):.1f}%
 
 GAME-BY-GAME RESULTS ({len(games)} games):
-"""
+"""]
+
+    parts.extend(_game_context(game) for game in games)
+    parts.append("\n\nPLAYER SEASON STATISTICS:\n")
+    parts.extend(_player_context(name, stats) for name, stats in players)
+    return "".join(parts)
+
+
+def _game_context(game: Dict[str, Any]) -> str:
+    team_stats = game.get("team_stats", {})
+    fg_pct = (
+        (team_stats.get("fg", 0) / team_stats.get("fga", 1) * 100)
+        if team_stats.get("fga", 0) > 0
+        else 0
+    )
+    filtered = [
+        p
+        for p in game.get("player_stats", [])
+        if p.get("name") not in EXCLUDED_PLAYERS and "pts" in p
+    ]
+    top_scorers = sorted(filtered, key=lambda x: x.get("pts", 0), reverse=True)[:3]
+    scorers_text = ", ".join(f"{p.get('name')} {p.get('pts')}pts" for p in top_scorers)
+    return f"""
+Game {game.get('gameId')} - {game.get('date')} vs {game.get('opponent')}: {game.get('result')} {game.get('vc_score')}-{game.get('opp_score')}
+  FG: {fg_pct:.1f}%, AST: {team_stats.get('asst', 0)}, TO: {team_stats.get('to', 0)}
+  Top: {scorers_text}"""
+
+
+def _player_context(name: str, stats: Dict[str, Any]) -> str:
+    tpg = stats.get("to", 0) / max(stats.get("games", 1), 1)
+    return f"""
+{name}: {stats.get('games', 0)}GP, {stats.get('ppg', 0):.1f}PPG, {stats.get('rpg', 0):.1f}RPG, {stats.get('apg', 0):.1f}APG, {tpg:.1f}TPG
+  Shooting: {stats.get('fg_pct', 0):.1f}%FG, {stats.get('fg3_pct', 0):.1f}%3P, {stats.get('ft_pct', 0):.1f}%FT"""
+
+
+# Recent games included when the planner cannot fit every game
+RECENT_GAMES = 5
+
+
+def plan_context(
+    data_manager,
+    kind: str,
+    question: str,
+    history: Optional[List[Dict[str, str]]] = None,
+    instructions: str = "",
+) -> str:
+    """Stats context sized to the token budget for one call.
+
+    The full context is used while it fits. Past that, sections are added in
+    order of relevance while they fit: the team summary, the players the
+    question (or recent history) names, win/loss and home/away split tables
+    in place of per-game lines, the most recent games, then the rest of the
+    roster. The budget is CONTEXT_TOKENS[kind], capped so the prompt plus
+    MAX_TOKENS[kind] for the reply stays inside the model's context window.
+    """
+    history = history or []
+    asked = " ".join([question] + [m.get("content", "") for m in history[-4:]])
+    overhead = estimate_tokens(instructions) + estimate_tokens(asked)
+    budget = max(
+        0,
+        min(
+            CONTEXT_TOKENS[kind],
+            Config.AI_CONTEXT_WINDOW - MAX_TOKENS[kind] - overhead,
+        ),
+    )
+
+    full = build_stats_context(data_manager)
+    full_tokens = estimate_tokens(full)
+    if full_tokens <= budget:
+        logger.info(f"Context for {kind}: full, ~{full_tokens}/{budget} tokens")
+        return full
+
+    sections = _ContextBudget(budget)
+    sections.add(_context_summary(data_manager))
+    named = referenced_players(data_manager, asked)
+    for name in named:
+        sections.add(_player_focus(data_manager, name))
+    sections.add(_context_splits(data_manager))
+    sections.add_lines("RECENT GAMES:", _recent_game_lines(data_manager)[:RECENT_GAMES])
+    sections.add_lines(
+        "OTHER PLAYERS:",
+        [line for name, line in _roster_lines(data_manager) if name not in named],
+    )
+    text = sections.text()
+    logger.info(
+        f"Context for {kind}: planned, ~{sections.used}/{budget} tokens "
+        f"(full would be ~{full_tokens}), players={named}"
+    )
+    return text
+
+
+class _ContextBudget:
+    """Accumulates context sections while they fit in a token budget"""
+
+    def __init__(self, budget: int):
+        self.budget = budget
+        self.used = 0
+        self.sections: List[str] = []
+
+    def add(self, section: str) -> bool:
+        cost = estimate_tokens(section)
+        # The first section (the team summary) always goes in
+        if self.sections and self.used + cost > self.budget:
+            return False
+        self.sections.append(section)
+        self.used += cost
+        return True
+
+    def add_lines(self, title: str, lines: List[str]):
+        """Add a titled section with as many of its lines as fit"""
+        kept = []
+        cost = estimate_tokens(title)
+        for line in lines:
+            line_cost = estimate_tokens(line) + 1
+            if self.used + cost + line_cost > self.budget:
+                break
+            kept.append(line)
+            cost += line_cost
+        if kept:
+            self.sections.append("\n".join([title] + kept))
+            self.used += cost
+
+    def text(self) -> str:
+        return "\n\n".join(self.sections)
+
+
+def referenced_players(data_manager, text: str) -> List[str]:
+    """Players named in text, by full name or by a last name unique on the roster"""
+    lowered = text.lower()
+    words = set(re.findall(r"[a-z][a-z'-]+", lowered))
+    by_last = _last_name_index(data_manager)
+    found = []
+    for name in data_manager.season_player_stats:
+        if name in EXCLUDED_PLAYERS:
+            continue
+        last = name.split()[-1].lower()
+        if name.lower() in lowered or (by_last.get(last) == name and last in words):
+            found.append(name)
+    return found
+
+
+def _last_name_index(data_manager) -> Dict[str, str]:
+    def build():
+        names: Dict[str, List[str]] = {}
+        for name in data_manager.season_player_stats:
+            names.setdefault(name.split()[-1].lower(), []).append(name)
+        return {
+            last: group[0]
+            for last, group in names.items()
+            if len(group) == 1 and len(last) >= 3
+        }
 
-    for game in games:
-        team_stats = game.get("team_stats", {})
-        fg_pct = (
-            (team_stats.get("fg", 0) / team_stats.get("fga", 1) * 100)
-            if team_stats.get("fga", 0) > 0
-            else 0
+    return data_manager.memoize("context:last_names", build)
+
+
+def _context_summary(data_manager) -> str:
+    def build():
+        stats = data_manager.season_team_stats
+        wins, losses = stats.get("win", 0), stats.get("loss", 0)
+        total = wins + losses
+        win_pct = wins / total * 100 if total else 0
+        return (
+            "Valley Catholic Varsity Basketball - 2025-2026 Season Stats\n"
+            f"TEAM RECORD: {wins}-{losses} ({win_pct:.1f}%)\n"
+            f"TEAM AVERAGES: {stats.get('ppg', 0):.1f}PPG, {stats.get('rpg', 0):.1f}RPG, "
+            f"{stats.get('apg', 0):.1f}APG, {stats.get('to_pg', 0):.1f}TOPG, "
+            f"{stats.get('fg_pct', 0):.1f}%FG, {stats.get('fg3_pct', 0):.1f}%3P, "
+            f"{stats.get('ft_pct', 0):.1f}%FT"
         )
 
-        player_stats = game.get("player_stats", [])
-        filtered = [
-            p
-            for p in player_stats
-            if p.get("name") not in EXCLUDED_PLAYERS and "pts" in p
+    return data_manager.memoize("context:summary", build)
+
+
+def _context_splits(data_manager) -> str:
+    """Per-game team averages grouped by result and by location"""
+
+    def build():
+        groups = [
+            ("Wins", lambda g: g.get("result") == "W"),
+            ("Losses", lambda g: g.get("result") == "L"),
+            ("Home", lambda g: g.get("location") == "home"),
+            ("Away", lambda g: g.get("location") == "away"),
         ]
-        top_scorers = sorted(filtered, key=lambda x: x.get("pts", 0), reverse=True)[:3]
-        scorers_text = ", ".join(
-            [f"{p.get('name')} {p.get('pts')}pts" for p in top_scorers]
+        lines = ["SPLITS (per-game averages):"]
+        for label, include in groups:
+            games = [g for g in data_manager.games if include(g)]
+            if not games:
+                continue
+            n = len(games)
+            totals = {
+                key: sum(g.get("team_stats", {}).get(key, 0) for g in games)
+                for key in ("fg", "fga", "fg3", "fg3a", "reb", "asst", "to")
+            }
+            fg_pct = totals["fg"] / totals["fga"] * 100 if totals["fga"] else 0
+            fg3_pct = totals["fg3"] / totals["fg3a"] * 100 if totals["fg3a"] else 0
+            lines.append(
+                f"{label} ({n}): "
+                f"{sum(g.get('vc_score', 0) for g in games) / n:.1f}-"
+                f"{sum(g.get('opp_score', 0) for g in games) / n:.1f}, "
+                f"{fg_pct:.1f}%FG, {fg3_pct:.1f}%3P, {totals['reb'] / n:.1f}REB, "
+                f"{totals['asst'] / n:.1f}AST, {totals['to'] / n:.1f}TO"
+            )
+        return "\n".join(lines)
+
+    return data_manager.memoize("context:splits", build)
+
+
+def _recent_game_lines(data_manager) -> List[str]:
+    """Full game lines, most recent first"""
+
+    def build():
+        games = sorted(
+            data_manager.games,
+            key=lambda g: (parse_game_date(g.get("date")) or date.min, g["gameId"]),
+            reverse=True,
         )
+        return [_game_context(game).strip() for game in games]
 
-        context += f"""
-Game {game.get('gameId')} - {game.get('date')} vs {game.get('opponent')}: {game.get('result')} {game.get('vc_score')}-{game.get('opp_score')}
-  FG: {fg_pct:.1f}%, AST: {team_stats.get('asst', 0)}, TO: {team_stats.get('to', 0)}
-  Top: {scorers_text}"""
+    return data_manager.memoize("context:recent_games", build)
 
-    context += "\n\nPLAYER SEASON STATISTICS:\n"
 
-    for name, stats in sorted(
-        data_manager.season_player_stats.items(),
-        key=lambda x: x[1].get("ppg", 0),
-        reverse=True,
-    ):
-        if name in EXCLUDED_PLAYERS:
-            continue
-        tpg = stats.get("to", 0) / max(stats.get("games", 1), 1)
-        context += f"""
-{name}: {stats.get('games', 0)}GP, {stats.get('ppg', 0):.1f}PPG, {stats.get('rpg', 0):.1f}RPG, {stats.get('apg', 0):.1f}APG, {tpg:.1f}TPG
-  Shooting: {stats.get('fg_pct', 0):.1f}%FG, {stats.get('fg3_pct', 0):.1f}%3P, {stats.get('ft_pct', 0):.1f}%FT"""
+def _roster_lines(data_manager) -> List[tuple]:
+    """(name, line) per player, highest scorers first"""
 
-    return context
+    def build():
+        players = sorted(
+            (
+                (name, stats)
+                for name, stats in data_manager.season_player_stats.items()
+                if name not in EXCLUDED_PLAYERS
+            ),
+            key=lambda x: x[1].get("ppg", 0),
+            reverse=True,
+        )
+        return [
+            (name, _player_context(name, stats).strip().replace("\n  ", " | "))
+            for name, stats in players
+        ]
+
+    return data_manager.memoize("context:roster", build)
+
+
+def _player_focus(data_manager, name: str) -> str:
+    """Season line plus the player's most recent game lines"""
+    stats = data_manager.season_player_stats[name]
+    logs = sorted(
+        data_manager.get_player_game_logs(name),
+        key=lambda g: (parse_game_date(g.get("date")) or date.min, g["gameId"]),
+    )[-RECENT_GAMES:]
+    lines = [f"PLAYER: {_player_context(name, stats).strip()}", "  Recent games:"]
+    for log in reversed(logs):
+        row = log.get("stats", {})
+        lines.append(
+            f"  {log.get('date')} vs {log.get('opponent')} ({log.get('result')}): "
+            f"{row.get('pts', 0)}pts, FG {row.get('fg_made', 0)}-{row.get('fg_att', 0)}, "
+            f"3P {row.get('fg3_made', 0)}-{row.get('fg3_att', 0)}, "
+            f"{row.get('oreb', 0) + row.get('dreb', 0)}reb, {row.get('asst', 0)}ast, "
+            f"{row.get('to', 0)}to"
+        )
+    return "\n".join(lines)
 
 
 # Analysis prompts
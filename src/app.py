@@ -3,23 +3,46 @@ Valley Catholic Basketball Stats - Flask Application
 Clean, refactored version with organized routes and services.
 """
 
-from flask import Flask, render_template, jsonify, request
+from flask import Flask, Response, render_template, jsonify, request
 from functools import lru_cache
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
 import json
 import os
 import logging
 from datetime import datetime
 from dotenv import load_dotenv
 
-from src.config import Config, EXCLUDED_PLAYERS, MAX_TOKENS
+from src.config import (
+    Config,
+    EXCLUDED_PLAYERS,
+    MAX_TOKENS,
+    MIN_GAMES_FOR_PERCENTILES,
+    TEAM_NAME,
+)
 from src.data_manager import get_data_manager
 from src.ai_service import (
     get_ai_service,
-    build_stats_context,
+    plan_context,
     ANALYSIS_PROMPTS,
     APIError,
 )
 from src.advanced_stats import AdvancedStatsCalculator
+from src.bootstrap_ci import bootstrap_intervals, game_lines
+from src.export import ExportFilter, iter_games, iter_player_lines
+from src.jobs import get_job_runner, register_job
+from src.leaderboards import LeaderboardIndex
+from src.percentiles import PercentileIndex
+from src.ratings import massey_ratings
+from src.similarity import SimilarityIndex
+from src.win_model import build_win_model
+from src.splits import CUBE_DIMENSIONS, SplitCube, SplitIndex
+from src.kv_store import (
+    PLAYER_ANALYSIS,
+    SEASON_ANALYSIS,
+    TEAM_SUMMARY,
+    get_analysis_store,
+)
 
 load_dotenv()
 
@@ -39,7 +62,9 @@ app.config["SEND_FILE_MAX_AGE_DEFAULT"] = 31536000
 
 # Initialize services
 data = get_data_manager()
-advanced_calc = AdvancedStatsCalculator(data.stats_data)
+advanced_calc = AdvancedStatsCalculator(
+    data.stats_data, data.get_player_game_logs, data.running_stats
+)
 
 
 # =============================================================================
@@ -47,13 +72,19 @@ advanced_calc = AdvancedStatsCalculator(data.stats_data)
 # =============================================================================
 
 
+# Sent on every response, including the native ASGI routes in src.asgi
+SECURITY_HEADERS = {
+    "X-Content-Type-Options": "nosniff",
+    "X-Frame-Options": "DENY",
+    "X-XSS-Protection": "1; mode=block",
+    "Referrer-Policy": "strict-origin-when-cross-origin",
+}
+
+
 @app.after_request
 def add_security_headers(response):
     """Add security headers to all responses"""
-    response.headers["X-Content-Type-Options"] = "nosniff"
-    response.headers["X-Frame-Options"] = "DENY"
-    response.headers["X-XSS-Protection"] = "1; mode=block"
-    response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
+    response.headers.update(SECURITY_HEADERS)
     return response
 
 
@@ -111,13 +142,14 @@ def reload_data():
         data.reload()
         # Also reinitialize advanced stats calculator with fresh data
         global advanced_calc
-        advanced_calc = AdvancedStatsCalculator(data.stats_data)
+        advanced_calc = AdvancedStatsCalculator(
+            data.stats_data, data.get_player_game_logs, data.running_stats
+        )
 
         # Clear any AI caches so they regenerate with new data
-        if os.path.exists(Config.TEAM_CACHE):
-            os.remove(Config.TEAM_CACHE)
-        if os.path.exists(Config.ANALYSIS_CACHE):
-            os.remove(Config.ANALYSIS_CACHE)
+        store = get_analysis_store()
+        store.clear(TEAM_SUMMARY)
+        store.clear(SEASON_ANALYSIS)
 
         return jsonify(
             {
@@ -136,48 +168,160 @@ def reload_data():
 # =============================================================================
 
 
+def _first_names_by_abbrev():
+    """Map abbreviated stat-sheet names ("H Lomber") to roster first names"""
+
+    def build():
+        first_names = {}
+        for roster_player in data.roster:
+            full_name = roster_player.get("name", "")
+            if " " in full_name:
+                parts = full_name.split(" ", 1)
+                abbrev = f"{parts[0][0]} {parts[1]}"
+                first_names[abbrev] = full_name.split(" ")[0]
+        return first_names
+
+    return data.memoize("first_names_by_abbrev", build)
+
+
+def _first_name(player_name):
+    return _first_names_by_abbrev().get(player_name, player_name.split(" ")[0])
+
+
+def _parse_fields(raw):
+    """Parse a fields= parameter ("a,b.c,b.d") into {name: [subfields] or None}"""
+    selected = {}
+    for token in (raw or "").split(","):
+        token = token.strip()
+        if not token:
+            continue
+        name, _, sub = token.partition(".")
+        if sub:
+            if selected.get(name, []) is not None:
+                selected.setdefault(name, []).append(sub)
+        else:
+            selected[name] = None
+    return selected
+
+
+def _project(value, keys):
+    """Keep only keys from a dict, or from every dict in a list"""
+    if keys is None:
+        return value
+    if isinstance(value, list):
+        return [{k: item[k] for k in keys if k in item} for item in value]
+    return {k: value[k] for k in keys if k in value}
+
+
+def _select(item, selected):
+    """Apply parsed fields= to one record, projecting nested lists too"""
+    return {
+        name: _project(item[name], keys)
+        for name, keys in selected.items()
+        if name in item
+    }
+
+
+def _int_arg(name, minimum=0):
+    """Read an optional integer query parameter; ValueError if malformed"""
+    raw = request.args.get(name, "").strip()
+    if not raw:
+        return None
+    try:
+        value = int(raw)
+    except ValueError:
+        raise ValueError(f"{name} must be an integer")
+    if value < minimum:
+        raise ValueError(f"{name} must be >= {minimum}")
+    return value
+
+
+def _paged_response(items):
+    """Serialize a list payload honoring fields=, offset= and limit=.
+
+    The total count goes in X-Total-Count, and X-Next-Offset is set when
+    more items remain after this page.
+    """
+    try:
+        offset = _int_arg("offset") or 0
+        limit = _int_arg("limit", minimum=1)
+    except ValueError:
+        return (
+            jsonify({"error": "limit must be a positive integer, offset non-negative"}),
+            400,
+        )
+
+    total = len(items)
+    end = total if limit is None else min(offset + limit, total)
+    page = items[offset:end]
+
+    selected = _parse_fields(request.args.get("fields"))
+    if selected:
+        page = [_select(item, selected) for item in page]
+
+    response = jsonify(page)
+    response.headers["X-Total-Count"] = str(total)
+    if end < total:
+        response.headers["X-Next-Offset"] = str(end)
+    return response
+
+
 @app.route("/api/season-stats")
-@lru_cache(maxsize=1)
 def api_season_stats():
     return jsonify(data.season_team_stats)
 
 
-@app.route("/api/games")
-def api_games():
-    games_list = sorted(data.games, key=lambda x: x["gameId"])
+def _games_payload():
+    """All games in ID order, with roster first names on each player line"""
+
+    def build():
+        games_list = []
+        for game in sorted(data.games, key=lambda x: x["gameId"]):
+            game = dict(game)
+            if "player_stats" in game:
+                game["player_stats"] = [
+                    {**player, "first_name": _first_name(player.get("name", ""))}
+                    for player in game["player_stats"]
+                ]
+            games_list.append(game)
+        return games_list
+
+    return data.memoize("games", build)
 
-    # Create roster lookup for first names
-    roster_by_abbrev = {}
-    for roster_player in data.roster:
-        full_name = roster_player.get("name", "")
-        if " " in full_name:
-            parts = full_name.split(" ", 1)
-            abbrev = f"{parts[0][0]} {parts[1]}"
-            roster_by_abbrev[abbrev] = full_name.split(" ")[0]  # Store first name
-
-    # Add first names to player stats in each game
-    for game in games_list:
-        if "player_stats" in game:
-            for player in game["player_stats"]:
-                player_name = player.get("name", "")
-                player["first_name"] = roster_by_abbrev.get(
-                    player_name, player_name.split(" ")[0]
-                )
 
-    return jsonify(games_list)
+def _game_ids():
+    """Sorted game IDs, parallel to _games_payload()"""
+    return data.memoize("game_ids", lambda: [g["gameId"] for g in _games_payload()])
+
+
+@app.route("/api/games")
+def api_games():
+    """All games; supports fields=, limit=, offset= and since_game=<gameId>"""
+    games_list = _games_payload()
+    try:
+        since_game = _int_arg("since_game")
+    except ValueError:
+        return jsonify({"error": "since_game must be a game ID"}), 400
+    if since_game is not None:
+        games_list = games_list[bisect_right(_game_ids(), since_game) :]
+    return _paged_response(games_list)
 
 
 @app.route("/api/game/<int:game_id>")
 def api_game(game_id):
-    game = data.get_game_by_id(game_id)
-    if game:
-        return jsonify(game)
+    games_list = _games_payload()
+    index = bisect_right(_game_ids(), game_id) - 1
+    if index >= 0 and games_list[index]["gameId"] == game_id:
+        return jsonify(games_list[index])
     return jsonify({"error": "Game not found"}), 404
 
 
-@app.route("/api/players")
-def api_players():
-    """Get all player stats with enhanced metrics"""
+def _players_payload():
+    """All player stats with enhanced metrics, sorted by PPG"""
+    return data.memoize("players", _build_players)
+
+
+def _build_players():
     players = list(data.season_player_stats.values())
     roster_dict = data.get_roster_dict()
 
@@ -237,7 +381,63 @@ def api_players():
 
         enhanced.append(p)
 
-    return jsonify(sorted(enhanced, key=lambda x: x["ppg"], reverse=True))
+    return sorted(enhanced, key=lambda x: x["ppg"], reverse=True)
+
+
+@app.route("/api/players")
+def api_players():
+    """Get all player stats with enhanced metrics; supports fields=, limit=, offset="""
+    if _flag("with_percentiles"):
+        return _paged_response(_players_with_percentiles())
+    return _paged_response(_players_payload())
+
+
+def _flag(name):
+    """Read a boolean query parameter (1/true/yes)"""
+    return request.args.get(name, "").strip().lower() in ("1", "true", "yes")
+
+
+def _advanced_by_player():
+    """Advanced stats for every player who has played, once per data version"""
+
+    def build():
+        advanced = {}
+        for name in data.season_player_stats:
+            stats = advanced_calc.calculate_player_advanced_stats(name)
+            if stats:
+                advanced[name] = stats
+        return advanced
+
+    return data.memoize("advanced_by_player", build)
+
+
+def _percentile_index():
+    """Sorted metric arrays of the qualified players, once per data version"""
+
+    def build():
+        qualified = [
+            name
+            for name, stats in data.season_player_stats.items()
+            if stats.get("games", 0) >= MIN_GAMES_FOR_PERCENTILES
+        ]
+        return PercentileIndex(_advanced_by_player(), qualified)
+
+    return data.memoize("percentile_index", build)
+
+
+def _percentiles(player_name):
+    advanced = _advanced_by_player().get(player_name)
+    return _percentile_index().ranks(advanced) if advanced else {}
+
+
+def _players_with_percentiles():
+    return data.memoize(
+        "players_with_percentiles",
+        lambda: [
+            {**player, "percentiles": _percentiles(player["name"])}
+            for player in _players_payload()
+        ],
+    )
 
 
 @app.route("/api/player/<player_name>")
@@ -265,60 +465,87 @@ def api_player(player_name):
             enhanced_stats["number"] = roster_info.get("number")
             enhanced_stats["grade"] = roster_info.get("grade")
 
-        return jsonify(
-            {
-                "season_stats": enhanced_stats,
-                "game_logs": data.get_player_game_logs(player_name),
-                "roster_info": roster_info,
-            }
-        )
+        payload = {
+            "season_stats": enhanced_stats,
+            "game_logs": data.get_player_game_logs(player_name),
+            "roster_info": roster_info,
+        }
+        if _flag("with_percentiles"):
+            payload["percentiles"] = _percentiles(player_name)
+        return jsonify(payload)
     return jsonify({"error": "Player not found"}), 404
 
 
-@app.route("/api/leaderboards")
-def api_leaderboards():
-    players = list(data.season_player_stats.values())
-    roster_dict = data.get_roster_dict()
+# Stats on the default leaderboards payload
+LEADERBOARD_STATS = ("pts", "reb", "asst", "fg_pct", "fg3_pct", "ft_pct", "stl", "blk")
 
-    # Create roster lookup by abbreviated name
-    roster_by_abbrev = {}
-    for roster_player in data.roster:
-        full_name = roster_player.get("name", "")
-        if " " in full_name:
-            parts = full_name.split(" ", 1)
-            abbrev = f"{parts[0][0]} {parts[1]}"
-            roster_by_abbrev[abbrev] = full_name.split(" ")[0]  # Store first name
 
-    # Add first names to all players
-    for player in players:
-        player_name = player.get("name", "")
-        player["first_name"] = roster_by_abbrev.get(
-            player_name, player_name.split(" ")[0]
-        )
+def _leaderboard_index():
+    """Per-stat sorted player orders, built once per data version"""
+    return data.memoize(
+        "leaderboard_index",
+        lambda: LeaderboardIndex(data.season_player_stats.values()),
+    )
+
+
+def _leaders(stat, k=10, min_attempts=0):
+    """Top-k copies of season lines, each with a roster first name"""
+    return [
+        {**player, "first_name": _first_name(player.get("name", ""))}
+        for player in _leaderboard_index().top(stat, k, min_attempts)
+    ]
+
 
+def _similarity_index():
+    """Advanced-stat vectors for every player, built once per data version"""
+
+    return data.memoize(
+        "similarity_index", lambda: SimilarityIndex(_advanced_by_player())
+    )
+
+
+@app.route("/api/players/<player_name>/similar")
+def api_similar_players(player_name):
+    """Players with the closest advanced-stat profiles; ?k=&metric=cosine|euclidean"""
+    player_name = player_name.strip()
+    if not player_name or len(player_name) > 100:
+        return jsonify({"error": "Invalid player name"}), 400
+
+    index = _similarity_index()
+    if player_name not in index:
+        return jsonify({"error": "Player not found"}), 404
+    metric = request.args.get("metric", "cosine").strip().lower()
+    try:
+        k = _int_arg("k", minimum=1) or 5
+        similar = index.similar([player_name], k, metric)[player_name]
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    for match in similar:
+        match["first_name"] = _first_name(match["name"])
+    return jsonify({"player": player_name, "metric": metric, "similar": similar})
+
+
+def _leaderboards_payload():
+    """Top 10 players per stat, each with a roster first name"""
+    return data.memoize(
+        "leaderboards", lambda: {stat: _leaders(stat) for stat in LEADERBOARD_STATS}
+    )
+
+
+@app.route("/api/leaderboards")
+def api_leaderboards():
+    """Default leaderboards, or ?stat=&k=&min_attempts= for one stat"""
+    stat = request.args.get("stat", "").strip()
+    if not stat:
+        return jsonify(_leaderboards_payload())
+    try:
+        k = _int_arg("k", minimum=1) or 10
+        min_attempts = _int_arg("min_attempts") or 0
+        leaders = _leaders(stat, k, min_attempts)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     return jsonify(
-        {
-            "pts": sorted(players, key=lambda x: x["pts"], reverse=True)[:10],
-            "reb": sorted(players, key=lambda x: x["reb"], reverse=True)[:10],
-            "asst": sorted(players, key=lambda x: x["asst"], reverse=True)[:10],
-            "fg_pct": sorted(
-                [p for p in players if p["fga"] > 0],
-                key=lambda x: x["fg_pct"],
-                reverse=True,
-            )[:10],
-            "fg3_pct": sorted(
-                [p for p in players if p["fg3a"] > 0],
-                key=lambda x: x["fg3_pct"],
-                reverse=True,
-            )[:10],
-            "ft_pct": sorted(
-                [p for p in players if p["fta"] > 0],
-                key=lambda x: x["ft_pct"],
-                reverse=True,
-            )[:10],
-            "stl": sorted(players, key=lambda x: x.get("stl", 0), reverse=True)[:10],
-            "blk": sorted(players, key=lambda x: x.get("blk", 0), reverse=True)[:10],
-        }
+        {"stat": stat, "k": k, "min_attempts": min_attempts, "leaders": leaders}
     )
 
 
@@ -352,44 +579,49 @@ def api_player_trends(player_name):
     )
 
 
+def _team_trends_payload():
+    return data.memoize("team_trends", _build_team_trends)
+
+
+def _build_team_trends():
+    games = sorted(data.games, key=lambda x: x["gameId"])
+    return {
+        "games": [g["gameId"] for g in games],
+        "opponents": [g["opponent"] for g in games],
+        "dates": [g["date"] for g in games],
+        "vc_score": [g["vc_score"] for g in games],
+        "opp_score": [g["opp_score"] for g in games],
+        "fg_pct": [
+            (
+                g["team_stats"]["fg"] / g["team_stats"]["fga"] * 100
+                if g["team_stats"]["fga"] > 0
+                else 0
+            )
+            for g in games
+        ],
+        "fg3_pct": [
+            (
+                g["team_stats"]["fg3"] / g["team_stats"]["fg3a"] * 100
+                if g["team_stats"]["fg3a"] > 0
+                else 0
+            )
+            for g in games
+        ],
+        "asst": [g["team_stats"]["asst"] for g in games],
+        "to": [g["team_stats"]["to"] for g in games],
+        "reb": [g["team_stats"].get("reb", 0) for g in games],
+        "oreb": [g["team_stats"].get("oreb", 0) for g in games],
+        "dreb": [g["team_stats"].get("dreb", 0) for g in games],
+        "stl": [g["team_stats"].get("stl", 0) for g in games],
+        "blk": [g["team_stats"].get("blk", 0) for g in games],
+        "ft": [g["team_stats"].get("ft", 0) for g in games],
+        "fta": [g["team_stats"].get("fta", 0) for g in games],
+    }
+
+
 @app.route("/api/team-trends")
-@lru_cache(maxsize=1)
 def api_team_trends():
-    games = sorted(data.games, key=lambda x: x["gameId"])
-    return jsonify(
-        {
-            "games": [g["gameId"] for g in games],
-            "opponents": [g["opponent"] for g in games],
-            "dates": [g["date"] for g in games],
-            "vc_score": [g["vc_score"] for g in games],
-            "opp_score": [g["opp_score"] for g in games],
-            "fg_pct": [
-                (
-                    g["team_stats"]["fg"] / g["team_stats"]["fga"] * 100
-                    if g["team_stats"]["fga"] > 0
-                    else 0
-                )
-                for g in games
-            ],
-            "fg3_pct": [
-                (
-                    g["team_stats"]["fg3"] / g["team_stats"]["fg3a"] * 100
-                    if g["team_stats"]["fg3a"] > 0
-                    else 0
-                )
-                for g in games
-            ],
-            "asst": [g["team_stats"]["asst"] for g in games],
-            "to": [g["team_stats"]["to"] for g in games],
-            "reb": [g["team_stats"].get("reb", 0) for g in games],
-            "oreb": [g["team_stats"].get("oreb", 0) for g in games],
-            "dreb": [g["team_stats"].get("dreb", 0) for g in games],
-            "stl": [g["team_stats"].get("stl", 0) for g in games],
-            "blk": [g["team_stats"].get("blk", 0) for g in games],
-            "ft": [g["team_stats"].get("ft", 0) for g in games],
-            "fta": [g["team_stats"].get("fta", 0) for g in games],
-        }
-    )
+    return jsonify(_team_trends_payload())
 
 
 @app.route("/api/player-comparison")
@@ -461,10 +693,15 @@ def api_player_comparison():
 # =============================================================================
 
 
+def _team_advanced_payload():
+    return data.memoize(
+        "advanced_team", lambda: advanced_calc.calculate_team_advanced_stats()
+    )
+
+
 @app.route("/api/advanced/team")
-@lru_cache(maxsize=1)
 def api_team_advanced():
-    return jsonify(advanced_calc.calculate_team_advanced_stats())
+    return jsonify(_team_advanced_payload())
 
 
 @app.route("/api/advanced/player/<player_name>")
@@ -476,9 +713,35 @@ def api_player_advanced(player_name):
     stats = advanced_calc.calculate_player_advanced_stats(player_name)
     if not stats:
         return jsonify({"error": "Player not found"}), 404
+    if _flag("with_percentiles"):
+        stats = {**stats, "percentiles": _percentiles(player_name)}
+    if _flag("ci"):
+        intervals = _bootstrap_payload()
+        stats = {
+            **stats,
+            "confidence_intervals": {
+                "samples": intervals["samples"],
+                "level": intervals["level"],
+                **(intervals["players"].get(player_name) or {}),
+            },
+        }
     return jsonify(stats)
 
 
+def _bootstrap_payload():
+    """Bootstrap intervals for every player, computed once per data version"""
+
+    def build():
+        return bootstrap_intervals(
+            {
+                name: game_lines(data.get_player_game_logs(name))
+                for name in data.season_player_stats
+            }
+        )
+
+    return data.memoize("bootstrap_intervals", build)
+
+
 @app.route("/api/advanced/game/<int:game_id>")
 def api_game_advanced(game_id):
     stats = advanced_calc.calculate_game_advanced_stats(game_id)
@@ -494,15 +757,54 @@ def api_patterns():
 
 
 @app.route("/api/advanced/volatility")
-@lru_cache(maxsize=1)
 def api_volatility():
-    return jsonify(advanced_calc.calculate_volatility_metrics())
+    return jsonify(
+        data.memoize("volatility", advanced_calc.calculate_volatility_metrics)
+    )
+
+
+def _thresholds_payload():
+    """Best win/loss cut per team stat, computed once per data version"""
+    return data.memoize(
+        "stat_thresholds", lambda: advanced_calc.calculate_stat_thresholds()
+    )
+
+
+@app.route("/api/advanced/thresholds")
+def api_thresholds():
+    return jsonify({"thresholds": _thresholds_payload()})
+
+
+@app.route("/api/advanced/win-model")
+def api_win_model():
+    """Logistic win-probability model over per-game team stats"""
+    model = data.memoize("win_model", lambda: build_win_model(data.games))
+    if model is None:
+        return jsonify({"error": "Not enough wins and losses to fit a model"}), 404
+    return jsonify(model)
+
+
+@app.route("/api/ratings")
+def api_ratings():
+    """Schedule-adjusted SRS/Massey ratings for every team in the results"""
+
+    def build():
+        return massey_ratings(
+            (TEAM_NAME, g["opponent"], g["vc_score"], g["opp_score"])
+            for g in data.games
+            if g.get("opponent")
+        )
+
+    return jsonify({"ratings": data.memoize("ratings", build)})
 
 
 @app.route("/api/advanced/insights")
-@lru_cache(maxsize=1)
 def api_auto_insights():
-    return jsonify({"insights": advanced_calc.generate_auto_insights()})
+    insights = data.memoize(
+        "auto_insights",
+        lambda: advanced_calc.generate_auto_insights(_thresholds_payload()),
+    )
+    return jsonify({"insights": insights})
 
 
 @app.route("/api/advanced/all")
@@ -512,262 +814,508 @@ def api_all_advanced():
             "team": advanced_calc.calculate_team_advanced_stats(),
             "patterns": advanced_calc.calculate_win_loss_patterns(),
             "volatility": advanced_calc.calculate_volatility_metrics(),
-            "insights": advanced_calc.generate_auto_insights(),
+            "insights": advanced_calc.generate_auto_insights(_thresholds_payload()),
         }
     )
 
 
-@app.route("/api/comprehensive-insights")
-@lru_cache(maxsize=1)
-def api_comprehensive_insights():
-    """Generate comprehensive insights for trends page"""
-    try:
-        # Get recent games (last 5) for trend analysis
-        recent_games = (
-            sorted(data.games, key=lambda x: x.get("gameId", 0))[-5:]
-            if len(data.games) >= 5
-            else data.games
-        )
-        early_games = (
-            sorted(data.games, key=lambda x: x.get("gameId", 0))[:5]
-            if len(data.games) >= 5
-            else []
+def _comprehensive_insights_payload():
+    """Trends, recommendations and player insights for the trends page"""
+    # Last 5 vs first 5 games, read from the prefix-sum split index
+    splits = _split_index()
+    recent = splits.team_split(*splits.bounds(last=5))
+    early_games = len(splits) >= 5
+    early = splits.team_split(*splits.bounds(first=5))
+
+    # Calculate recent performance
+    recent_wins = recent["totals"]["wins"]
+    recent_losses = recent["games"] - recent_wins
+    recent_avg_score = recent["per_game"]["vc_score"]
+    recent_avg_opp = recent["per_game"]["opp_score"]
+    point_diff = recent_avg_score - recent_avg_opp
+
+    # Calculate early season averages
+    early_avg_score = early["per_game"]["vc_score"] if early_games else 0
+    early_avg_opp = early["per_game"]["opp_score"] if early_games else 0
+
+    # Scoring trend
+    scoring_improvement = recent_avg_score - early_avg_score if early_games else 0
+    defensive_improvement = early_avg_opp - recent_avg_opp if early_games else 0
+
+    # Get team stats
+    team_stats = data.season_team_stats
+    total_games = team_stats.get("win", 0) + team_stats.get("loss", 0)
+    win_pct = (team_stats.get("win", 0) / total_games * 100) if total_games > 0 else 0
+
+    # Generate recommendations
+    recommendations = []
+    patterns = advanced_calc.calculate_win_loss_patterns()
+
+    if patterns["loss_conditions"]["avg_to"] > 15:
+        recommendations.append(
+            {
+                "category": "Ball Security",
+                "priority": "High",
+                "recommendation": f"Reduce turnovers - averaging {patterns['loss_conditions']['avg_to']:.1f} in losses vs {patterns['win_conditions']['avg_to']:.1f} in wins",
+                "reason": "Turnover differential is a key factor in losses",
+            }
         )
 
-        # Calculate recent performance
-        recent_wins = sum(1 for g in recent_games if g.get("result") == "W")
-        recent_losses = len(recent_games) - recent_wins
-        recent_avg_score = (
-            sum(g.get("vc_score", 0) for g in recent_games) / len(recent_games)
-            if recent_games
-            else 0
-        )
-        recent_avg_opp = (
-            sum(g.get("opp_score", 0) for g in recent_games) / len(recent_games)
-            if recent_games
-            else 0
+    if patterns["loss_conditions"]["avg_fg_pct"] < 40:
+        recommendations.append(
+            {
+                "category": "Shooting",
+                "priority": "High",
+                "recommendation": f"Improve shot selection - {patterns['loss_conditions']['avg_fg_pct']:.1f}% FG in losses vs {patterns['win_conditions']['avg_fg_pct']:.1f}% in wins",
+                "reason": "Shooting efficiency drops significantly in losses",
+            }
         )
-        point_diff = recent_avg_score - recent_avg_opp
 
-        # Calculate early season averages
-        early_avg_score = (
-            sum(g.get("vc_score", 0) for g in early_games) / len(early_games)
-            if early_games
-            else 0
-        )
-        early_avg_opp = (
-            sum(g.get("opp_score", 0) for g in early_games) / len(early_games)
-            if early_games
-            else 0
+    if team_stats.get("apg", 0) / max(team_stats.get("tpg", 1), 1) < 1.5:
+        recommendations.append(
+            {
+                "category": "Playmaking",
+                "priority": "Medium",
+                "recommendation": "Improve assist-to-turnover ratio through better ball movement",
+                "reason": f"Current AST/TO ratio is below optimal threshold",
+            }
         )
 
-        # Scoring trend
-        scoring_improvement = recent_avg_score - early_avg_score if early_games else 0
-        defensive_improvement = early_avg_opp - recent_avg_opp if early_games else 0
+    # Player insights
+    player_insights = []
+    players = sorted(
+        data.season_player_stats.values(),
+        key=lambda x: x.get("ppg", 0),
+        reverse=True,
+    )[:10]
 
-        # Get team stats
-        team_stats = data.season_team_stats
-        total_games = team_stats.get("win", 0) + team_stats.get("loss", 0)
-        win_pct = (
-            (team_stats.get("win", 0) / total_games * 100) if total_games > 0 else 0
-        )
+    for player in players:
+        advanced = advanced_calc.calculate_player_advanced_stats(player["name"])
+        if not advanced:
+            continue
 
-        # Generate recommendations
-        recommendations = []
-        patterns = advanced_calc.calculate_win_loss_patterns()
-
-        if patterns["loss_conditions"]["avg_to"] > 15:
-            recommendations.append(
-                {
-                    "category": "Ball Security",
-                    "priority": "High",
-                    "recommendation": f"Reduce turnovers - averaging {patterns['loss_conditions']['avg_to']:.1f} in losses vs {patterns['win_conditions']['avg_to']:.1f} in wins",
-                    "reason": "Turnover differential is a key factor in losses",
-                }
-            )
+        strengths = []
+        improvements = []
+
+        # Analyze strengths and weaknesses
+        if advanced["scoring_efficiency"]["ppg"] >= 15:
+            strengths.append("Scoring")
+        if advanced["scoring_efficiency"]["ts_pct"] >= 55:
+            strengths.append("Efficiency")
+        if advanced["ball_handling"]["apg"] >= 3:
+            strengths.append("Playmaking")
+        if advanced["rebounding"]["rpg"] >= 6:
+            strengths.append("Rebounding")
+        if advanced["defense_activity"]["spg"] >= 1.5:
+            strengths.append("Defense")
+
+        if advanced["scoring_efficiency"]["ts_pct"] < 45:
+            improvements.append("Shot Selection")
+        if (
+            advanced["ball_handling"]["ast_to_ratio"] < 1.5
+            and advanced["ball_handling"]["tpg"] > 2
+        ):
+            improvements.append("Ball Security")
+        if advanced["scoring_efficiency"]["fg_pct"] < 35:
+            improvements.append("Shooting")
 
-        if patterns["loss_conditions"]["avg_fg_pct"] < 40:
-            recommendations.append(
-                {
-                    "category": "Shooting",
-                    "priority": "High",
-                    "recommendation": f"Improve shot selection - {patterns['loss_conditions']['avg_fg_pct']:.1f}% FG in losses vs {patterns['win_conditions']['avg_fg_pct']:.1f}% in wins",
-                    "reason": "Shooting efficiency drops significantly in losses",
-                }
-            )
+        # Efficiency grade
+        per = advanced["scoring_efficiency"]["per"]
+        if per >= 20:
+            efficiency_grade = "A"
+        elif per >= 15:
+            efficiency_grade = "B"
+        elif per >= 10:
+            efficiency_grade = "C"
+        else:
+            efficiency_grade = "D"
 
-        if team_stats.get("apg", 0) / max(team_stats.get("tpg", 1), 1) < 1.5:
-            recommendations.append(
-                {
-                    "category": "Playmaking",
-                    "priority": "Medium",
-                    "recommendation": "Improve assist-to-turnover ratio through better ball movement",
-                    "reason": f"Current AST/TO ratio is below optimal threshold",
-                }
-            )
+        player_insights.append(
+            {
+                "name": player["name"],
+                "role": advanced["usage_role"]["role"],
+                "strengths": strengths,
+                "areas_for_improvement": improvements,
+                "efficiency_grade": efficiency_grade,
+            }
+        )
 
-        # Player insights
-        player_insights = []
-        players = sorted(
-            data.season_player_stats.values(),
-            key=lambda x: x.get("ppg", 0),
-            reverse=True,
-        )[:10]
-
-        for player in players:
-            advanced = advanced_calc.calculate_player_advanced_stats(player["name"])
-            if not advanced:
-                continue
-
-            strengths = []
-            improvements = []
-
-            # Analyze strengths and weaknesses
-            if advanced["scoring_efficiency"]["ppg"] >= 15:
-                strengths.append("Scoring")
-            if advanced["scoring_efficiency"]["ts_pct"] >= 55:
-                strengths.append("Efficiency")
-            if advanced["ball_handling"]["apg"] >= 3:
-                strengths.append("Playmaking")
-            if advanced["rebounding"]["rpg"] >= 6:
-                strengths.append("Rebounding")
-            if advanced["defense_activity"]["spg"] >= 1.5:
-                strengths.append("Defense")
-
-            if advanced["scoring_efficiency"]["ts_pct"] < 45:
-                improvements.append("Shot Selection")
-            if (
-                advanced["ball_handling"]["ast_to_ratio"] < 1.5
-                and advanced["ball_handling"]["tpg"] > 2
-            ):
-                improvements.append("Ball Security")
-            if advanced["scoring_efficiency"]["fg_pct"] < 35:
-                improvements.append("Shooting")
-
-            # Efficiency grade
-            per = advanced["scoring_efficiency"]["per"]
-            if per >= 20:
-                efficiency_grade = "A"
-            elif per >= 15:
-                efficiency_grade = "B"
-            elif per >= 10:
-                efficiency_grade = "C"
-            else:
-                efficiency_grade = "D"
-
-            player_insights.append(
-                {
-                    "name": player["name"],
-                    "role": advanced["usage_role"]["role"],
-                    "strengths": strengths,
-                    "areas_for_improvement": improvements,
-                    "efficiency_grade": efficiency_grade,
-                }
-            )
+    return {
+        "team_trends": {
+            "recent_performance": {
+                "record": f"{recent_wins}-{recent_losses}",
+                "avg_score": round(recent_avg_score, 1),
+                "point_differential": round(point_diff, 1),
+                "trend": (
+                    "Improving"
+                    if recent_wins > recent_losses
+                    else ("Struggling" if recent_wins < recent_losses else "Stable")
+                ),
+            },
+            "scoring_trends": {
+                "recent_avg": round(recent_avg_score, 1),
+                "early_avg": round(early_avg_score, 1),
+                "improvement": round(scoring_improvement, 1),
+                "trend": (
+                    "Up"
+                    if scoring_improvement > 2
+                    else "Down" if scoring_improvement < -2 else "Stable"
+                ),
+            },
+            "defensive_trends": {
+                "recent_avg_allowed": round(recent_avg_opp, 1),
+                "early_avg_allowed": round(early_avg_opp, 1),
+                "improvement": round(defensive_improvement, 1),
+                "trend": (
+                    "Improving"
+                    if defensive_improvement > 2
+                    else "Declining" if defensive_improvement < -2 else "Stable"
+                ),
+            },
+        },
+        "key_metrics": {
+            "win_pct": round(win_pct, 1),
+            "fg_pct": team_stats.get("fg_pct", 0),
+            "fg3_pct": team_stats.get("fg3_pct", 0),
+            "apg": team_stats.get("apg", 0),
+            "tpg": (
+                round(team_stats.get("to", 0) / total_games, 1)
+                if total_games > 0
+                else 0
+            ),
+        },
+        "recommendations": recommendations,
+        "player_insights": player_insights,
+    }
 
+
+@app.route("/api/comprehensive-insights")
+def api_comprehensive_insights():
+    """Generate comprehensive insights for trends page"""
+    try:
         return jsonify(
-            {
-                "team_trends": {
-                    "recent_performance": {
-                        "record": f"{recent_wins}-{recent_losses}",
-                        "avg_score": round(recent_avg_score, 1),
-                        "point_differential": round(point_diff, 1),
-                        "trend": (
-                            "Improving"
-                            if recent_wins > recent_losses
-                            else (
-                                "Struggling"
-                                if recent_wins < recent_losses
-                                else "Stable"
-                            )
-                        ),
-                    },
-                    "scoring_trends": {
-                        "recent_avg": round(recent_avg_score, 1),
-                        "early_avg": round(early_avg_score, 1),
-                        "improvement": round(scoring_improvement, 1),
-                        "trend": (
-                            "Up"
-                            if scoring_improvement > 2
-                            else "Down" if scoring_improvement < -2 else "Stable"
-                        ),
-                    },
-                    "defensive_trends": {
-                        "recent_avg_allowed": round(recent_avg_opp, 1),
-                        "early_avg_allowed": round(early_avg_opp, 1),
-                        "improvement": round(defensive_improvement, 1),
-                        "trend": (
-                            "Improving"
-                            if defensive_improvement > 2
-                            else "Declining" if defensive_improvement < -2 else "Stable"
-                        ),
-                    },
-                },
-                "key_metrics": {
-                    "win_pct": round(win_pct, 1),
-                    "fg_pct": team_stats.get("fg_pct", 0),
-                    "fg3_pct": team_stats.get("fg3_pct", 0),
-                    "apg": team_stats.get("apg", 0),
-                    "tpg": (
-                        round(team_stats.get("to", 0) / total_games, 1)
-                        if total_games > 0
-                        else 0
-                    ),
-                },
-                "recommendations": recommendations,
-                "player_insights": player_insights,
-            }
+            data.memoize("comprehensive_insights", _comprehensive_insights_payload)
         )
     except Exception as e:
         logger.error(f"Comprehensive insights error: {e}")
         return jsonify({"error": str(e)}), 500
 
 
+# =============================================================================
+# Splits API
+# =============================================================================
+
+
+def _split_index():
+    """Prefix sums over game order, built once per data version"""
+    return data.memoize("split_index", lambda: SplitIndex(data.games))
+
+
+@app.route("/api/splits")
+def api_splits():
+    """Team and player totals/averages over a contiguous run of games.
+
+    Bound the run with from_game/to_game (game IDs), from/to (YYYY-MM-DD),
+    then optionally first=N or last=N; player= limits the player section.
+    """
+    splits = _split_index()
+    try:
+        unsupported = [key for key in ("season", "opponent") if key in request.args]
+        if unsupported:
+            raise ValueError(
+                f"'{unsupported[0]}' is not supported for contiguous splits;"
+                " use /api/splits/cube"
+            )
+        flt = ExportFilter.from_args(request.args)
+        i, j = splits.bounds(
+            from_game=_int_arg("from_game"),
+            to_game=_int_arg("to_game"),
+            start=flt.start,
+            end=flt.end,
+            first=_int_arg("first", minimum=1),
+            last=_int_arg("last", minimum=1),
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    if flt.player:
+        if flt.player not in splits.players:
+            return jsonify({"error": "Player not found"}), 404
+        names = [flt.player]
+    else:
+        names = [name for name in splits.players if name not in EXCLUDED_PLAYERS]
+
+    players = {}
+    for name in names:
+        split = splits.player_split(name, i, j)
+        if split["games"]:
+            players[name] = split
+
+    return jsonify(
+        {
+            "range": {
+                "games": j - i,
+                "from": splits.games[i] if j > i else None,
+                "to": splits.games[j - 1] if j > i else None,
+            },
+            "team": splits.team_split(i, j),
+            "players": players,
+        }
+    )
+
+
+def _split_cube():
+    """Pre-aggregated split cells, built once per data version"""
+    return data.memoize("split_cube", lambda: SplitCube(data.games))
+
+
+@app.route("/api/splits/cube")
+def api_splits_cube():
+    """Grouped splits read from pre-aggregated cells.
+
+    by= lists the dimensions to group on (location, result, opponent, month,
+    margin); any dimension passed as a parameter filters to that value, and
+    player= limits the player section to one player.
+    """
+    by = [d.strip() for d in request.args.get("by", "").split(",") if d.strip()]
+    filters = {d: request.args[d] for d in CUBE_DIMENSIONS if d in request.args}
+    player = request.args.get("player")
+    if player:
+        players = [player]
+    else:
+        players = [p for p in _split_index().players if p not in EXCLUDED_PLAYERS]
+    try:
+        cells = _split_cube().query(by, filters, players)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify({"by": by, "filters": filters, "cells": cells})
+
+
+# =============================================================================
+# Export API
+# =============================================================================
+
+
+def _ndjson_export(iter_records):
+    """Stream records as NDJSON, filtered by season/opponent/from/to/player"""
+    try:
+        flt = ExportFilter.from_args(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    games = sorted(data.games, key=lambda x: x["gameId"])
+    return Response(iter_records(games, flt), mimetype="application/x-ndjson")
+
+
+@app.route("/api/export/games.ndjson")
+def export_games():
+    """One game per line, with box score"""
+    return _ndjson_export(iter_games)
+
+
+@app.route("/api/export/player-lines.ndjson")
+def export_player_lines():
+    """One player box score line per line, with game context"""
+    return _ndjson_export(iter_player_lines)
+
+
+# =============================================================================
+# Bootstrap API
+# =============================================================================
+
+GAME_SUMMARY_FIELDS = [
+    "gameId",
+    "date",
+    "opponent",
+    "location",
+    "vc_score",
+    "opp_score",
+    "result",
+]
+
+BOOTSTRAP_SECTIONS = {
+    "season_stats": lambda: data.season_team_stats,
+    "season_player_stats": lambda: data.season_player_stats,
+    "advanced_team": _team_advanced_payload,
+    "leaderboards": _leaderboards_payload,
+    "games": _games_payload,
+    "players": _players_payload,
+    "team_trends": _team_trends_payload,
+}
+
+# Sections each page loads on startup, with the default projection per section
+BOOTSTRAP_PAGES = {
+    "dashboard": {
+        "season_stats": None,
+        "advanced_team": None,
+        "leaderboards": None,
+        "games": GAME_SUMMARY_FIELDS,
+        "team_trends": None,
+    },
+    "ai-insights": {
+        "season_stats": None,
+        "season_player_stats": None,
+        "games": GAME_SUMMARY_FIELDS,
+    },
+    "games": {"games": None},
+    "players": {"players": None},
+}
+
+
+@app.route("/api/bootstrap/<page>")
+def api_bootstrap(page):
+    """Everything a page needs on load, in one response.
+
+    ?fields=season_stats,games.opponent,games.vc_score limits the response to
+    the named sections, and to the named keys within a section.
+    """
+    if page not in BOOTSTRAP_PAGES:
+        return jsonify({"error": "Unknown page"}), 404
+
+    sections = BOOTSTRAP_PAGES[page]
+    selected = _parse_fields(request.args.get("fields"))
+    unknown = [name for name in selected if name not in sections]
+    if unknown:
+        return jsonify({"error": f"Unknown fields: {', '.join(unknown)}"}), 400
+
+    result = {"page": page, "version": data.version}
+    for name, default_keys in sections.items():
+        if selected and name not in selected:
+            continue
+        keys = selected[name] if name in selected else default_keys
+        result[name] = _project(BOOTSTRAP_SECTIONS[name](), keys)
+    return jsonify(result)
+
+
 # =============================================================================
 # AI Analysis API Routes
 # =============================================================================
 
 
+def _wants_stream():
+    return request.args.get("stream", "false").lower() == "true"
+
+
+def _sse_event(payload, event=None):
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(payload)}\n\n"
+
+
+def _sse_response(deltas):
+    """Relay reply text as Server-Sent Events.
+
+    Each piece is sent as a data event with a "delta" field, followed by a
+    "done" event; failures after the stream has started arrive as an
+    "error" event since the status line has already been sent.
+    """
+
+    def generate():
+        try:
+            for delta in deltas:
+                yield _sse_event({"delta": delta})
+            yield _sse_event({}, event="done")
+        except APIError as e:
+            yield _sse_event({"error": str(e)}, event="error")
+        except Exception as e:
+            logger.error(f"AI stream error: {e}")
+            yield _sse_event({"error": str(e)}, event="error")
+
+    return Response(
+        generate(),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+CHAT_INSTRUCTIONS = """You are an expert basketball statistics analyst. Use ONLY the provided stats data.
+Always reference exact numbers from the data. Never make up statistics."""
+
+ANALYSIS_TYPES = {"general", "player", "team", "trends", "coaching"}
+
+
+def _chat_prompt(body):
+    """Validate a chat request body and build its prompt.
+
+    Returns (system_prompt, message, history). Raises ValueError with the
+    message to return as a 400.
+    """
+    if not body:
+        raise ValueError("Invalid JSON data")
+
+    message = body.get("message", "").strip()
+    history = body.get("history", [])
+
+    if not message:
+        raise ValueError("No message provided")
+    if len(message) > 1000:
+        raise ValueError("Message too long")
+
+    # Clean history
+    clean_history = []
+    for msg in (history or [])[-20:]:
+        if isinstance(msg, dict) and "role" in msg and "content" in msg:
+            if (
+                msg["role"] in ["user", "assistant"]
+                and len(str(msg["content"])) <= 2000
+            ):
+                clean_history.append(
+                    {"role": msg["role"], "content": str(msg["content"]).strip()}
+                )
+
+    context = plan_context(data, "chat", message, clean_history, CHAT_INSTRUCTIONS)
+    system_prompt = f"{CHAT_INSTRUCTIONS}\n\nTEAM STATS DATA:\n{context}"
+    return system_prompt, message, clean_history
+
+
+def _analyze_prompt(body):
+    """Validate an analysis request body and build its prompt.
+
+    Returns (system_prompt, query, analysis_type). Raises ValueError with
+    the message to return as a 400.
+    """
+    if not body:
+        raise ValueError("Invalid JSON data")
+
+    query = body.get("query", "").strip()
+    analysis_type = body.get("type", "general").strip().lower()
+
+    if not query:
+        raise ValueError("No query provided")
+    if len(query) > 1000:
+        raise ValueError("Query too long")
+
+    if analysis_type not in ANALYSIS_TYPES:
+        analysis_type = "general"
+
+    prompt = ANALYSIS_PROMPTS.get(analysis_type, ANALYSIS_PROMPTS["general"])
+    context = plan_context(data, "analyze", query, instructions=prompt)
+    return f"{prompt}\n\nTEAM DATA:\n{context}", query, analysis_type
+
+
 @app.route("/api/ai/chat", methods=["POST"])
 def ai_chat():
     """Chat endpoint with conversation history"""
     try:
-        if not request.json:
-            return jsonify({"error": "Invalid JSON data"}), 400
-
-        message = request.json.get("message", "").strip()
-        history = request.json.get("history", [])
-
-        if not message:
-            return jsonify({"error": "No message provided"}), 400
-        if len(message) > 1000:
-            return jsonify({"error": "Message too long"}), 400
+        try:
+            system_prompt, message, history = _chat_prompt(request.json)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
 
         ai = get_ai_service()
         if not ai.is_configured:
             return jsonify({"error": "OpenAI API key not configured"}), 500
 
-        # Clean history
-        clean_history = []
-        for msg in (history or [])[-20:]:
-            if isinstance(msg, dict) and "role" in msg and "content" in msg:
-                if (
-                    msg["role"] in ["user", "assistant"]
-                    and len(str(msg["content"])) <= 2000
-                ):
-                    clean_history.append(
-                        {"role": msg["role"], "content": str(msg["content"]).strip()}
-                    )
-
-        # Always get fresh stats context (no caching)
-        context = build_stats_context(data)
-        system_prompt = f"""You are an expert basketball statistics analyst. Use ONLY the provided stats data.
-Always reference exact numbers from the data. Never make up statistics.
-
-TEAM STATS DATA:
-{context}"""
-
-        response = ai.call_with_history(system_prompt, message, clean_history)
+        max_tokens = MAX_TOKENS["chat"]
+        if _wants_stream():
+            return _sse_response(
+                ai.stream_with_history(
+                    system_prompt, message, history, max_tokens=max_tokens
+                )
+            )
+
+        response = ai.call_with_history(
+            system_prompt, message, history, max_tokens=max_tokens
+        )
         return jsonify({"response": response, "message": message})
 
     except APIError as e:
@@ -781,31 +1329,22 @@ TEAM STATS DATA:
 def ai_analyze():
     """General AI analysis endpoint"""
     try:
-        if not request.json:
-            return jsonify({"error": "Invalid JSON data"}), 400
-
-        query = request.json.get("query", "").strip()
-        analysis_type = request.json.get("type", "general").strip().lower()
-
-        if not query:
-            return jsonify({"error": "No query provided"}), 400
-        if len(query) > 1000:
-            return jsonify({"error": "Query too long"}), 400
+        try:
+            system_prompt, query, analysis_type = _analyze_prompt(request.json)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
 
         ai = get_ai_service()
         if not ai.is_configured:
             return jsonify({"error": "OpenAI API key not configured"}), 500
 
-        valid_types = {"general", "player", "team", "trends", "coaching"}
-        if analysis_type not in valid_types:
-            analysis_type = "general"
-
-        # Always get fresh stats context (no caching)
-        context = build_stats_context(data)
-        prompt = ANALYSIS_PROMPTS.get(analysis_type, ANALYSIS_PROMPTS["general"])
-        system_prompt = f"{prompt}\n\nTEAM DATA:\n{context}"
+        max_tokens = MAX_TOKENS["analyze"]
+        if _wants_stream():
+            return _sse_response(
+                ai.stream_api(system_prompt, query, max_tokens=max_tokens)
+            )
 
-        analysis = ai.call_api(system_prompt, query, max_tokens=1500)
+        analysis = ai.call_api(system_prompt, query, max_tokens=max_tokens)
         return jsonify({"analysis": analysis, "type": analysis_type, "query": query})
 
     except APIError as e:
@@ -930,42 +1469,64 @@ Analyze: Shooting deviation, possession control, scoring distribution, key perfo
         return jsonify({"error": str(e)}), 500
 
 
-@app.route("/api/ai/team-summary")
-def ai_team_summary():
-    """Get AI team summary with caching"""
-    try:
-        # Check cache (cache is cleared when data is reloaded)
-        if os.path.exists(Config.TEAM_CACHE):
-            with open(Config.TEAM_CACHE) as f:
-                return jsonify(json.load(f))
+def _generate_team_summary(use_cache=True):
+    """Ask for the season diagnosis and write the team summary cache.
 
-        ai = get_ai_service()
-        if not ai.is_configured:
-            return jsonify({"error": "OpenAI API key not configured"}), 500
+    use_cache=False skips the AI response cache so the model is asked again.
+    """
+    ai = get_ai_service()
 
-        # Build fresh context with all current data
-        context = build_stats_context(data)
-
-        prompt = """Diagnose this season using only box score data.
+    prompt = """Diagnose this season using only box score data.
 1. Primary Win Condition - what stat pattern predicts wins?
 2. Critical Thresholds - what values separate wins from losses?
 3. Failure Modes - what breakdown causes losses?
 4. Actionable Changes - what can realistically improve?
 
 Be specific with numbers. No speculation."""
+    context = plan_context(data, "team", prompt)
+
+    summary = ai.call_api(
+        f"Performance diagnostician analyzing basketball data.\n\nDATA:\n{context}",
+        prompt,
+        max_tokens=MAX_TOKENS["team"],
+        temperature=0,
+        use_cache=use_cache,
+    )
 
-        summary = ai.call_api(
-            f"Performance diagnostician analyzing basketball data.\n\nDATA:\n{context}",
-            prompt,
-            max_tokens=2000,
-            temperature=0,
-        )
+    result = {"summary": summary}
+    store = get_analysis_store()
+    store.set(TEAM_SUMMARY, "season", result)
+    store.delete(TEAM_SUMMARY, "cleared")
 
-        result = {"summary": summary}
-        with open(Config.TEAM_CACHE, "w") as f:
-            json.dump(result, f)
+    return result
 
-        return jsonify(result)
+
+@app.route("/api/ai/team-summary")
+def ai_team_summary():
+    """Get AI team summary with caching (async=true queues a background job).
+
+    regenerate=true, or a DELETE since the last summary, asks the model again
+    instead of replaying its stored reply.
+    """
+    try:
+        # Check cache (cache is cleared when data is reloaded)
+        store = get_analysis_store()
+        force = request.args.get("regenerate", "false").lower() == "true"
+        force = force or store.get(TEAM_SUMMARY, "cleared") is not None
+        if not force:
+            cached = store.get(TEAM_SUMMARY, "season")
+            if cached is not None:
+                return jsonify(cached)
+
+        ai = get_ai_service()
+        if not ai.is_configured:
+            return jsonify({"error": "OpenAI API key not configured"}), 500
+
+        if request.args.get("async", "false").lower() == "true":
+            job = get_job_runner().submit("team-summary", {"use_cache": not force})
+            return jsonify(job), 202
+
+        return jsonify(_generate_team_summary(use_cache=not force))
 
     except APIError as e:
         return jsonify({"error": str(e)}), 500
@@ -978,8 +1539,10 @@ Be specific with numbers. No speculation."""
 def clear_team_summary():
     """Clear team summary cache"""
     try:
-        if os.path.exists(Config.TEAM_CACHE):
-            os.remove(Config.TEAM_CACHE)
+        store = get_analysis_store()
+        store.delete(TEAM_SUMMARY, "season")
+        # The next summary must bypass the AI response cache too
+        store.set(TEAM_SUMMARY, "cleared", True)
         return jsonify({"message": "Cache cleared"})
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -990,95 +1553,129 @@ def clear_team_summary():
 # =============================================================================
 
 
-@app.route("/api/season-analysis")
-def get_season_analysis():
-    """Get cached season analysis"""
-    try:
-        force = request.args.get("force", "false").lower() == "true"
+def _season_game_prompt(game):
+    """Player performances and the diagnostics prompt for one game"""
+    ts = game["team_stats"]
+    fg_pct = (ts["fg"] / ts["fga"] * 100) if ts["fga"] > 0 else 0
 
-        if not force and os.path.exists(Config.ANALYSIS_CACHE):
-            with open(Config.ANALYSIS_CACHE) as f:
-                return jsonify(json.load(f))
+    # Get player performances
+    players = []
+    for p in sorted(game.get("player_stats", []), key=lambda x: x["pts"], reverse=True):
+        if p["name"] in EXCLUDED_PLAYERS:
+            continue
+        season_ppg = data.season_player_stats.get(p["name"], {}).get("ppg", 0)
+        diff = p["pts"] - season_ppg
+        players.append(
+            {
+                "name": p["name"],
+                "pts": p["pts"],
+                "season_ppg": season_ppg,
+                "diff": diff,
+                "indicator": "↑" if diff > 1 else ("↓" if diff < -1 else "→"),
+            }
+        )
 
-        ai = get_ai_service()
-        if not ai.is_configured:
-            return jsonify({"error": "OpenAI API key not configured"}), 500
+    prompt = f"""Game {game['gameId']}: VC vs {game['opponent']} - {game['result']} {game['vc_score']}-{game['opp_score']}
+FG: {fg_pct:.1f}%, AST: {ts['asst']}, TO: {ts['to']}
+Top: {', '.join([f"{p['name']} {p['pts']}pts ({p['indicator']}{abs(p['diff']):.0f})" for p in players[:3]])}
 
-        games = sorted(data.games, key=lambda x: x["gameId"])
-        season = data.season_team_stats
+Output: PRIMARY DRIVER, SECONDARY DRIVER, RISK EXPOSED"""
 
-        # Generate per-game analysis
-        per_game = []
-        for game in games:
-            ts = game["team_stats"]
-            fg_pct = (ts["fg"] / ts["fga"] * 100) if ts["fga"] > 0 else 0
+    return players, prompt
 
-            # Get player performances
-            players = []
-            for p in sorted(
-                game.get("player_stats", []), key=lambda x: x["pts"], reverse=True
-            ):
-                if p["name"] in EXCLUDED_PLAYERS:
-                    continue
-                season_ppg = data.season_player_stats.get(p["name"], {}).get("ppg", 0)
-                diff = p["pts"] - season_ppg
-                players.append(
-                    {
-                        "name": p["name"],
-                        "pts": p["pts"],
-                        "season_ppg": season_ppg,
-                        "diff": diff,
-                        "indicator": "↑" if diff > 1 else ("↓" if diff < -1 else "→"),
-                    }
-                )
 
-            prompt = f"""Game {game['gameId']}: VC vs {game['opponent']} - {game['result']} {game['vc_score']}-{game['opp_score']}
-FG: {fg_pct:.1f}%, AST: {ts['asst']}, TO: {ts['to']}
-Top: {', '.join([f"{p['name']} {p['pts']}pts ({p['indicator']}{abs(p['diff']):.0f})" for p in players[:3]])}
+def _game_diagnostics(ai, prompt, use_cache=True):
+    try:
+        return ai.call_api(
+            "Generate compact game diagnostics.",
+            prompt,
+            max_tokens=400,
+            use_cache=use_cache,
+        )
+    except Exception:
+        return "Analysis pending..."
 
-Output: PRIMARY DRIVER, SECONDARY DRIVER, RISK EXPOSED"""
 
-            try:
-                analysis = ai.call_api(
-                    "Generate compact game diagnostics.", prompt, max_tokens=400
-                )
-            except:
-                analysis = "Analysis pending..."
-
-            per_game.append(
-                {
-                    "game": game["gameId"],
-                    "opponent": game["opponent"],
-                    "date": game["date"],
-                    "score": f"{game['vc_score']}-{game['opp_score']}",
-                    "result": game["result"],
-                    "player_performances": players,
-                    "analysis": analysis,
-                }
-            )
+def _generate_season_analysis(use_cache=True):
+    """Run the per-game and season prompts and write the analysis cache"""
+    ai = get_ai_service()
+    games = sorted(data.games, key=lambda x: x["gameId"])
+    season = data.season_team_stats
 
-        # Season summary
-        summary_prompt = f"""Season: {season['win']}-{season['loss']} ({season['win']/(season['win']+season['loss'])*100:.0f}%)
+    # Season summary
+    summary_prompt = f"""Season: {season['win']}-{season['loss']} ({season['win']/(season['win']+season['loss'])*100:.0f}%)
 {season['ppg']:.1f}PPG, {season['fg_pct']:.1f}%FG, {season['fg3_pct']:.1f}%3P
 
 Comprehensive analysis: strengths, weaknesses, evolution, improvements needed."""
 
-        summary = ai.call_api(
+    # The summary only needs season totals, so it is dispatched first and
+    # runs alongside the per-game diagnostics on a bounded pool.
+    with ThreadPoolExecutor(max_workers=Config.AI_MAX_CONCURRENCY) as pool:
+        summary_future = pool.submit(
+            ai.call_api,
             "Expert basketball coach providing season analysis.",
             summary_prompt,
             max_tokens=2000,
+            use_cache=use_cache,
         )
 
-        result = {
-            "generated_at": datetime.now().isoformat(),
-            "season_summary": summary,
-            "per_game_analysis": per_game,
-        }
+        game_jobs = []
+        for game in games:
+            players, prompt = _season_game_prompt(game)
+            game_jobs.append(
+                (game, players, pool.submit(_game_diagnostics, ai, prompt, use_cache))
+            )
 
-        with open(Config.ANALYSIS_CACHE, "w") as f:
-            json.dump(result, f, indent=2)
+        # Generate per-game analysis, reassembled in game order
+        per_game = [
+            {
+                "game": game["gameId"],
+                "opponent": game["opponent"],
+                "date": game["date"],
+                "score": f"{game['vc_score']}-{game['opp_score']}",
+                "result": game["result"],
+                "player_performances": players,
+                "analysis": future.result(),
+            }
+            for game, players, future in game_jobs
+        ]
+        summary = summary_future.result()
 
-        return jsonify(result)
+    result = {
+        "generated_at": datetime.now().isoformat(),
+        "season_summary": summary,
+        "per_game_analysis": per_game,
+    }
+
+    get_analysis_store().set(SEASON_ANALYSIS, "season", result)
+
+    return result
+
+
+@app.route("/api/season-analysis")
+def get_season_analysis():
+    """Get cached season analysis.
+
+    With async=true a cache miss queues a background job and returns 202
+    with the job to poll instead of holding the worker.
+    """
+    try:
+        force = request.args.get("force", "false").lower() == "true"
+
+        if not force:
+            cached = get_analysis_store().get(SEASON_ANALYSIS, "season")
+            if cached is not None:
+                return jsonify(cached)
+
+        ai = get_ai_service()
+        if not ai.is_configured:
+            return jsonify({"error": "OpenAI API key not configured"}), 500
+
+        if request.args.get("async", "false").lower() == "true":
+            job = get_job_runner().submit("season-analysis", {"use_cache": not force})
+            return jsonify(job), 202
+
+        return jsonify(_generate_season_analysis(use_cache=not force))
 
     except APIError as e:
         return jsonify({"error": str(e)}), 500
@@ -1091,8 +1688,7 @@ Comprehensive analysis: strengths, weaknesses, evolution, improvements needed.""
 def clear_analysis():
     """Clear season analysis cache"""
     try:
-        if os.path.exists(Config.ANALYSIS_CACHE):
-            os.remove(Config.ANALYSIS_CACHE)
+        get_analysis_store().delete(SEASON_ANALYSIS, "season")
         return jsonify({"message": "Cache cleared"})
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -1103,21 +1699,6 @@ def clear_analysis():
 # =============================================================================
 
 
-def _load_player_cache():
-    if os.path.exists(Config.PLAYER_CACHE):
-        try:
-            with open(Config.PLAYER_CACHE) as f:
-                return json.load(f)
-        except:
-            return {}
-    return {}
-
-
-def _save_player_cache(cache):
-    with open(Config.PLAYER_CACHE, "w") as f:
-        json.dump(cache, f, indent=2)
-
-
 @app.route("/api/ai/player-analysis/<player_name>")
 def get_player_analysis(player_name):
     """Get comprehensive player analysis with caching"""
@@ -1134,12 +1715,11 @@ def get_player_analysis(player_name):
             return jsonify({"error": "OpenAI API key not configured"}), 500
 
         force = request.args.get("regenerate", "false").lower() == "true"
-        cache = _load_player_cache()
-
-        if not force and player_name in cache:
-            cached = cache[player_name]
-            cached["cached"] = True
-            return jsonify(cached)
+        if not force:
+            cached = get_analysis_store().get(PLAYER_ANALYSIS, player_name)
+            if cached is not None:
+                cached["cached"] = True
+                return jsonify(cached)
 
         stats = data.season_player_stats[player_name]
         advanced = advanced_calc.calculate_player_advanced_stats(player_name)
@@ -1189,6 +1769,7 @@ COMPREHENSIVE ANALYSIS:
             "Expert basketball analyst. Use specific statistics. Be thorough but concise.",
             prompt,
             max_tokens=2000,
+            use_cache=not force,
         )
 
         result = {
@@ -1207,8 +1788,7 @@ COMPREHENSIVE ANALYSIS:
             "cached": False,
         }
 
-        cache[player_name] = result
-        _save_player_cache(cache)
+        get_analysis_store().set(PLAYER_ANALYSIS, player_name, result)
 
         return jsonify(result)
 
@@ -1224,11 +1804,56 @@ def clear_player_analysis(player_name):
     """Clear cached analysis for a player"""
     try:
         player_name = player_name.strip()
-        cache = _load_player_cache()
-        if player_name in cache:
-            del cache[player_name]
-            _save_player_cache(cache)
+        if get_analysis_store().delete(PLAYER_ANALYSIS, player_name):
             return jsonify({"message": f"Cache cleared for {player_name}"})
         return jsonify({"message": "No cached analysis found"})
     except Exception as e:
         return jsonify({"error": str(e)}), 500
+
+
+# =============================================================================
+# Background Jobs API
+# =============================================================================
+
+register_job("season-analysis", _generate_season_analysis)
+register_job("team-summary", _generate_team_summary)
+
+
+@app.route("/api/jobs", methods=["POST"])
+def submit_job():
+    """Queue a long-running analysis; identical in-flight jobs are shared"""
+    try:
+        kind = ((request.get_json(silent=True) or {}).get("kind") or "").strip()
+        runner = get_job_runner()
+        if kind not in runner.kinds:
+            return (
+                jsonify({"error": f"Unknown job kind: {kind}", "kinds": runner.kinds}),
+                400,
+            )
+        if not get_ai_service().is_configured:
+            return jsonify({"error": "OpenAI API key not configured"}), 500
+        return jsonify(runner.submit(kind)), 202
+    except Exception as e:
+        logger.error(f"Job submit error: {e}")
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route("/api/jobs/<job_id>")
+def job_status(job_id):
+    job = get_job_runner().get(job_id)
+    if not job:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(job)
+
+
+@app.route("/api/jobs/<job_id>/result")
+def job_result(job_id):
+    """The job's result once done; 202 while it is still running"""
+    job = get_job_runner().get(job_id, include_result=True)
+    if not job:
+        return jsonify({"error": "Job not found"}), 404
+    if job["status"] == "done":
+        return jsonify(job["result"])
+    if job["status"] == "failed":
+        return jsonify({"error": job["error"] or "Job failed"}), 500
+    return jsonify(job), 202
@@ -0,0 +1,174 @@
+"""
+ASGI entry point with async AI chat and analysis.
+
+POST /api/ai/chat and /api/ai/analyze run as coroutines on AsyncAIService,
+so concurrent chats share the server's event loop and connection pool
+instead of holding a worker thread each. Every other request is handed to
+the Flask app through asgiref's WSGI adapter.
+
+Run with an ASGI server, for example:
+    uvicorn src.asgi:app --workers 2
+"""
+
+import json
+import logging
+from urllib.parse import parse_qs
+
+from asgiref.wsgi import WsgiToAsgi
+
+from src.ai_service import APIError
+from src.app import SECURITY_HEADERS, _analyze_prompt, _chat_prompt, _sse_event
+from src.app import app as flask_app
+from src.async_ai_service import close_async_ai_service, get_async_ai_service
+from src.config import MAX_TOKENS
+
+logger = logging.getLogger(__name__)
+
+_SECURITY_HEADERS = [
+    (name.lower().encode(), value.encode()) for name, value in SECURITY_HEADERS.items()
+]
+
+flask_asgi = WsgiToAsgi(flask_app)
+
+NOT_CONFIGURED = {"error": "OpenAI API key not configured"}
+
+
+async def ai_chat(body, stream):
+    """Chat endpoint with conversation history"""
+    system_prompt, message, history = _chat_prompt(body)
+    ai = get_async_ai_service()
+    if not ai.is_configured:
+        return 500, NOT_CONFIGURED
+
+    max_tokens = MAX_TOKENS["chat"]
+    if stream:
+        return 200, ai.stream_with_history(
+            system_prompt, message, history, max_tokens=max_tokens
+        )
+    response = await ai.call_with_history(
+        system_prompt, message, history, max_tokens=max_tokens
+    )
+    return 200, {"response": response, "message": message}
+
+
+async def ai_analyze(body, stream):
+    """General AI analysis endpoint"""
+    system_prompt, query, analysis_type = _analyze_prompt(body)
+    ai = get_async_ai_service()
+    if not ai.is_configured:
+        return 500, NOT_CONFIGURED
+
+    max_tokens = MAX_TOKENS["analyze"]
+    if stream:
+        return 200, ai.stream_api(system_prompt, query, max_tokens=max_tokens)
+    analysis = await ai.call_api(system_prompt, query, max_tokens=max_tokens)
+    return 200, {"analysis": analysis, "type": analysis_type, "query": query}
+
+
+ROUTES = {
+    "/api/ai/chat": ai_chat,
+    "/api/ai/analyze": ai_analyze,
+}
+
+
+async def app(scope, receive, send):
+    if scope["type"] == "lifespan":
+        await _lifespan(receive, send)
+        return
+
+    handler = None
+    if scope["type"] == "http" and scope["method"] == "POST":
+        handler = ROUTES.get(scope["path"])
+    if handler is None:
+        await flask_asgi(scope, receive, send)
+        return
+
+    query = parse_qs(scope.get("query_string", b"").decode())
+    stream = query.get("stream", ["false"])[0].lower() == "true"
+    try:
+        body = json.loads(await _read_body(receive) or b"null")
+    except ValueError:
+        body = None
+
+    try:
+        status, result = await handler(body, stream)
+    except ValueError as e:
+        status, result = 400, {"error": str(e)}
+    except APIError as e:
+        status, result = 500, {"error": str(e)}
+    except Exception as e:
+        logger.error(f"AI request error: {e}")
+        status, result = 500, {"error": str(e)}
+
+    if isinstance(result, dict):
+        await _send_json(send, status, result)
+    else:
+        await _send_sse(send, result)
+
+
+async def _lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            await close_async_ai_service()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def _read_body(receive) -> bytes:
+    chunks = []
+    while True:
+        message = await receive()
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body"):
+            return b"".join(chunks)
+
+
+async def _send_json(send, status, payload):
+    raw = json.dumps(payload).encode()
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(raw)).encode()),
+                *_SECURITY_HEADERS,
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": raw})
+
+
+async def _send_sse(send, deltas):
+    """Relay reply text as Server-Sent Events, like app._sse_response"""
+    await send(
+        {
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [
+                (b"content-type", b"text/event-stream; charset=utf-8"),
+                (b"cache-control", b"no-cache"),
+                (b"x-accel-buffering", b"no"),
+                *_SECURITY_HEADERS,
+            ],
+        }
+    )
+
+    async def event(text):
+        await send(
+            {"type": "http.response.body", "body": text.encode(), "more_body": True}
+        )
+
+    try:
+        async for delta in deltas:
+            await event(_sse_event({"delta": delta}))
+        await event(_sse_event({}, event="done"))
+    except APIError as e:
+        await event(_sse_event({"error": str(e)}, event="error"))
+    except Exception as e:
+        logger.error(f"AI stream error: {e}")
+        await event(_sse_event({"error": str(e)}, event="error"))
+    await send({"type": "http.response.body", "body": b""})
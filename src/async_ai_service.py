@@ -0,0 +1,271 @@
+"""
+asyncio client for the OpenAI API.
+
+AsyncAIService mirrors AIService for code running on an event loop: one
+pooled httpx.AsyncClient carries every call, so many outstanding requests
+share the loop and a few keep-alive connections instead of a thread each.
+It shares the response cache, retry policy and error handling with the
+synchronous client; cache reads and writes touch the disk, so they run in
+a worker thread rather than on the loop.
+"""
+
+import asyncio
+import json
+import logging
+import weakref
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import httpx
+
+from src.ai_service import APIError, BaseAIService, RETRY_STATUSES, _log_token_usage
+from src.config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncAIService(BaseAIService):
+    """Async OpenAI client; create and use it on a single event loop"""
+
+    def __init__(self, pool_size: Optional[int] = None):
+        super().__init__()
+        self.pool_size = pool_size or Config.OPENAI_ASYNC_POOL_SIZE
+        self._client: Optional[httpx.AsyncClient] = None
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.pool_size,
+                    max_keepalive_connections=self.pool_size,
+                ),
+            )
+        return self._client
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def call_api(
+        self,
+        system_prompt: str,
+        user_message: str,
+        max_tokens: int = 1500,
+        temperature: float = 0.7,
+        model: Optional[str] = None,
+        use_cache: bool = True,
+    ) -> str:
+        """Make API call to OpenAI"""
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_message},
+        ]
+        return await self._complete(messages, max_tokens, temperature, model, use_cache)
+
+    async def call_with_history(
+        self,
+        system_prompt: str,
+        message: str,
+        history: List[Dict[str, str]],
+        max_tokens: int = 1000,
+        use_cache: bool = True,
+    ) -> str:
+        """Make API call with conversation history"""
+        messages = self._history_messages(system_prompt, message, history)
+        return await self._complete(messages, max_tokens, 0.7, use_cache=use_cache)
+
+    async def _complete(
+        self,
+        messages: List[Dict[str, str]],
+        max_tokens: int,
+        temperature: float,
+        model: Optional[str] = None,
+        use_cache: bool = True,
+    ) -> str:
+        """Send a chat completion request and return the reply text.
+
+        Cache hits skip the API; concurrent misses for the same request on
+        this loop await one upstream call.
+        """
+        if not self.is_configured:
+            raise ValueError("OpenAI API key not configured")
+
+        payload = self._payload(messages, max_tokens, temperature, model)
+        cache_key = self.cache.key(payload)
+        if not use_cache:
+            return await self._fetch(payload, cache_key)
+
+        cached = await asyncio.to_thread(self.cache.get, cache_key)
+        if cached is not None:
+            return cached
+
+        flight = self._inflight.get(cache_key)
+        if flight is not None:
+            return await asyncio.shield(flight)
+
+        flight = self._inflight[cache_key] = asyncio.get_running_loop().create_future()
+        try:
+            content = await self._fetch(payload, cache_key)
+        except BaseException as e:
+            flight.set_exception(e)
+            # Mark retrieved so an unawaited failure is not logged by asyncio
+            flight.exception()
+            raise
+        else:
+            flight.set_result(content)
+            return content
+        finally:
+            del self._inflight[cache_key]
+
+    async def _fetch(self, payload: Dict[str, Any], cache_key: str) -> str:
+        """Call the API and store the reply under cache_key"""
+        try:
+            response = await self._send(payload)
+            data = response.json()
+            content = data["choices"][0]["message"]["content"]
+        except Exception as e:
+            raise self._api_error(e) from e
+        _log_token_usage(payload, data.get("usage"))
+        await asyncio.to_thread(self.cache.set, cache_key, content)
+        return content
+
+    async def stream_api(
+        self,
+        system_prompt: str,
+        user_message: str,
+        max_tokens: int = 1500,
+        temperature: float = 0.7,
+        model: Optional[str] = None,
+        use_cache: bool = True,
+    ) -> AsyncIterator[str]:
+        """Like call_api, but yields the reply in pieces as it is generated"""
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_message},
+        ]
+        async for delta in self._stream(
+            messages, max_tokens, temperature, model, use_cache
+        ):
+            yield delta
+
+    async def stream_with_history(
+        self,
+        system_prompt: str,
+        message: str,
+        history: List[Dict[str, str]],
+        max_tokens: int = 1000,
+        use_cache: bool = True,
+    ) -> AsyncIterator[str]:
+        """Like call_with_history, but yields the reply in pieces"""
+        messages = self._history_messages(system_prompt, message, history)
+        async for delta in self._stream(messages, max_tokens, 0.7, use_cache=use_cache):
+            yield delta
+
+    async def _stream(
+        self,
+        messages: List[Dict[str, str]],
+        max_tokens: int,
+        temperature: float,
+        model: Optional[str] = None,
+        use_cache: bool = True,
+    ) -> AsyncIterator[str]:
+        """Yield reply text deltas using the API's stream mode"""
+        if not self.is_configured:
+            raise ValueError("OpenAI API key not configured")
+
+        payload = self._payload(messages, max_tokens, temperature, model)
+        cache_key = self.cache.key(payload)
+        if use_cache:
+            cached = await asyncio.to_thread(self.cache.get, cache_key)
+            if cached is not None:
+                yield cached
+                return
+
+        parts = []
+        _log_token_usage(payload)
+        try:
+            response = await self._send({**payload, "stream": True}, stream=True)
+            try:
+                async for line in response.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[5:].strip()
+                    if data == "[DONE]":
+                        break
+                    delta = json.loads(data)["choices"][0].get("delta", {})
+                    if delta.get("content"):
+                        parts.append(delta["content"])
+                        yield delta["content"]
+            finally:
+                await response.aclose()
+        except (httpx.HTTPError, KeyError, IndexError, ValueError) as e:
+            raise self._api_error(e) from e
+        await asyncio.to_thread(self.cache.set, cache_key, "".join(parts))
+
+    async def _send(
+        self, payload: Dict[str, Any], stream: bool = False
+    ) -> httpx.Response:
+        """POST to the API, retrying 429/5xx with backoff"""
+        attempt = 0
+        while True:
+            request = self.client.build_request(
+                "POST", self.api_url, headers=self._headers, json=payload
+            )
+            response = await self.client.send(request, stream=stream)
+            if response.status_code in RETRY_STATUSES and attempt < self.max_retries:
+                delay = self._retry_delay(attempt, response.headers.get("Retry-After"))
+                if delay is not None:
+                    logger.warning(
+                        f"OpenAI API returned {response.status_code}, "
+                        f"retrying in {delay:.2f}s ({attempt + 1}/{self.max_retries})"
+                    )
+                    await response.aclose()
+                    await asyncio.sleep(delay)
+                    attempt += 1
+                    continue
+            if response.is_error:
+                await response.aclose()
+            response.raise_for_status()
+            return response
+
+    def _api_error(self, error: Exception) -> APIError:
+        """Translate transport and response errors into APIError"""
+        if isinstance(error, APIError):
+            return error
+        if isinstance(error, httpx.TimeoutException):
+            logger.error("OpenAI API timeout")
+            return APIError("AI service timeout - please try again")
+        if isinstance(error, httpx.HTTPStatusError):
+            try:
+                self._handle_http_error(error)
+            except APIError as api_error:
+                return api_error
+        if isinstance(error, httpx.HTTPError):
+            logger.error(f"OpenAI API request failed: {error}")
+            return APIError("AI service connection error")
+        logger.error(f"OpenAI API response format error: {error}")
+        return APIError("AI service response error")
+
+
+# One service per event loop: the pooled client is bound to the loop it runs on
+_services: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncAIService]"
+_services = weakref.WeakKeyDictionary()
+
+
+def get_async_ai_service() -> AsyncAIService:
+    """Get or create the async AI service for the running event loop"""
+    loop = asyncio.get_running_loop()
+    service = _services.get(loop)
+    if service is None:
+        service = _services[loop] = AsyncAIService()
+    return service
+
+
+async def close_async_ai_service():
+    """Close the running loop's service and its pooled connections"""
+    service = _services.pop(asyncio.get_running_loop(), None)
+    if service is not None:
+        await service.aclose()
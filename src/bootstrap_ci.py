@@ -0,0 +1,126 @@
+"""
+Bootstrap confidence intervals for player advanced stats.
+
+A season of high school games is a small sample, so point estimates like
+TS% or PER move a lot from one game to the next. Each player's game lines
+are resampled with replacement B times using one (B x games) index matrix,
+the advanced stats are recomputed for every resample at once with NumPy,
+and the percentile interval is reported. Seeds are fixed per player, so
+results are reproducible and independent of how players are scheduled.
+"""
+
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from src.config import FREE_THROW_POSSESSION_FACTOR, THREE_POINT_MULTIPLIER, Config
+
+# Columns of the per-player game line matrix, as named in game logs
+LINE_FIELDS = (
+    "pts",
+    "fg_made",
+    "fg_att",
+    "fg3_made",
+    "fg3_att",
+    "ft_made",
+    "ft_att",
+    "oreb",
+    "dreb",
+    "asst",
+    "stl",
+    "blk",
+    "to",
+)
+_COL = {field: i for i, field in enumerate(LINE_FIELDS)}
+
+# Stats given an interval, matching calculate_player_advanced_stats
+INTERVAL_STATS = ("ppg", "efg_pct", "ts_pct", "per", "consistency_score")
+
+
+def game_lines(game_logs: List[Dict[str, Any]]) -> np.ndarray:
+    """A (games x LINE_FIELDS) matrix from a player's game logs"""
+    return np.array(
+        [[g.get("stats", g).get(f, 0) for f in LINE_FIELDS] for g in game_logs],
+        dtype=float,
+    ).reshape(-1, len(LINE_FIELDS))
+
+
+def _ratio(num: np.ndarray, den: np.ndarray) -> np.ndarray:
+    return np.divide(num, den, out=np.zeros_like(num), where=den > 0)
+
+
+def resampled_stats(
+    lines: np.ndarray, samples: int, seed: int
+) -> Dict[str, np.ndarray]:
+    """Advanced stats for each of ``samples`` resampled seasons"""
+    n = len(lines)
+    rng = np.random.default_rng([Config.BOOTSTRAP_SEED, seed])
+    index = rng.integers(0, n, size=(samples, n))
+    drawn = lines[index]  # samples x games x fields
+    totals = drawn.sum(axis=1)
+    col = {field: totals[:, i] for field, i in _COL.items()}
+
+    pts, fga, fg, fta = col["pts"], col["fg_att"], col["fg_made"], col["ft_att"]
+    reb = col["oreb"] + col["dreb"]
+    per = (
+        pts
+        + reb
+        + col["asst"]
+        + col["stl"]
+        + col["blk"]
+        - (fga - fg)
+        - (fta - col["ft_made"])
+        - col["to"]
+    ) / n
+    pts_variance = (
+        drawn[:, :, _COL["pts"]].var(axis=1, ddof=1) if n > 1 else np.zeros(samples)
+    )
+    return {
+        "ppg": pts / n,
+        "efg_pct": _ratio(fg + THREE_POINT_MULTIPLIER * col["fg3_made"], fga) * 100,
+        "ts_pct": _ratio(pts, 2 * (fga + FREE_THROW_POSSESSION_FACTOR * fta)) * 100,
+        "per": per,
+        "consistency_score": 100 - pts_variance,
+    }
+
+
+def player_intervals(
+    name: str, lines: np.ndarray, samples: int, level: float
+) -> Optional[Dict[str, Dict[str, float]]]:
+    """Percentile intervals for one player's INTERVAL_STATS"""
+    if len(lines) == 0:
+        return None
+    stats = resampled_stats(lines, samples, zlib.crc32(name.encode()))
+    tail = (100 - level) / 2
+    intervals = {}
+    for stat in INTERVAL_STATS:
+        low, high = np.percentile(stats[stat], [tail, 100 - tail])
+        intervals[stat] = {"low": round(float(low), 1), "high": round(float(high), 1)}
+    return intervals
+
+
+def _player_intervals(args):
+    return player_intervals(*args)
+
+
+def bootstrap_intervals(
+    lines_by_player: Dict[str, np.ndarray],
+    samples: Optional[int] = None,
+    level: Optional[float] = None,
+) -> Dict[str, Any]:
+    """Intervals for every player; uses a process pool when samples is large"""
+    samples = samples or Config.BOOTSTRAP_SAMPLES
+    level = level or Config.BOOTSTRAP_LEVEL
+    jobs = [(name, lines, samples, level) for name, lines in lines_by_player.items()]
+    if samples >= Config.BOOTSTRAP_POOL_MIN_SAMPLES and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=Config.BOOTSTRAP_WORKERS) as pool:
+            results = list(pool.map(_player_intervals, jobs))
+    else:
+        results = [player_intervals(*job) for job in jobs]
+    return {
+        "samples": samples,
+        "level": level,
+        "players": {job[0]: result for job, result in zip(jobs, results) if result},
+    }
@@ -41,6 +41,16 @@ class Config:
     OPENAI_API_URL = "https://api.openai.com/v1/chat/completions"
     OPENAI_MODEL = "gpt-4o-mini"
     OPENAI_TIMEOUT = 30
+    AI_CONTEXT_WINDOW = 128000  # prompt + reply tokens the model accepts
+    OPENAI_POOL_SIZE = int(os.getenv("OPENAI_POOL_SIZE", "10"))
+    OPENAI_MAX_RETRIES = int(os.getenv("OPENAI_MAX_RETRIES", "3"))
+    OPENAI_BACKOFF_BASE = 0.5  # seconds, doubled on each retry
+    OPENAI_BACKOFF_MAX = 8.0  # longest wait between retries, in seconds
+    # Connections the async client keeps to the API, shared by every request
+    # on one event loop
+    OPENAI_ASYNC_POOL_SIZE = int(os.getenv("OPENAI_ASYNC_POOL_SIZE", "100"))
+    # Parallel model calls per request; keep at or below OPENAI_POOL_SIZE
+    AI_MAX_CONCURRENCY = int(os.getenv("AI_MAX_CONCURRENCY", "4"))
 
     # ==========================================================================
     # Flask
@@ -56,9 +66,40 @@ class Config:
 
     STATS_FILE = os.path.join(DATA_DIR, "vc_stats_output.json")
     ROSTER_FILE = os.path.join(DATA_DIR, "roster.json")
+    ANALYSIS_DB = os.path.join(DATA_DIR, "analysis.sqlite3")
+    # Legacy JSON caches, imported into ANALYSIS_DB once
     ANALYSIS_CACHE = os.path.join(DATA_DIR, "season_analysis.json")
     PLAYER_CACHE = os.path.join(DATA_DIR, "player_analysis_cache.json")
     TEAM_CACHE = os.path.join(DATA_DIR, "team_summary.json")
+    JOBS_DB = os.path.join(DATA_DIR, "jobs.sqlite3")
+    AI_CACHE_DIR = os.path.join(DATA_DIR, "ai_cache")
+
+    # ==========================================================================
+    # In-memory Caches
+    # ==========================================================================
+    PLAYER_LOG_CACHE_SIZE = int(os.getenv("PLAYER_LOG_CACHE_SIZE", "64"))
+    AI_CACHE_TTL = int(os.getenv("AI_CACHE_TTL", str(24 * 3600)))  # seconds
+    AI_CACHE_MAX_ENTRIES = 256  # replies held in memory per worker
+    AI_CACHE_MAX_FILES = 2000  # replies kept on disk
+    # Cached player/team/season analyses older than this are regenerated
+    ANALYSIS_MAX_AGE = int(os.getenv("ANALYSIS_MAX_AGE", str(30 * 24 * 3600)))
+
+    # ==========================================================================
+    # Background Jobs
+    # ==========================================================================
+    JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+    JOB_RETENTION_SECONDS = 7 * 24 * 3600  # finished jobs are kept a week
+    JOB_STALE_SECONDS = 30 * 60  # in-flight jobs older than this are failed
+
+    # ==========================================================================
+    # Bootstrap Confidence Intervals
+    # ==========================================================================
+    BOOTSTRAP_SAMPLES = int(os.getenv("BOOTSTRAP_SAMPLES", "2000"))
+    BOOTSTRAP_SEED = 20251216  # fixed so intervals are reproducible
+    BOOTSTRAP_LEVEL = 95.0  # percent
+    # At or above this many resamples, players are spread over a process pool
+    BOOTSTRAP_POOL_MIN_SAMPLES = int(os.getenv("BOOTSTRAP_POOL_MIN_SAMPLES", "20000"))
+    BOOTSTRAP_WORKERS = int(os.getenv("BOOTSTRAP_WORKERS", "0")) or None  # CPUs
 
 
 # ==========================================================================
@@ -71,6 +112,10 @@ SECONDARY_SCORER_THRESHOLD = 10.0
 TURNOVER_THRESHOLD = 13
 FG_PERCENTAGE_THRESHOLD = 44.0
 MIN_GAMES_FOR_VARIANCE = 2
+MIN_GAMES_FOR_PERCENTILES = 3  # players ranked against in percentile output
+
+# Our team, as it appears alongside opponents in schedule ratings
+TEAM_NAME = "Valley Catholic"
 
 # Players excluded from analysis
 EXCLUDED_PLAYERS = {"Matthew Gunther", "Liam Plep", "Gavin Galan", "Kye Fixter"}
@@ -84,6 +129,14 @@ MAX_TOKENS = {
     "game": 1000,
     "team": 2000,
     "season": 2000,
+    "analyze": 1500,
+}
+
+# Stats context budget per call type, in (estimated) prompt tokens
+CONTEXT_TOKENS = {
+    "chat": 2000,
+    "analyze": 2000,
+    "team": 3000,
 }
 
 # ==========================================================================
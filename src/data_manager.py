@@ -4,24 +4,36 @@ Data loading and management for basketball stats
 
 import json
 import logging
-from typing import Dict, Any, Optional
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Any, List, Optional, Tuple, TypeVar
 from src.config import Config
+from src.records import intern_game_strings
+from src.running_stats import RunningStats
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 
 class DataManager:
     """Handles all data loading and caching"""
 
     def __init__(self):
+        self.version = 0
+        self._log_cache: "OrderedDict[str, List[Dict[str, Any]]]" = OrderedDict()
+        self._log_lock = threading.Lock()
+        self._memo: Dict[str, Any] = {}
         self.stats_data = self._load_stats()
         self.roster_data = self._load_roster()
+        self._build_indexes()
 
     def reload(self):
         """Reload all data from files - call this when data is updated"""
         logger.info("Reloading data from files...")
         self.stats_data = self._load_stats()
         self.roster_data = self._load_roster()
+        self._build_indexes()
         logger.info("Data reload complete")
 
     def _load_stats(self) -> Dict[str, Any]:
@@ -29,6 +41,10 @@ class DataManager:
         try:
             with open(Config.STATS_FILE) as f:
                 data = json.load(f)
+            # Game logs duplicate every player_stats row; they are derived
+            # on demand from the games index instead of kept resident.
+            data.pop("player_game_logs", None)
+            intern_game_strings(data.get("games", []))
             logger.info(f"Loaded {len(data.get('games', []))} games")
             return data
         except FileNotFoundError:
@@ -57,9 +73,34 @@ class DataManager:
             "games": [],
             "season_team_stats": {},
             "season_player_stats": {},
-            "player_game_logs": {},
         }
 
+    def _build_indexes(self):
+        """Index games by ID and player rows by name, and bump the data version"""
+        self._games_by_id: Dict[int, Dict[str, Any]] = {}
+        self._player_rows: Dict[str, List[Tuple[int, int]]] = {}
+        self.running_stats = RunningStats()
+
+        for game_idx, game in enumerate(self.games):
+            self._games_by_id[game["gameId"]] = game
+            self.running_stats.add_game(game)
+            for row_idx, row in enumerate(game.get("player_stats", [])):
+                name = row.get("name")
+                if name:
+                    self._player_rows.setdefault(name, []).append((game_idx, row_idx))
+
+        with self._log_lock:
+            self._log_cache.clear()
+            self._memo = {}
+        self.version += 1
+
+    def memoize(self, key: str, builder: Callable[[], T]) -> T:
+        """Return builder()'s result, computed once per data version"""
+        memo = self._memo
+        if key not in memo:
+            memo[key] = builder()
+        return memo[key]
+
     @property
     def games(self):
         return self.stats_data.get("games", [])
@@ -74,7 +115,8 @@ class DataManager:
 
     @property
     def player_game_logs(self):
-        return self.stats_data.get("player_game_logs", {})
+        """All game logs keyed by player name (materializes every player)"""
+        return {name: self.get_player_game_logs(name) for name in self._player_rows}
 
     @property
     def roster(self):
@@ -86,18 +128,50 @@ class DataManager:
 
     def get_game_by_id(self, game_id: int) -> Optional[Dict[str, Any]]:
         """Get a specific game by ID"""
-        for game in self.games:
-            if game["gameId"] == game_id:
-                return game
-        return None
+        return self._games_by_id.get(game_id)
 
     def get_player_stats(self, player_name: str) -> Optional[Dict[str, Any]]:
         """Get season stats for a specific player"""
         return self.season_player_stats.get(player_name)
 
     def get_player_game_logs(self, player_name: str) -> list:
-        """Get game logs for a specific player"""
-        return self.player_game_logs.get(player_name, [])
+        """Get game logs for a specific player.
+
+        Logs are derived from the games index on first access and kept in a
+        size-bounded LRU cache. The returned list is shared - do not mutate it.
+        """
+        with self._log_lock:
+            logs = self._log_cache.get(player_name)
+            if logs is not None:
+                self._log_cache.move_to_end(player_name)
+                return logs
+
+        logs = self._derive_player_game_logs(player_name)
+
+        with self._log_lock:
+            self._log_cache[player_name] = logs
+            self._log_cache.move_to_end(player_name)
+            while len(self._log_cache) > Config.PLAYER_LOG_CACHE_SIZE:
+                self._log_cache.popitem(last=False)
+        return logs
+
+    def _derive_player_game_logs(self, player_name: str) -> List[Dict[str, Any]]:
+        """Build a player's game logs from the rows they appear in"""
+        games = self.games
+        logs = []
+        for game_idx, row_idx in self._player_rows.get(player_name, []):
+            game = games[game_idx]
+            logs.append(
+                {
+                    "gameId": game["gameId"],
+                    "date": game.get("date"),
+                    "opponent": game.get("opponent"),
+                    "location": game.get("location"),
+                    "result": game.get("result"),
+                    "stats": game["player_stats"][row_idx],
+                }
+            )
+        return logs
 
 
 # Global data manager instance
@@ -0,0 +1,114 @@
+"""
+Streaming NDJSON export of games and player lines for bulk consumers
+"""
+
+import json
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, Iterator, Mapping, Optional
+
+GAME_DATE_FORMATS = ("%b %d, %Y", "%Y-%m-%d")
+
+
+def parse_game_date(value: Optional[str]) -> Optional[date]:
+    """Parse a stat-sheet date ("Dec 16, 2025") or an ISO date"""
+    for fmt in GAME_DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt).date()
+        except (TypeError, ValueError):
+            continue
+    return None
+
+
+def season_of(game: Dict[str, Any]) -> Optional[str]:
+    """Season label ("2025-2026") for a game; seasons roll over in July"""
+    if game.get("season"):
+        return game["season"]
+    day = parse_game_date(game.get("date"))
+    if day is None:
+        return None
+    start = day.year if day.month >= 7 else day.year - 1
+    return f"{start}-{start + 1}"
+
+
+class ExportFilter:
+    """Season, opponent, date range and player filters for exports"""
+
+    def __init__(
+        self,
+        season: Optional[str] = None,
+        opponent: Optional[str] = None,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        player: Optional[str] = None,
+    ):
+        self.season = season
+        self.opponent = opponent.lower() if opponent else None
+        self.start = start
+        self.end = end
+        self.player = player
+
+    @classmethod
+    def from_args(cls, args: Mapping[str, str]) -> "ExportFilter":
+        """Build from query parameters; raises ValueError on bad dates"""
+        bounds = {}
+        for key in ("from", "to"):
+            raw = (args.get(key) or "").strip()
+            if raw:
+                try:
+                    bounds[key] = datetime.strptime(raw, "%Y-%m-%d").date()
+                except ValueError:
+                    raise ValueError(f"'{key}' must be a YYYY-MM-DD date")
+        return cls(
+            season=(args.get("season") or "").strip() or None,
+            opponent=(args.get("opponent") or "").strip() or None,
+            start=bounds.get("from"),
+            end=bounds.get("to"),
+            player=(args.get("player") or "").strip() or None,
+        )
+
+    def matches_game(self, game: Dict[str, Any]) -> bool:
+        if self.opponent and (game.get("opponent") or "").lower() != self.opponent:
+            return False
+        if self.season and season_of(game) != self.season:
+            return False
+        if self.start or self.end:
+            day = parse_game_date(game.get("date"))
+            if day is None:
+                return False
+            if self.start and day < self.start:
+                return False
+            if self.end and day > self.end:
+                return False
+        return True
+
+
+def _line(record: Dict[str, Any]) -> str:
+    return json.dumps(record, separators=(",", ":")) + "\n"
+
+
+def iter_games(games: Iterable[Dict[str, Any]], flt: ExportFilter) -> Iterator[str]:
+    """Yield one NDJSON line per matching game, box score included"""
+    for game in games:
+        if flt.matches_game(game):
+            yield _line({**game, "season": season_of(game)})
+
+
+def iter_player_lines(
+    games: Iterable[Dict[str, Any]], flt: ExportFilter
+) -> Iterator[str]:
+    """Yield one NDJSON line per player per matching game"""
+    for game in games:
+        if not flt.matches_game(game):
+            continue
+        context = {
+            "gameId": game["gameId"],
+            "date": game.get("date"),
+            "season": season_of(game),
+            "opponent": game.get("opponent"),
+            "location": game.get("location"),
+            "result": game.get("result"),
+        }
+        for row in game.get("player_stats", []):
+            if flt.player and row.get("name") != flt.player:
+                continue
+            yield _line({**context, **row})
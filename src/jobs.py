@@ -0,0 +1,222 @@
+"""
+Background job runner for long-running AI analyses.
+
+Jobs run on a small thread pool in the submitting process and are recorded
+in SQLite, so any gunicorn worker can report status and serve results.
+Submitting a job while an identical one is queued or running returns the
+existing job instead of starting another.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional
+
+from src.config import Config
+
+logger = logging.getLogger(__name__)
+
+IN_FLIGHT = ("queued", "running")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    status TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    pid INTEGER,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS jobs_in_flight
+    ON jobs (key) WHERE status IN ('queued', 'running');
+"""
+
+
+class UnknownJobKind(ValueError):
+    """Raised when submitting a job kind with no registered handler"""
+
+    pass
+
+
+class JobRunner:
+    """Runs registered job handlers in the background and tracks them in SQLite"""
+
+    def __init__(self, db_path: str, workers: int = 2):
+        self.db_path = db_path
+        self._handlers: Dict[str, Callable[..., Any]] = {}
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="job")
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        """Short-lived connection that commits on success and always closes"""
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def register(self, kind: str, handler: Callable[..., Any]):
+        """Register handler(**params) -> JSON-serializable result for a kind"""
+        self._handlers[kind] = handler
+
+    @property
+    def kinds(self):
+        return sorted(self._handlers)
+
+    @staticmethod
+    def job_key(kind: str, params: Dict[str, Any]) -> str:
+        raw = json.dumps([kind, params], sort_keys=True)
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def submit(self, kind: str, params: Optional[Dict[str, Any]] = None) -> Dict:
+        """Queue a job, or return the identical job already in flight"""
+        if kind not in self._handlers:
+            raise UnknownJobKind(f"Unknown job kind: {kind}")
+
+        params = params or {}
+        key = self.job_key(kind, params)
+        now = time.time()
+        job_id = uuid.uuid4().hex
+
+        with self._connect() as conn:
+            self._expire_orphans(conn, key)
+            try:
+                conn.execute(
+                    "INSERT INTO jobs (id, kind, key, status, pid, created_at, updated_at)"
+                    " VALUES (?, ?, ?, 'queued', ?, ?, ?)",
+                    (job_id, kind, key, os.getpid(), now, now),
+                )
+            except sqlite3.IntegrityError:
+                row = conn.execute(
+                    "SELECT * FROM jobs WHERE key = ? AND status IN ('queued', 'running')",
+                    (key,),
+                ).fetchone()
+                if row is not None:
+                    job = self._to_dict(row)
+                    job["deduplicated"] = True
+                    return job
+                raise
+            conn.execute(
+                "DELETE FROM jobs WHERE status NOT IN ('queued', 'running')"
+                " AND updated_at < ?",
+                (now - Config.JOB_RETENTION_SECONDS,),
+            )
+
+        self._pool.submit(self._run, job_id, kind, params)
+        return self.get(job_id)
+
+    def get(self, job_id: str, include_result: bool = False) -> Optional[Dict]:
+        """Job status, optionally with its stored result"""
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if row is not None and row["status"] in IN_FLIGHT:
+                if self._expire_orphans(conn, row["key"]):
+                    row = conn.execute(
+                        "SELECT * FROM jobs WHERE id = ?", (job_id,)
+                    ).fetchone()
+        if row is None:
+            return None
+        return self._to_dict(row, include_result)
+
+    def _run(self, job_id: str, kind: str, params: Dict[str, Any]):
+        self._set_status(job_id, "running")
+        try:
+            result = self._handlers[kind](**params)
+        except Exception as e:
+            logger.error(f"Job {kind} {job_id} failed: {e}")
+            self._set_status(job_id, "failed", error=str(e))
+        else:
+            self._set_status(job_id, "done", result=json.dumps(result))
+
+    def _set_status(self, job_id: str, status: str, result=None, error=None):
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, updated_at = ?"
+                " WHERE id = ?",
+                (status, result, error, time.time(), job_id),
+            )
+
+    @staticmethod
+    def _expire_orphans(conn: sqlite3.Connection, key: str) -> bool:
+        """Fail in-flight jobs whose worker exited or that have gone stale"""
+        expired = False
+        stale_before = time.time() - Config.JOB_STALE_SECONDS
+        for row in conn.execute(
+            "SELECT id, pid, updated_at FROM jobs"
+            " WHERE key = ? AND status IN ('queued', 'running')",
+            (key,),
+        ).fetchall():
+            if row["updated_at"] < stale_before or not _pid_alive(row["pid"]):
+                conn.execute(
+                    "UPDATE jobs SET status = 'failed', error = ?, updated_at = ?"
+                    " WHERE id = ?",
+                    ("Worker exited before the job finished", time.time(), row["id"]),
+                )
+                expired = True
+        return expired
+
+    @staticmethod
+    def _to_dict(row: sqlite3.Row, include_result: bool = False) -> Dict:
+        job = {
+            "job_id": row["id"],
+            "kind": row["kind"],
+            "status": row["status"],
+            "error": row["error"],
+            "created_at": row["created_at"],
+            "updated_at": row["updated_at"],
+        }
+        if include_result and row["result"] is not None:
+            job["result"] = json.loads(row["result"])
+        return job
+
+
+def _pid_alive(pid: Optional[int]) -> bool:
+    if not pid:
+        return False
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+# Global job runner instance, created on first use
+job_runner: Optional[JobRunner] = None
+
+# Handlers registered at import, handed to the runner when it is created
+job_handlers: Dict[str, Callable[..., Any]] = {}
+
+
+def register_job(kind: str, handler: Callable[..., Any]):
+    """Register a handler for the global runner without creating it"""
+    job_handlers[kind] = handler
+    if job_runner is not None:
+        job_runner.register(kind, handler)
+
+
+def get_job_runner() -> JobRunner:
+    """Get or create the global job runner"""
+    global job_runner
+    if job_runner is None:
+        job_runner = JobRunner(Config.JOBS_DB, Config.JOB_WORKERS)
+        for kind, handler in job_handlers.items():
+            job_runner.register(kind, handler)
+    return job_runner
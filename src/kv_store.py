@@ -0,0 +1,144 @@
+"""
+SQLite-backed key-value store for cached AI analyses.
+
+Values are JSON documents grouped by namespace ("player-analysis",
+"season-analysis", ...). Every read and write touches one row, upserts are
+atomic, and WAL mode lets gunicorn workers read while another writes.
+Entries older than ``max_age`` seconds are treated as missing and pruned.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from typing import Any, Optional
+
+from src.config import Config
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS kv (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (namespace, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS kv_updated_at ON kv (updated_at);
+CREATE TABLE IF NOT EXISTS imports (
+    name TEXT PRIMARY KEY,
+    imported_at REAL NOT NULL
+);
+"""
+
+# Namespaces for cached analyses
+PLAYER_ANALYSIS = "player-analysis"
+TEAM_SUMMARY = "team-summary"
+SEASON_ANALYSIS = "season-analysis"
+
+
+class KVStore:
+    """Namespaced JSON values in SQLite with per-key upserts and age eviction"""
+
+    def __init__(self, db_path: str, max_age: Optional[float] = None):
+        self.db_path = db_path
+        self.max_age = max_age
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        """Short-lived connection that commits on success and always closes"""
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _cutoff(self) -> float:
+        return time.time() - self.max_age if self.max_age else 0.0
+
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT value FROM kv WHERE namespace = ? AND key = ?"
+                " AND updated_at >= ?",
+                (namespace, key, self._cutoff()),
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set(self, namespace: str, key: str, value: Any):
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO kv (namespace, key, value, updated_at) VALUES (?, ?, ?, ?)"
+                " ON CONFLICT (namespace, key)"
+                " DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at",
+                (namespace, key, json.dumps(value), time.time()),
+            )
+            if self.max_age:
+                conn.execute("DELETE FROM kv WHERE updated_at < ?", (self._cutoff(),))
+
+    def delete(self, namespace: str, key: str) -> bool:
+        """Remove one entry; True if it existed"""
+        with self._connect() as conn:
+            cur = conn.execute(
+                "DELETE FROM kv WHERE namespace = ? AND key = ?", (namespace, key)
+            )
+        return cur.rowcount > 0
+
+    def clear(self, namespace: str) -> int:
+        """Remove every entry in a namespace; returns how many were removed"""
+        with self._connect() as conn:
+            cur = conn.execute("DELETE FROM kv WHERE namespace = ?", (namespace,))
+        return cur.rowcount
+
+    def import_json(self, namespace: str, path: str, key: Optional[str] = None):
+        """One-time import of a legacy JSON cache file into a namespace.
+
+        With ``key`` the whole document becomes that entry; otherwise the
+        file is a {key: value} mapping. Later calls are no-ops, so entries
+        cleared after the import are not brought back.
+        """
+        name = f"{namespace}:{os.path.basename(path)}"
+        with self._connect() as conn:
+            done = conn.execute("SELECT 1 FROM imports WHERE name = ?", (name,))
+            if done.fetchone() is not None:
+                return
+        if os.path.exists(path):
+            try:
+                with open(path) as f:
+                    document = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Skipping legacy cache {path}: {e}")
+                return
+            entries = {key: document} if key else document
+            for entry_key, value in entries.items():
+                if self.get(namespace, entry_key) is None:
+                    self.set(namespace, entry_key, value)
+            logger.info(f"Imported {len(entries)} cached analyses from {path}")
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR IGNORE INTO imports (name, imported_at) VALUES (?, ?)",
+                (name, time.time()),
+            )
+
+
+# Global analysis store instance
+analysis_store: Optional[KVStore] = None
+
+
+def get_analysis_store() -> KVStore:
+    """Get or create the global store for cached AI analyses"""
+    global analysis_store
+    if analysis_store is None:
+        store = KVStore(Config.ANALYSIS_DB, Config.ANALYSIS_MAX_AGE)
+        store.import_json(PLAYER_ANALYSIS, Config.PLAYER_CACHE)
+        store.import_json(TEAM_SUMMARY, Config.TEAM_CACHE, key="season")
+        store.import_json(SEASON_ANALYSIS, Config.ANALYSIS_CACHE, key="season")
+        analysis_store = store
+    return analysis_store
@@ -0,0 +1,91 @@
+"""
+Leaderboards: top-k players by any season stat.
+
+LeaderboardIndex sorts player positions once per indexed stat, so a top-k
+read walks the front of a precomputed order and stops after k qualifying
+players. Any other numeric stat is ranked ad hoc with heapq.nlargest in
+O(n log k). Player dicts are shared with the data manager and never mutated.
+"""
+
+import heapq
+from numbers import Number
+from typing import Any, Dict, Iterable, List, Sequence
+
+# Stats with a precomputed order
+INDEXED_STATS = (
+    "pts",
+    "reb",
+    "asst",
+    "stl",
+    "blk",
+    "ppg",
+    "rpg",
+    "apg",
+    "fg_pct",
+    "fg3_pct",
+    "ft_pct",
+)
+
+# Percentages rank only players with at least one attempt (or min_attempts)
+ATTEMPTS = {"fg_pct": "fga", "fg3_pct": "fg3a", "ft_pct": "fta"}
+
+
+class LeaderboardIndex:
+    """Per-stat descending orders over a list of season stat lines"""
+
+    def __init__(
+        self, players: Iterable[Dict[str, Any]], stats: Sequence[str] = INDEXED_STATS
+    ):
+        self._players = list(players)
+        # Stable sort: ties keep roster order, matching sorted(..., reverse=True)
+        self._order = {
+            stat: sorted(
+                range(len(self._players)),
+                key=lambda i: _value(self._players[i], stat),
+                reverse=True,
+            )
+            for stat in stats
+        }
+
+    def __len__(self) -> int:
+        return len(self._players)
+
+    def top(
+        self, stat: str, k: int = 10, min_attempts: int = 0
+    ) -> List[Dict[str, Any]]:
+        """The k best players by ``stat``, highest first.
+
+        ``min_attempts`` sets the attempt floor for percentage stats. Raises
+        ValueError for a stat that is not numeric on any player.
+        """
+        eligible = _eligibility(stat, min_attempts)
+        order = self._order.get(stat)
+        if order is not None:
+            leaders = []
+            for i in order:
+                if len(leaders) == k:
+                    break
+                if eligible(self._players[i]):
+                    leaders.append(self._players[i])
+            return leaders
+
+        if not any(isinstance(p.get(stat), Number) for p in self._players):
+            raise ValueError(f"Unknown stat: {stat}")
+        return heapq.nlargest(
+            k,
+            (p for p in self._players if eligible(p)),
+            key=lambda p: _value(p, stat),
+        )
+
+
+def _value(player: Dict[str, Any], stat: str) -> float:
+    value = player.get(stat, 0)
+    return value if isinstance(value, Number) else 0
+
+
+def _eligibility(stat: str, min_attempts: int):
+    attempts = ATTEMPTS.get(stat)
+    if attempts is None:
+        return lambda player: True
+    floor = max(min_attempts, 1)
+    return lambda player: player.get(attempts, 0) >= floor
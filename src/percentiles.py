@@ -0,0 +1,65 @@
+"""
+Percentile ranks for player advanced stats.
+
+Every numeric metric in calculate_player_advanced_stats output is collected
+from the qualified players into one sorted NumPy array per metric, so a
+rank is a binary search (np.searchsorted) instead of a comparison against
+every player.
+"""
+
+from numbers import Number
+from typing import Any, Dict, Iterable, Iterator, Tuple
+
+import numpy as np
+
+# Metrics where a smaller value is the better one
+LOWER_IS_BETTER = {
+    ("usage_role", "to_rate"),
+    ("ball_handling", "tpg"),
+    ("ball_handling", "total_turnovers"),
+    ("discipline", "fpg"),
+    ("consistency", "pts_variance"),
+}
+
+
+def _metrics(advanced: Dict[str, Any]) -> Iterator[Tuple[Tuple[str, str], float]]:
+    """((section, stat), value) for every numeric metric; bools are skipped"""
+    for section, stats in advanced.items():
+        if not isinstance(stats, dict):
+            continue
+        for stat, value in stats.items():
+            if isinstance(value, Number) and not isinstance(value, bool):
+                yield (section, stat), float(value)
+
+
+class PercentileIndex:
+    """Sorted per-metric values of the qualified players"""
+
+    def __init__(self, advanced: Dict[str, Dict[str, Any]], qualified: Iterable[str]):
+        columns: Dict[Tuple[str, str], list] = {}
+        self.qualified = [name for name in qualified if name in advanced]
+        for name in self.qualified:
+            for metric, value in _metrics(advanced[name]):
+                columns.setdefault(metric, []).append(value)
+        self._sorted = {metric: np.sort(values) for metric, values in columns.items()}
+
+    def ranks(self, advanced: Dict[str, Any]) -> Dict[str, Dict[str, int]]:
+        """Percentile rank (0-100, higher is better) of each metric.
+
+        The rank is the share of qualified players this line is at least as
+        good as, so the best qualified player scores 100.
+        """
+        ranks: Dict[str, Dict[str, int]] = {}
+        for metric, value in _metrics(advanced):
+            values = self._sorted.get(metric)
+            if values is None or not len(values):
+                continue
+            if metric in LOWER_IS_BETTER:
+                at_least_as_good = len(values) - np.searchsorted(values, value, "left")
+            else:
+                at_least_as_good = np.searchsorted(values, value, "right")
+            section, stat = metric
+            ranks.setdefault(section, {})[stat] = round(
+                int(at_least_as_good) / len(values) * 100
+            )
+        return ranks
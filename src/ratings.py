@@ -0,0 +1,97 @@
+"""
+Schedule-adjusted team ratings (Simple Rating System / Massey).
+
+Every game says rating[team] - rating[opponent] ~= margin. The least
+squares solution of that team x game system is found through its normal
+equations: the (teams x teams) Massey matrix is accumulated straight from
+the game list with np.add.at, never materializing the game x team design
+matrix. Ratings are only relative within a group of teams linked by games,
+so for each such connected component one row is replaced by
+sum(component ratings) = 0 to pin its scale. A rating splits into margin
+of victory (MOV) plus strength of schedule (SOS).
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# (team, opponent, team_score, opponent_score)
+Result = Tuple[str, str, int, int]
+
+
+def massey_ratings(
+    results: Iterable[Result], margin_cap: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """SRS ratings for every team in ``results``, best first.
+
+    ``margin_cap`` limits how much a single blowout can count. Each team
+    carries the id of its connected ``component``; ratings from different
+    components are not comparable.
+    """
+    results = list(results)
+    if not results:
+        return []
+    teams = sorted({r[0] for r in results} | {r[1] for r in results})
+    index = {team: i for i, team in enumerate(teams)}
+    a = np.array([index[r[0]] for r in results])
+    b = np.array([index[r[1]] for r in results])
+    margin = np.array([r[2] - r[3] for r in results], dtype=float)
+    if margin_cap is not None:
+        margin = np.clip(margin, -margin_cap, margin_cap)
+
+    n = len(teams)
+    games = np.bincount(a, minlength=n) + np.bincount(b, minlength=n)
+    massey = np.diag(games.astype(float))
+    np.add.at(massey, (a, b), -1.0)
+    np.add.at(massey, (b, a), -1.0)
+    net = np.bincount(a, weights=margin, minlength=n) - np.bincount(
+        b, weights=margin, minlength=n
+    )
+
+    component = _components(n, a, b)
+    rhs = net.copy()
+    for c in range(component.max() + 1):
+        members = component == c
+        first = np.argmax(members)
+        massey[first, :] = members
+        rhs[first] = 0.0
+    ratings = np.linalg.solve(massey, rhs)
+
+    wins = np.bincount(a, weights=margin > 0, minlength=n) + np.bincount(
+        b, weights=margin < 0, minlength=n
+    )
+    ties = np.bincount(a, weights=margin == 0, minlength=n) + np.bincount(
+        b, weights=margin == 0, minlength=n
+    )
+    losses = games - wins - ties
+    mov = net / games  # every listed team has played at least once
+    table = [
+        {
+            "team": team,
+            "rating": round(float(ratings[i]), 2),
+            "mov": round(float(mov[i]), 2),
+            "sos": round(float(ratings[i] - mov[i]), 2),
+            "games": int(games[i]),
+            "record": f"{int(wins[i])}-{int(losses[i])}"
+            + (f"-{int(ties[i])}" if ties[i] else ""),
+            "ties": int(ties[i]),
+            "component": int(component[i]),
+        }
+        for i, team in enumerate(teams)
+    ]
+    return sorted(table, key=lambda t: t["rating"], reverse=True)
+
+
+def _components(n: int, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Connected component id (0, 1, ...) per team, by min-label propagation"""
+    label = np.arange(n)
+    while True:
+        low = np.minimum(label[a], label[b])
+        updated = label.copy()
+        np.minimum.at(updated, a, low)
+        np.minimum.at(updated, b, low)
+        # Jump to each label's own label so long chains settle quickly
+        updated = updated[updated]
+        if np.array_equal(updated, label):
+            return np.unique(label, return_inverse=True)[1]
+        label = updated
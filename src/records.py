@@ -0,0 +1,211 @@
+"""
+Compact in-memory records for games and player box score lines.
+
+The JSON layout stores every player line as a dict with repeated key and
+name strings and pre-formatted percentage strings ("46%"). These records
+keep only interned strings and integer counts in ``__slots__`` objects and
+derive percentages on demand. ``to_dict`` reproduces the JSON layout.
+"""
+
+import sys
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+PLAYER_LINE_FIELDS = (
+    "fg_made",
+    "fg_att",
+    "fg3_made",
+    "fg3_att",
+    "ft_made",
+    "ft_att",
+    "oreb",
+    "dreb",
+    "fouls",
+    "stl",
+    "to",
+    "blk",
+    "asst",
+    "pts",
+    "plus_minus",
+)
+
+TEAM_STAT_FIELDS = (
+    "fg",
+    "fga",
+    "fg3",
+    "fg3a",
+    "ft",
+    "fta",
+    "oreb",
+    "dreb",
+    "reb",
+    "asst",
+    "to",
+    "stl",
+    "blk",
+    "fouls",
+)
+
+
+def format_pct(made: int, att: int) -> str:
+    """Format a shooting percentage the way the stat sheets print it"""
+    if not made or not att:
+        return "-"
+    return f"{round(made / att * 100)}%"
+
+
+class PlayerLine:
+    """One player's box score line for one game"""
+
+    __slots__ = ("name", "number") + PLAYER_LINE_FIELDS
+
+    def __init__(self, name: str, number: int, *stats: int):
+        self.name = name
+        self.number = number
+        for field, value in zip(PLAYER_LINE_FIELDS, stats):
+            setattr(self, field, value)
+
+    @classmethod
+    def from_dict(
+        cls, row: Dict[str, Any], intern: Callable[[str], str] = sys.intern
+    ) -> "PlayerLine":
+        return cls(
+            intern(row.get("name", "")),
+            row.get("number"),
+            *(row.get(field, 0) for field in PLAYER_LINE_FIELDS),
+        )
+
+    @property
+    def reb(self) -> int:
+        return self.oreb + self.dreb
+
+    @property
+    def fg_pct(self) -> str:
+        return format_pct(self.fg_made, self.fg_att)
+
+    @property
+    def fg3_pct(self) -> str:
+        return format_pct(self.fg3_made, self.fg3_att)
+
+    @property
+    def ft_pct(self) -> str:
+        return format_pct(self.ft_made, self.ft_att)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "number": self.number,
+            "name": self.name,
+            "fg_made": self.fg_made,
+            "fg_att": self.fg_att,
+            "fg_pct": self.fg_pct,
+            "fg3_made": self.fg3_made,
+            "fg3_att": self.fg3_att,
+            "fg3_pct": self.fg3_pct,
+            "ft_made": self.ft_made,
+            "ft_att": self.ft_att,
+            "ft_pct": self.ft_pct,
+            "oreb": self.oreb,
+            "dreb": self.dreb,
+            "fouls": self.fouls,
+            "stl": self.stl,
+            "to": self.to,
+            "blk": self.blk,
+            "asst": self.asst,
+            "pts": self.pts,
+            "plus_minus": self.plus_minus,
+        }
+
+
+class GameRecord:
+    """One game with team totals as a tuple in TEAM_STAT_FIELDS order"""
+
+    __slots__ = (
+        "game_id",
+        "date",
+        "opponent",
+        "location",
+        "vc_score",
+        "opp_score",
+        "result",
+        "team_stats",
+        "player_lines",
+    )
+
+    def __init__(
+        self,
+        game_id: int,
+        date: str,
+        opponent: str,
+        location: str,
+        vc_score: int,
+        opp_score: int,
+        result: str,
+        team_stats: Tuple[int, ...],
+        player_lines: Tuple[PlayerLine, ...],
+    ):
+        self.game_id = game_id
+        self.date = date
+        self.opponent = opponent
+        self.location = location
+        self.vc_score = vc_score
+        self.opp_score = opp_score
+        self.result = result
+        self.team_stats = team_stats
+        self.player_lines = player_lines
+
+    @classmethod
+    def from_dict(
+        cls, game: Dict[str, Any], intern: Callable[[str], str] = sys.intern
+    ) -> "GameRecord":
+        ts = game.get("team_stats", {})
+        return cls(
+            game["gameId"],
+            intern(game.get("date", "")),
+            intern(game.get("opponent", "")),
+            intern(game.get("location", "")),
+            game.get("vc_score", 0),
+            game.get("opp_score", 0),
+            intern(game.get("result", "")),
+            tuple(ts.get(field, 0) for field in TEAM_STAT_FIELDS),
+            tuple(
+                PlayerLine.from_dict(row, intern)
+                for row in game.get("player_stats", [])
+            ),
+        )
+
+    def team_stat(self, field: str) -> int:
+        return self.team_stats[TEAM_STAT_FIELDS.index(field)]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "gameId": self.game_id,
+            "date": self.date,
+            "opponent": self.opponent,
+            "location": self.location,
+            "vc_score": self.vc_score,
+            "opp_score": self.opp_score,
+            "result": self.result,
+            "team_stats": dict(zip(TEAM_STAT_FIELDS, self.team_stats)),
+            "player_stats": [line.to_dict() for line in self.player_lines],
+        }
+
+
+def compact_games(games: Iterable[Dict[str, Any]]) -> List[GameRecord]:
+    """Convert JSON game dicts into compact records"""
+    return [GameRecord.from_dict(game) for game in games]
+
+
+def intern_game_strings(games: Iterable[Dict[str, Any]]) -> None:
+    """Intern repeated strings in JSON game dicts in place.
+
+    json.load creates a new string object for every value, so each player
+    name and opponent is stored once per occurrence. Interning collapses
+    them to a single shared object without changing the dict layout.
+    """
+    for game in games:
+        for key in ("date", "opponent", "location", "result"):
+            if isinstance(game.get(key), str):
+                game[key] = sys.intern(game[key])
+        for row in game.get("player_stats", []):
+            for key in ("name", "fg_pct", "fg3_pct", "ft_pct"):
+                if isinstance(row.get(key), str):
+                    row[key] = sys.intern(row[key])
@@ -0,0 +1,95 @@
+"""
+Running mean/variance accumulators for per-game stats.
+
+Each (player, stat) and team stat keeps a Welford accumulator: count, mean
+and sum of squared deviations, plus min and max. Adding a game updates every
+accumulator it touches in O(1), so variance and standard deviation are read
+from state instead of recomputed over full game lists, and the updates stay
+numerically stable for long archives.
+"""
+
+import math
+from typing import Any, Dict, Iterable, Optional
+
+from src.records import PLAYER_LINE_FIELDS, TEAM_STAT_FIELDS
+
+# Per-game stats tracked for every player ("reb" is oreb + dreb)
+PLAYER_TRACKED = PLAYER_LINE_FIELDS + ("reb",)
+
+# Per-game team stats; fg_pct only counts games with attempts
+TEAM_TRACKED = ("vc_score", "opp_score") + TEAM_STAT_FIELDS + ("fg_pct",)
+
+
+class RunningStat:
+    """Welford's online mean and variance of one stat"""
+
+    __slots__ = ("count", "mean", "m2", "min", "max")
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def add(self, value: float):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    @property
+    def variance(self) -> float:
+        """Sample variance (n - 1), 0 for fewer than two values"""
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def stdev(self) -> float:
+        return math.sqrt(self.variance)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "games": self.count,
+            "mean": round(self.mean, 1),
+            "std_dev": round(self.stdev, 1),
+            "variance": round(self.variance, 1),
+            "min": self.min,
+            "max": self.max,
+        }
+
+
+class RunningStats:
+    """Accumulators for the team and every player, fed one game at a time"""
+
+    def __init__(self, games: Iterable[Dict[str, Any]] = ()):
+        self.team: Dict[str, RunningStat] = {s: RunningStat() for s in TEAM_TRACKED}
+        self.players: Dict[str, Dict[str, RunningStat]] = {}
+        for game in games:
+            self.add_game(game)
+
+    def add_game(self, game: Dict[str, Any]):
+        """Fold one game into the team and player accumulators"""
+        ts = game.get("team_stats", {})
+        self.team["vc_score"].add(game.get("vc_score", 0))
+        self.team["opp_score"].add(game.get("opp_score", 0))
+        for field in TEAM_STAT_FIELDS:
+            self.team[field].add(ts.get(field, 0))
+        if ts.get("fga"):
+            self.team["fg_pct"].add(ts.get("fg", 0) / ts["fga"] * 100)
+
+        for row in game.get("player_stats", []):
+            name = row.get("name")
+            if not name:
+                continue
+            stats = self.players.get(name)
+            if stats is None:
+                stats = self.players[name] = {s: RunningStat() for s in PLAYER_TRACKED}
+            for field in PLAYER_LINE_FIELDS:
+                stats[field].add(row.get(field, 0))
+            stats["reb"].add(row.get("oreb", 0) + row.get("dreb", 0))
+
+    def player(self, name: str, stat: str) -> Optional[RunningStat]:
+        stats = self.players.get(name)
+        return stats.get(stat) if stats else None
@@ -0,0 +1,110 @@
+"""
+Player similarity: "who plays like H Lomber".
+
+Each player becomes a vector of advanced stats (as produced by
+calculate_player_advanced_stats). Vectors are z-normalized per feature and
+stored as one NumPy matrix, so a query is a single matrix-vector product
+against every player (or a matrix-matrix product for a batch of players).
+"""
+
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+
+# (section, stat) paths into calculate_player_advanced_stats output
+SIMILARITY_FEATURES = (
+    ("scoring_efficiency", "ppg"),
+    ("scoring_efficiency", "pts_per_shot"),
+    ("scoring_efficiency", "efg_pct"),
+    ("scoring_efficiency", "ts_pct"),
+    ("scoring_efficiency", "fg2_pct"),
+    ("scoring_efficiency", "fg3_pct"),
+    ("scoring_efficiency", "ft_pct"),
+    ("scoring_efficiency", "per"),
+    ("usage_role", "usage_proxy"),
+    ("usage_role", "shot_volume_share"),
+    ("usage_role", "to_rate"),
+    ("ball_handling", "apg"),
+    ("ball_handling", "ast_to_ratio"),
+    ("ball_handling", "tpg"),
+    ("rebounding", "rpg"),
+    ("rebounding", "reb_share"),
+    ("defense_activity", "spg"),
+    ("defense_activity", "bpg"),
+    ("discipline", "fpg"),
+)
+
+METRICS = ("cosine", "euclidean")
+
+
+class SimilarityIndex:
+    """z-normalized advanced-stat vectors for nearest-player queries"""
+
+    def __init__(self, advanced: Dict[str, Dict[str, Any]]):
+        self.names = list(advanced)
+        self._row = {name: i for i, name in enumerate(self.names)}
+        matrix = np.array(
+            [
+                [
+                    float(advanced[name][section][stat])
+                    for section, stat in SIMILARITY_FEATURES
+                ]
+                for name in self.names
+            ],
+            dtype=float,
+        ).reshape(-1, len(SIMILARITY_FEATURES))
+        std = matrix.std(axis=0)
+        # Constant features carry no signal; leave them at zero
+        self.z = (matrix - matrix.mean(axis=0)) / np.where(std > 0, std, 1.0)
+        self._sq_norms = np.einsum("ij,ij->i", self.z, self.z)
+        norms = np.sqrt(self._sq_norms)
+        self._unit = self.z / np.where(norms > 0, norms, 1.0)[:, None]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._row
+
+    def similar(
+        self, names: Sequence[str], k: int = 5, metric: str = "cosine"
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Top-k most similar other players for each name, best first.
+
+        Cosine results carry a ``similarity`` in [-1, 1]; Euclidean results
+        a ``distance`` in z-score units. Raises KeyError for an unknown name
+        and ValueError for an unknown metric.
+        """
+        if metric not in METRICS:
+            raise ValueError(f"Unknown metric: {metric}")
+        rows = np.array([self._row[name] for name in names], dtype=int)
+        if metric == "cosine":
+            scores = self._unit[rows] @ self._unit.T
+        else:
+            # |a - b|^2 = |a|^2 + |b|^2 - 2 a.b, negated so larger is closer
+            sq = (
+                self._sq_norms[rows, None]
+                + self._sq_norms
+                - 2 * self.z[rows] @ self.z.T
+            )
+            scores = -np.sqrt(np.maximum(sq, 0.0))
+        scores[np.arange(len(rows)), rows] = -np.inf
+
+        results = {}
+        for name, row in zip(names, scores):
+            results[name] = [
+                _match(self.names[j], float(row[j]), metric)
+                for j in _top_k(row, min(k, len(self.names) - 1))
+            ]
+        return results
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k largest scores, largest first, in O(n + k log k)"""
+    if k <= 0:
+        return np.array([], dtype=int)
+    top = np.argpartition(-scores, k - 1)[:k]
+    return top[np.lexsort((top, -scores[top]))]
+
+
+def _match(name: str, score: float, metric: str) -> Dict[str, Any]:
+    if metric == "cosine":
+        return {"name": name, "similarity": round(score, 3)}
+    return {"name": name, "distance": round(-score, 3)}
@@ -0,0 +1,310 @@
+"""
+Split engine: team and player totals over subsets of games.
+
+SplitIndex puts games in chronological order and stores every stat as a
+prefix sum, so the totals for games i..j are prefix[j] - prefix[i] whatever
+the range length. SplitCube pre-aggregates totals for every combination of
+game dimensions (location, result, opponent, month, margin), so a grouped
+or filtered split is a lookup of ready-made cells. Build both once per data
+version and query freely.
+"""
+
+from bisect import bisect_left, bisect_right
+from datetime import date
+from itertools import combinations
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from src.export import parse_game_date
+from src.records import PLAYER_LINE_FIELDS, TEAM_STAT_FIELDS
+
+TEAM_FIELDS = ("games", "wins", "vc_score", "opp_score") + TEAM_STAT_FIELDS
+PLAYER_FIELDS = ("games",) + PLAYER_LINE_FIELDS
+
+
+CUBE_DIMENSIONS = ("location", "result", "opponent", "month", "margin")
+
+# Upper bounds of the final-margin buckets; anything larger is "21+"
+MARGIN_BUCKETS = ((5, "0-5"), (10, "6-10"), (20, "11-20"))
+
+
+def game_order_key(game: Dict[str, Any]) -> Tuple[date, int]:
+    """Chronological sort key; games without a parseable date sort first"""
+    return parse_game_date(game.get("date")) or date.min, game["gameId"]
+
+
+def margin_bucket(margin: int) -> str:
+    """Bucket a final margin by size; pair with ``result`` for the sign"""
+    margin = abs(margin)
+    for limit, label in MARGIN_BUCKETS:
+        if margin <= limit:
+            return label
+    return f"{MARGIN_BUCKETS[-1][0] + 1}+"
+
+
+def game_dimensions(game: Dict[str, Any]) -> Dict[str, str]:
+    """The cube coordinates of one game"""
+    played = parse_game_date(game.get("date"))
+    return {
+        "location": game.get("location") or "unknown",
+        "result": game.get("result") or "unknown",
+        "opponent": game.get("opponent") or "unknown",
+        "month": played.strftime("%Y-%m") if played else "unknown",
+        "margin": margin_bucket(game.get("vc_score", 0) - game.get("opp_score", 0)),
+    }
+
+
+def _team_row(game: Dict[str, Any]) -> Tuple[int, ...]:
+    ts = game.get("team_stats", {})
+    return (
+        (1, int(game.get("result") == "W"))
+        + (game.get("vc_score", 0), game.get("opp_score", 0))
+        + tuple(ts.get(field, 0) for field in TEAM_STAT_FIELDS)
+    )
+
+
+def _player_row(row: Dict[str, Any]) -> Tuple[int, ...]:
+    return (1,) + tuple(row.get(field, 0) for field in PLAYER_LINE_FIELDS)
+
+
+def _add(a: Sequence[int], b: Sequence[int]) -> Tuple[int, ...]:
+    return tuple(x + y for x, y in zip(a, b))
+
+
+def _accumulate(rows: Sequence[Sequence[int]], width: int) -> List[Tuple[int, ...]]:
+    prefix = [(0,) * width]
+    for row in rows:
+        prefix.append(_add(prefix[-1], row))
+    return prefix
+
+
+def _shooting(totals: Dict[str, int], made: str, att: str) -> float:
+    return round(totals[made] / totals[att] * 100, 1) if totals.get(att) else 0.0
+
+
+def team_summary(totals: Dict[str, int]) -> Dict[str, Any]:
+    """Totals, per-game averages, record and shooting from team totals"""
+    games = totals["games"]
+    return {
+        "games": games,
+        "record": f"{totals['wins']}-{games - totals['wins']}",
+        "totals": totals,
+        "per_game": {
+            field: round(totals[field] / games, 1) if games else 0.0
+            for field in TEAM_FIELDS[2:]
+        },
+        "fg_pct": _shooting(totals, "fg", "fga"),
+        "fg3_pct": _shooting(totals, "fg3", "fg3a"),
+        "ft_pct": _shooting(totals, "ft", "fta"),
+    }
+
+
+def player_summary(totals: Dict[str, int]) -> Dict[str, Any]:
+    """Totals, per-game averages and shooting over the games a player played"""
+    games = totals["games"]
+    per_game = {
+        field: round(totals[field] / games, 1) if games else 0.0
+        for field in PLAYER_FIELDS[1:]
+    }
+    per_game["reb"] = (
+        round((totals["oreb"] + totals["dreb"]) / games, 1) if games else 0.0
+    )
+    return {
+        "games": games,
+        "totals": totals,
+        "per_game": per_game,
+        "fg_pct": _shooting(totals, "fg_made", "fg_att"),
+        "fg3_pct": _shooting(totals, "fg3_made", "fg3_att"),
+        "ft_pct": _shooting(totals, "ft_made", "ft_att"),
+    }
+
+
+class SplitIndex:
+    """Prefix sums of team and player stats in game order"""
+
+    def __init__(self, games: Sequence[Dict[str, Any]]):
+        ordered = sorted(games, key=game_order_key)
+        self.games = [
+            {
+                "gameId": g["gameId"],
+                "date": g.get("date"),
+                "opponent": g.get("opponent"),
+                "result": g.get("result"),
+            }
+            for g in ordered
+        ]
+        self._dates = [game_order_key(g)[0] for g in ordered]
+        self._position = {g["gameId"]: i for i, g in enumerate(ordered)}
+
+        team_rows = []
+        player_rows: Dict[str, List[Tuple[int, ...]]] = {}
+        empty = (0,) * len(PLAYER_FIELDS)
+        for i, game in enumerate(ordered):
+            team_rows.append(_team_row(game))
+            for row in game.get("player_stats", []):
+                rows = player_rows.setdefault(row.get("name", ""), [empty] * i)
+                rows.append(_player_row(row))
+            for rows in player_rows.values():
+                if len(rows) == i:
+                    rows.append(empty)
+
+        self._team = _accumulate(team_rows, len(TEAM_FIELDS))
+        self._players = {
+            name: _accumulate(rows, len(PLAYER_FIELDS))
+            for name, rows in player_rows.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self.games)
+
+    @property
+    def players(self) -> List[str]:
+        return list(self._players)
+
+    def position(self, game_id: int) -> int:
+        """Index of a game in chronological order; ValueError if unknown"""
+        try:
+            return self._position[game_id]
+        except KeyError:
+            raise ValueError(f"Unknown game: {game_id}")
+
+    def bounds(
+        self,
+        from_game: Optional[int] = None,
+        to_game: Optional[int] = None,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        first: Optional[int] = None,
+        last: Optional[int] = None,
+    ) -> Tuple[int, int]:
+        """Half-open [i, j) slice of game order for the given limits.
+
+        Game and date limits are inclusive and combine by intersection;
+        ``first``/``last`` then keep the first or last N games of that range.
+        """
+        i, j = 0, len(self.games)
+        if from_game is not None:
+            i = max(i, self.position(from_game))
+        if to_game is not None:
+            j = min(j, self.position(to_game) + 1)
+        if start is not None:
+            i = max(i, bisect_left(self._dates, start))
+        if end is not None:
+            j = min(j, bisect_right(self._dates, end))
+        j = max(i, j)
+        if first is not None:
+            j = min(j, i + first)
+        if last is not None:
+            i = max(i, j - last)
+        return i, j
+
+    def team_totals(self, i: int, j: int) -> Dict[str, int]:
+        hi, lo = self._team[j], self._team[i]
+        return {field: hi[k] - lo[k] for k, field in enumerate(TEAM_FIELDS)}
+
+    def player_totals(self, name: str, i: int, j: int) -> Optional[Dict[str, int]]:
+        prefix = self._players.get(name)
+        if prefix is None:
+            return None
+        hi, lo = prefix[j], prefix[i]
+        return {field: hi[k] - lo[k] for k, field in enumerate(PLAYER_FIELDS)}
+
+    def team_split(self, i: int, j: int) -> Dict[str, Any]:
+        """Totals, per-game averages, record and shooting for games i..j-1"""
+        return team_summary(self.team_totals(i, j))
+
+    def player_split(self, name: str, i: int, j: int) -> Optional[Dict[str, Any]]:
+        """A player's totals and per-game averages over the games they played"""
+        totals = self.player_totals(name, i, j)
+        return player_summary(totals) if totals is not None else None
+
+
+class _Cell:
+    """Summed team and per-player rows for one group of games"""
+
+    __slots__ = ("team", "players")
+
+    def __init__(self):
+        self.team: Tuple[int, ...] = (0,) * len(TEAM_FIELDS)
+        self.players: Dict[str, Tuple[int, ...]] = {}
+
+    def add(self, team: Sequence[int], players: Dict[str, Sequence[int]]):
+        self.team = _add(self.team, team)
+        empty = (0,) * len(PLAYER_FIELDS)
+        for name, row in players.items():
+            self.players[name] = _add(self.players.get(name, empty), row)
+
+
+class SplitCube:
+    """Team and player totals pre-aggregated over every dimension subset.
+
+    The finest cells (one per distinct combination of all dimensions) are
+    summed from the games; each coarser group-by is rolled up from those
+    cells, so building costs O(cells * 2^dimensions) and a query never
+    touches a game.
+    """
+
+    def __init__(self, games: Iterable[Dict[str, Any]]):
+        base: Dict[Tuple[str, ...], _Cell] = {}
+        for game in games:
+            dims = game_dimensions(game)
+            players: Dict[str, Tuple[int, ...]] = {}
+            for row in game.get("player_stats", []):
+                name = row.get("name", "")
+                players[name] = _add(
+                    players.get(name, (0,) * len(PLAYER_FIELDS)), _player_row(row)
+                )
+            key = tuple(dims[d] for d in CUBE_DIMENSIONS)
+            base.setdefault(key, _Cell()).add(_team_row(game), players)
+
+        self._cuboids: Dict[Tuple[str, ...], Dict[Tuple[str, ...], _Cell]] = {}
+        for size in range(len(CUBE_DIMENSIONS) + 1):
+            for group in combinations(CUBE_DIMENSIONS, size):
+                index = [CUBE_DIMENSIONS.index(d) for d in group]
+                cuboid: Dict[Tuple[str, ...], _Cell] = {}
+                for key, cell in base.items():
+                    sub = tuple(key[k] for k in index)
+                    cuboid.setdefault(sub, _Cell()).add(cell.team, cell.players)
+                self._cuboids[group] = cuboid
+
+    def values(self, dimension: str) -> List[str]:
+        """Distinct values of one dimension, sorted"""
+        return sorted(key[0] for key in self._cuboids[(dimension,)])
+
+    def query(
+        self,
+        by: Sequence[str] = (),
+        filters: Optional[Dict[str, str]] = None,
+        players: Optional[Sequence[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Cells grouped by ``by`` among games matching ``filters``.
+
+        Each cell carries its dimension values, the team summary and a
+        summary per player who appeared (limited to ``players`` if given).
+        Raises ValueError on an unknown dimension.
+        """
+        filters = filters or {}
+        unknown = [d for d in list(by) + list(filters) if d not in CUBE_DIMENSIONS]
+        if unknown:
+            raise ValueError(f"Unknown dimension: {unknown[0]}")
+
+        group = tuple(d for d in CUBE_DIMENSIONS if d in by or d in filters)
+        cells = []
+        for key, cell in sorted(self._cuboids[group].items()):
+            coords = dict(zip(group, key))
+            if any(coords[d] != value for d, value in filters.items()):
+                continue
+            names = cell.players if players is None else players
+            cells.append(
+                {
+                    "key": {d: coords[d] for d in by},
+                    "team": team_summary(dict(zip(TEAM_FIELDS, cell.team))),
+                    "players": {
+                        name: player_summary(
+                            dict(zip(PLAYER_FIELDS, cell.players[name]))
+                        )
+                        for name in names
+                        if name in cell.players
+                    },
+                }
+            )
+        return cells
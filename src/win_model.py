@@ -0,0 +1,143 @@
+"""
+Win-probability model: logistic regression on per-game team stats.
+
+Features are standardized and the model is fit by Newton's method (IRLS)
+with a small L2 penalty, each step one vectorized NumPy solve of a
+(features x features) system. That costs O(games * features^2) per step,
+so a season fits in milliseconds and multi-season archives stay cheap. The
+penalty keeps coefficients finite when a season separates wins from losses
+perfectly, which small samples often do.
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# L2 penalty on standardized coefficients (the intercept is not penalized)
+L2_PENALTY = 1.0
+MAX_ITERATIONS = 50
+TOLERANCE = 1e-8
+
+
+def _pct(made: str, att: str) -> Callable[[Dict[str, Any]], Optional[float]]:
+    return lambda ts: ts.get(made, 0) / ts[att] * 100 if ts.get(att) else None
+
+
+# Feature name -> value from a game's team_stats (None when undefined, e.g.
+# 3P% with no attempts; such values are filled with the season mean)
+FEATURES: Tuple[Tuple[str, Callable[[Dict[str, Any]], Optional[float]]], ...] = (
+    ("fg_pct", _pct("fg", "fga")),
+    ("fg3_pct", _pct("fg3", "fg3a")),
+    ("fta_rate", _pct("fta", "fga")),
+    ("to", lambda ts: ts.get("to", 0)),
+    ("oreb", lambda ts: ts.get("oreb", 0)),
+    ("dreb", lambda ts: ts.get("dreb", 0)),
+    ("asst", lambda ts: ts.get("asst", 0)),
+    ("stl", lambda ts: ts.get("stl", 0)),
+)
+
+
+def _sigmoid(z: np.ndarray) -> np.ndarray:
+    return 1.0 / (1.0 + np.exp(-np.clip(z, -35, 35)))
+
+
+def fit_logistic(
+    X: np.ndarray, y: np.ndarray, l2: float = L2_PENALTY
+) -> Tuple[np.ndarray, int]:
+    """Newton/IRLS fit of P(y=1) = sigmoid(b0 + X @ b); returns (beta, steps).
+
+    X should already be standardized; beta[0] is the intercept.
+    """
+    design = np.column_stack([np.ones(len(X)), X])
+    penalty = l2 * np.eye(design.shape[1])
+    penalty[0, 0] = 0.0
+    beta = np.zeros(design.shape[1])
+    for step in range(1, MAX_ITERATIONS + 1):
+        p = _sigmoid(design @ beta)
+        gradient = design.T @ (y - p) - penalty @ beta
+        hessian = (design * (p * (1 - p))[:, None]).T @ design + penalty
+        delta = np.linalg.solve(hessian, gradient)
+        beta += delta
+        if np.abs(delta).max() < TOLERANCE:
+            break
+    return beta, step
+
+
+def game_features(
+    games: Sequence[Dict[str, Any]],
+) -> Tuple[np.ndarray, np.ndarray, List[Dict[str, Any]]]:
+    """Feature matrix, win vector and the decided games, in order.
+
+    Undefined features are NaN in the matrix; see impute_missing.
+    """
+    rows, wins, used = [], [], []
+    for game in games:
+        if game.get("result") not in ("W", "L"):
+            continue
+        ts = game.get("team_stats", {})
+        row = [feature(ts) for _, feature in FEATURES]
+        rows.append([np.nan if value is None else value for value in row])
+        wins.append(game["result"] == "W")
+        used.append(game)
+    X = np.array(rows, dtype=float).reshape(-1, len(FEATURES))
+    return X, np.array(wins, dtype=float), used
+
+
+def impute_missing(X: np.ndarray) -> np.ndarray:
+    """Replace NaN with the column mean of the other games (0 if none)"""
+    missing = np.isnan(X)
+    counts = (~missing).sum(axis=0)
+    means = np.where(missing, 0.0, X).sum(axis=0) / np.maximum(counts, 1)
+    return np.where(missing, means, X)
+
+
+def build_win_model(
+    games: Sequence[Dict[str, Any]], l2: float = L2_PENALTY
+) -> Optional[Dict[str, Any]]:
+    """Fit the model and describe it; None without both wins and losses"""
+    X, y, used = game_features(games)
+    if len(used) < 2 or y.min() == y.max():
+        return None
+    missing = np.isnan(X)
+    X = impute_missing(X)
+
+    mean = X.mean(axis=0)
+    std = X.std(axis=0)
+    std[std == 0] = 1.0
+    beta, steps = fit_logistic((X - mean) / std, y, l2)
+    p = _sigmoid(beta[0] + ((X - mean) / std) @ beta[1:])
+    eps = 1e-12
+    log_loss = -np.mean(y * np.log(p + eps) + (1 - y) * np.log(1 - p + eps))
+
+    return {
+        "features": [name for name, _ in FEATURES],
+        "intercept": round(float(beta[0]), 4),
+        "coefficients": {
+            name: {
+                "per_std": round(float(b), 4),
+                "per_unit": round(float(b / s), 4),
+                "mean": round(float(m), 2),
+                "std": round(float(s), 2),
+            }
+            for (name, _), b, m, s in zip(FEATURES, beta[1:], mean, std)
+        },
+        "l2": l2,
+        "iterations": steps,
+        "training": {
+            "games": len(used),
+            "accuracy": round(float(np.mean((p >= 0.5) == (y == 1))) * 100, 1),
+            "log_loss": round(float(log_loss), 4),
+            "imputed_games": int(missing.any(axis=1).sum()),
+        },
+        "games": [
+            {
+                "gameId": game["gameId"],
+                "date": game.get("date"),
+                "opponent": game.get("opponent"),
+                "result": game["result"],
+                "win_probability": round(float(prob), 3),
+                "imputed": [name for (name, _), m in zip(FEATURES, gaps) if m],
+            }
+            for game, prob, gaps in zip(used, p, missing)
+        ],
+    }
@@ -11,22 +11,24 @@ document.addEventListener('DOMContentLoaded', async () => {
 // Load stats context for the sidebar
 async function loadStatsContext() {
     try {
-        const [playersRes, gamesRes, statsRes] = await Promise.all([
-            fetch('/api/players'),
-            fetch('/api/games'),
-            fetch('/api/season-stats')
-        ]);
+        const response = await fetch('/api/bootstrap/ai-insights');
         
-        // Check if responses are ok
-        if (!playersRes.ok || !gamesRes.ok || !statsRes.ok) {
+        // Check if response is ok
+        if (!response.ok) {
             throw new Error('Failed to load stats data from server');
         }
         
-        const players = await playersRes.json();
-        const games = await gamesRes.json();
-        const seasonStats = await statsRes.json();
+        const bootstrap = await response.json();
+        const seasonStats = {
+            season_team_stats: bootstrap.season_stats,
+            season_player_stats: bootstrap.season_player_stats
+        };
         
-        statsContext = { players, games, seasonStats };
+        statsContext = {
+            players: Object.values(bootstrap.season_player_stats || {}),
+            games: bootstrap.games,
+            seasonStats
+        };
         
         // Update stats panel
         updateStatsPanel();
@@ -184,6 +186,7 @@ function addMessageToUI(role, content, shouldScroll = true) {
     if (shouldScroll) {
         scrollToBottom();
     }
+    return messageDiv;
 }
 
 // Scroll chat to bottom
@@ -223,37 +226,33 @@ async function sendMessage() {
     showTypingIndicator();
     
     try {
-        const response = await fetch('/api/ai/chat', {
-            method: 'POST',
-            headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify({ 
-                message: message,
-                history: conversationHistory.slice(-10) // Send last 10 messages for context
-            })
+        // Render tokens as they stream in instead of waiting for the full reply
+        let messageContent = null;
+        const reply = await fetchEventStream('/api/ai/chat?stream=true', {
+            message: message,
+            history: conversationHistory.slice(-10) // Send last 10 messages for context
+        }, (delta, text) => {
+            if (!messageContent) {
+                hideTypingIndicator();
+                messageContent = addMessageToUI('assistant', '').querySelector('.message-content');
+            }
+            messageContent.innerHTML = formatAIResponse(text);
+            scrollToBottom();
         });
         
-        if (!response.ok) {
-            throw new Error(`HTTP error! status: ${response.status}`);
-        }
-        
-        const data = await response.json();
-        
         hideTypingIndicator();
-        
-        if (data.error) {
-            const errorMsg = `⚠️ Error: ${data.error}`;
-            conversationHistory.push({ role: 'assistant', content: errorMsg });
-            addMessageToUI('assistant', errorMsg);
-        } else {
-            conversationHistory.push({ role: 'assistant', content: data.response });
-            addMessageToUI('assistant', data.response);
+        if (!messageContent) {
+            addMessageToUI('assistant', reply);
         }
-        
+        conversationHistory.push({ role: 'assistant', content: reply });
         saveConversationHistory();
     } catch (error) {
         hideTypingIndicator();
         console.error('Chat error:', error);
-        const errorMsg = `⚠️ Connection error: Unable to reach AI service. Please check your internet connection and try again.`;
+        // fetch() rejects with a TypeError when the request never reached the server
+        const errorMsg = error instanceof TypeError
+            ? `⚠️ Connection error: Unable to reach AI service. Please check your internet connection and try again.`
+            : `⚠️ Error: ${error.message}`;
         conversationHistory.push({ role: 'assistant', content: errorMsg });
         addMessageToUI('assistant', errorMsg);
         saveConversationHistory();
@@ -379,7 +378,7 @@ async function loadTeamSummary() {
         document.getElementById('player-analysis-section').style.display = 'none';
         document.getElementById('game-analysis-section').style.display = 'none';
         
-        const response = await fetch('/api/ai/team-summary');
+        const response = await fetchJobResult('/api/ai/team-summary?async=true');
         if (!response.ok) throw new Error('Failed to load summary');
         
         const data = await response.json();
@@ -412,21 +411,15 @@ async function askCoach() {
         document.getElementById('coach-response').style.display = 'block';
         document.getElementById('coach-answer-content').innerHTML = '<div class="loading">AI Coach is thinking...</div>';
         
-        const response = await fetch('/api/ai/analyze', {
-            method: 'POST',
-            headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify({ query: question, type: analysisType })
-        });
-        
-        const data = await response.json();
-        
-        if (data.error) {
+        try {
+            await fetchEventStream('/api/ai/analyze?stream=true', { query: question, type: analysisType }, (delta, text) => {
+                document.getElementById('coach-answer-content').innerHTML = 
+                    `<div class="ai-response"><strong>AI Response:</strong><br>${formatAIResponse(text)}</div>`;
+            });
+        } catch (error) {
             document.getElementById('coach-answer-content').innerHTML = 
-                `<div class="error-message">⚠️ ${data.error}</div>
+                `<div class="error-message">⚠️ ${error.message}</div>
                 <p>Please configure your OpenAI API key as an environment variable: <code>OPENAI_API_KEY</code></p>`;
-        } else {
-            document.getElementById('coach-answer-content').innerHTML = 
-                `<div class="ai-response"><strong>AI Response:</strong><br>${formatAIResponse(data.analysis)}</div>`;
         }
         
         askBtn.disabled = false;
@@ -505,22 +498,17 @@ async function sendChatMessage() {
     userMsg.textContent = message;
     messages.appendChild(userMsg);
     
+    const aiMsg = document.createElement('div');
+    aiMsg.className = 'chat-message ai-message';
+    
     try {
-        const response = await fetch('/api/ai/analyze', {
-            method: 'POST',
-            headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify({ query: message, type: 'general' })
+        await fetchEventStream('/api/ai/analyze?stream=true', { query: message, type: 'general' }, (delta, text) => {
+            if (!aiMsg.parentNode) messages.appendChild(aiMsg);
+            aiMsg.innerHTML = formatAIResponse(text);
+            messages.scrollTop = messages.scrollHeight;
         });
-        
-        const data = await response.json();
-        
-        const aiMsg = document.createElement('div');
-        aiMsg.className = 'chat-message ai-message';
-        aiMsg.innerHTML = data.error ? `Error: ${data.error}` : formatAIResponse(data.analysis);
-        messages.appendChild(aiMsg);
-        
-        messages.scrollTop = messages.scrollHeight;
     } catch (error) {
+        aiMsg.remove();
         const errorMsg = document.createElement('div');
         errorMsg.className = 'chat-message error-message';
         errorMsg.textContent = `Error: ${error.message}`;
@@ -1,6 +1,20 @@
 // Dashboard JavaScript
 let scoringChart = null;
 let shootingChart = null;
+let bootstrapPromise = null;
+
+// Fetch all dashboard data in a single request and share it between loaders
+function loadBootstrap() {
+    if (!bootstrapPromise) {
+        bootstrapPromise = fetch('/api/bootstrap/dashboard').then(response => {
+            if (!response.ok) {
+                throw new Error(`HTTP error! status: ${response.status}`);
+            }
+            return response.json();
+        });
+    }
+    return bootstrapPromise;
+}
 
 document.addEventListener('DOMContentLoaded', async () => {
     // Check if Chart.js is loaded
@@ -22,13 +36,7 @@ document.addEventListener('DOMContentLoaded', async () => {
 
 async function loadSeasonStats() {
     try {
-        const response = await fetch('/api/season-stats');
-        
-        if (!response.ok) {
-            throw new Error(`HTTP error! status: ${response.status}`);
-        }
-        
-        const stats = await response.json();
+        const stats = (await loadBootstrap()).season_stats;
         
         if (!stats) {
             console.error('No season stats data received');
@@ -56,13 +64,7 @@ async function loadSeasonStats() {
 
 async function loadAdvancedStats() {
     try {
-        const response = await fetch('/api/advanced/team');
-        
-        if (!response.ok) {
-            throw new Error(`HTTP error! status: ${response.status}`);
-        }
-        
-        const stats = await response.json();
+        const stats = (await loadBootstrap()).advanced_team;
         
         if (!stats || !stats.scoring_efficiency || !stats.ball_movement) {
             console.error('Invalid advanced stats data structure:', stats);
@@ -88,13 +90,7 @@ async function loadAdvancedStats() {
 
 async function loadLeaderboards() {
     try {
-        const response = await fetch('/api/leaderboards');
-        
-        if (!response.ok) {
-            throw new Error(`HTTP error! status: ${response.status}`);
-        }
-        
-        const leaderboards = await response.json();
+        const leaderboards = (await loadBootstrap()).leaderboards;
         
         // Validate data structure
         if (!leaderboards || !leaderboards.pts || !leaderboards.reb || !leaderboards.asst) {
@@ -144,8 +140,7 @@ async function loadLeaderboards() {
 
 async function loadRecentGames() {
     try {
-        const response = await fetch('/api/games');
-        let games = await response.json();
+        let games = (await loadBootstrap()).games;
 
         // Sort games by date
         games.sort((a, b) => {
@@ -182,13 +177,7 @@ async function loadRecentGames() {
 
 async function loadCharts() {
     try {
-        const response = await fetch('/api/team-trends');
-        
-        if (!response.ok) {
-            throw new Error(`HTTP error! status: ${response.status}`);
-        }
-        
-        const trends = await response.json();
+        const trends = (await loadBootstrap()).team_trends;
         
         // Validate data
         if (!trends || !trends.games || trends.games.length === 0) {
@@ -10,7 +10,8 @@ document.addEventListener('DOMContentLoaded', async () => {
 
 async function loadGames() {
     try {
-        const response = await fetch('/api/games');
+        // The list only needs scores; box scores are fetched when a game is opened
+        const response = await fetch('/api/games?fields=gameId,date,opponent,location,vc_score,opp_score,result');
         allGames = await response.json();
         
         // Sort games by date
@@ -78,7 +79,19 @@ function filterGames() {
     displayGames(filtered);
 }
 
-async function showGameDetail(game) {
+async function showGameDetail(summary) {
+    let game;
+    try {
+        const response = await fetch(`/api/game/${summary.gameId}`);
+        if (!response.ok) {
+            throw new Error(`HTTP error! status: ${response.status}`);
+        }
+        game = await response.json();
+    } catch (error) {
+        console.error('Error loading game detail:', error);
+        return;
+    }
+
     // Calculate basic percentages
     const pointDiff = game.vc_score - game.opp_score;
     const vcFgPct = (game.team_stats.fg / game.team_stats.fga * 100).toFixed(1);
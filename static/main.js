@@ -57,3 +57,72 @@ document.addEventListener('DOMContentLoaded', () => {
         });
     }
 });
+
+// Fetch an endpoint that may answer 202 with a background job, then poll
+// the job until its result is ready. Resolves to the final Response.
+async function fetchJobResult(url, { interval = 2000, onPending = null } = {}) {
+    let response = await fetch(url);
+    if (response.status !== 202) {
+        return response;
+    }
+
+    const job = await response.json();
+    while (true) {
+        if (onPending) onPending(job);
+        await new Promise(resolve => setTimeout(resolve, interval));
+        response = await fetch(`/api/jobs/${job.job_id}/result`);
+        if (response.status !== 202) {
+            return response;
+        }
+    }
+}
+
+// POST JSON to an endpoint that answers with Server-Sent Events and call
+// onDelta(text, fullSoFar) for each piece as it arrives. Resolves to the
+// full reply; rejects with the server's message on an error event.
+async function fetchEventStream(url, body, onDelta) {
+    const response = await fetch(url, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json', 'Accept': 'text/event-stream' },
+        body: JSON.stringify(body)
+    });
+    if (!response.ok) {
+        let message = `HTTP error! status: ${response.status}`;
+        try {
+            message = (await response.json()).error || message;
+        } catch (e) { /* not JSON */ }
+        throw new Error(message);
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    let text = '';
+    while (true) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+
+        let boundary;
+        while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+            const block = buffer.slice(0, boundary);
+            buffer = buffer.slice(boundary + 2);
+
+            let event = 'message';
+            let data = '';
+            block.split('\n').forEach(line => {
+                if (line.startsWith('event: ')) event = line.slice(7);
+                else if (line.startsWith('data: ')) data += line.slice(6);
+            });
+            const payload = data ? JSON.parse(data) : {};
+
+            if (event === 'error') throw new Error(payload.error);
+            if (event === 'done') return text;
+            if (payload.delta) {
+                text += payload.delta;
+                onDelta(payload.delta, text);
+            }
+        }
+    }
+    return text;
+}
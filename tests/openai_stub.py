@@ -0,0 +1,125 @@
+"""
+Local stand-in for the OpenAI chat completions endpoint used by the tests
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # Room for load tests that open many connections at once
+    request_queue_size = 128
+
+
+class OpenAIStub:
+    """HTTP/1.1 keep-alive server that answers chat completion requests.
+
+    Queue scripted replies with ``enqueue``; once the queue is empty every
+    request gets a 200 completion whose content is ``reply(payload)``.
+    ``latency`` delays every response. Each request is recorded in
+    ``requests`` along with the client port, so connection reuse is visible.
+
+    Requests with ``"stream": true`` get a chunked Server-Sent Events reply,
+    one word per event, with ``chunk_delay`` seconds between events.
+    """
+
+    def __init__(self, latency: float = 0.0, reply=None, chunk_delay: float = 0.0):
+        self.latency = latency
+        self.chunk_delay = chunk_delay
+        self.reply = reply or (lambda payload: "stub reply")
+        self.requests = []
+        self.inflight = 0
+        self.max_inflight = 0
+        self._scripted = []
+        self._lock = threading.Lock()
+        self._server = _Server(("127.0.0.1", 0), self._handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}/v1/chat/completions"
+
+    @property
+    def client_ports(self):
+        return {r["client_port"] for r in self.requests}
+
+    def enqueue(self, status: int, headers=None, body=None):
+        with self._lock:
+            self._scripted.append((status, headers or {}, body))
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _next_response(self, record):
+        with self._lock:
+            self.requests.append(record)
+            if self._scripted:
+                return self._scripted.pop(0)
+        content = self.reply(record["payload"])
+        return 200, {}, {"choices": [{"message": {"content": content}}]}
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                status, headers, body = stub._next_response(
+                    {"payload": payload, "client_port": self.client_address[1]}
+                )
+                if stub.latency:
+                    with stub._lock:
+                        stub.inflight += 1
+                        stub.max_inflight = max(stub.max_inflight, stub.inflight)
+                    time.sleep(stub.latency)
+                    with stub._lock:
+                        stub.inflight -= 1
+                if status == 200 and payload.get("stream"):
+                    content = body["choices"][0]["message"]["content"]
+                    self._send_stream(content)
+                    return
+                raw = json.dumps(body if body is not None else {}).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(raw)))
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(raw)
+
+            def _send_stream(self, content):
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                words = content.split(" ")
+                for i, word in enumerate(words):
+                    piece = word if i == len(words) - 1 else word + " "
+                    event = {"choices": [{"delta": {"content": piece}}]}
+                    self._write_chunk(f"data: {json.dumps(event)}\n\n")
+                    if stub.chunk_delay:
+                        time.sleep(stub.chunk_delay)
+                self._write_chunk("data: [DONE]\n\n")
+                self.wfile.write(b"0\r\n\r\n")
+
+            def _write_chunk(self, text):
+                raw = text.encode()
+                self.wfile.write(f"{len(raw):x}\r\n".encode() + raw + b"\r\n")
+                self.wfile.flush()
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
@@ -0,0 +1,259 @@
+"""
+Tests for AIService HTTP handling against a local stub server
+"""
+
+import itertools
+import multiprocessing
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+import src.ai_service
+from src.ai_service import (
+    AIService,
+    APIError,
+    ResponseCache,
+    _parse_retry_after,
+    build_stats_context,
+    estimate_tokens,
+    plan_context,
+    referenced_players,
+)
+from src.data_manager import DataManager
+from tests.openai_stub import OpenAIStub
+
+
+def _service(stub, **overrides):
+    ai = AIService()
+    ai.api_key = "test-key"
+    ai.api_url = stub.url
+    ai.backoff_base = 0.01
+    for key, value in overrides.items():
+        setattr(ai, key, value)
+    return ai
+
+
+def test_calls_reuse_one_pooled_connection():
+    with OpenAIStub() as stub:
+        ai = _service(stub)
+        for i in range(3):
+            assert ai.call_api("system", f"question {i}") == "stub reply"
+        assert ai.call_with_history("system", "again", []) == "stub reply"
+
+    assert len(stub.requests) == 4
+    assert len(stub.client_ports) == 1
+
+
+def test_retries_rate_limit_honoring_retry_after():
+    with OpenAIStub() as stub:
+        stub.enqueue(429, {"Retry-After": "0"})
+        stub.enqueue(503)
+        ai = _service(stub)
+        assert ai.call_api("system", "question") == "stub reply"
+
+    assert len(stub.requests) == 3
+
+
+def test_gives_up_after_max_retries():
+    with OpenAIStub() as stub:
+        for _ in range(3):
+            stub.enqueue(429)
+        ai = _service(stub, max_retries=2)
+        with pytest.raises(APIError, match="rate limit"):
+            ai.call_api("system", "question")
+
+    assert len(stub.requests) == 3
+
+
+def test_long_retry_after_fails_fast():
+    with OpenAIStub() as stub:
+        stub.enqueue(429, {"Retry-After": "120"})
+        ai = _service(stub)
+        with pytest.raises(APIError):
+            ai.call_api("system", "question")
+
+    assert len(stub.requests) == 1
+
+
+def test_client_errors_are_not_retried():
+    with OpenAIStub() as stub:
+        stub.enqueue(401)
+        ai = _service(stub)
+        with pytest.raises(APIError, match="authentication"):
+            ai.call_api("system", "question")
+
+    assert len(stub.requests) == 1
+
+
+def test_parse_retry_after():
+    assert _parse_retry_after("2.5") == 2.5
+    assert _parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert _parse_retry_after("soon") is None
+
+
+def test_identical_requests_are_served_from_cache(tmp_path):
+    with OpenAIStub(reply=lambda payload: f"reply {len(stub.requests)}") as stub:
+        ai = _service(stub)
+        first = ai.call_api("system", "question", temperature=0.2)
+        assert ai.call_api("system", "question", temperature=0.2) == first
+        assert len(stub.requests) == 1
+
+        # Any change to the request is a different key
+        ai.call_api("system", "question", temperature=0.3)
+        ai.call_api("system", "question", temperature=0.2, max_tokens=10)
+        assert len(stub.requests) == 3
+
+        # Bypassing the lookup refreshes the stored reply
+        fresh = ai.call_api("system", "question", temperature=0.2, use_cache=False)
+        assert fresh != first
+        assert ai.call_api("system", "question", temperature=0.2) == fresh
+
+        # A new service instance reads the reply back from disk
+        restarted = _service(stub)
+        assert restarted.call_api("system", "question", temperature=0.2) == fresh
+        assert len(stub.requests) == 4
+
+
+def test_response_cache_ttl_and_bounds(tmp_path):
+    cache = ResponseCache(str(tmp_path), ttl=60, max_entries=2, max_files=2)
+    for i in range(3):
+        cache.set(f"k{i}", f"v{i}")
+    assert list(cache._memory) == ["k1", "k2"]
+    assert len(list(tmp_path.glob("*.json"))) <= 2
+
+    expired = ResponseCache(str(tmp_path), ttl=0, max_entries=2, max_files=2)
+    assert expired.get("k2") is None
+
+
+def test_response_cache_scans_only_past_the_limit(tmp_path, monkeypatch):
+    cache = ResponseCache(str(tmp_path), ttl=60, max_entries=10, max_files=20)
+    scans = []
+    scandir = os.scandir
+    monkeypatch.setattr(os, "scandir", lambda path: scans.append(path) or scandir(path))
+    for i in range(40):
+        cache.set(f"k{i}", f"v{i}")
+    # One initial count, then a trim to 18 files every third write past 20
+    assert len(scans) == 8
+    assert len(list(tmp_path.glob("*.json"))) <= 20
+
+
+def test_response_cache_eviction_skips_vanished_files(tmp_path, monkeypatch):
+    cache = ResponseCache(str(tmp_path), ttl=60, max_entries=10, max_files=1)
+    cache.set("k0", "v0")
+    cache.set("k1", "v1")
+
+    class Vanished:
+        name = "gone.json"
+
+        def stat(self):
+            raise FileNotFoundError("gone.json")
+
+    scandir = os.scandir
+    monkeypatch.setattr(os, "scandir", lambda path: [Vanished(), *scandir(path)])
+    cache.set("k2", "v2")
+    assert cache.get("k2") == "v2"
+    monkeypatch.undo()
+    assert len(list(tmp_path.glob("*.json"))) <= 1
+
+
+def test_concurrent_identical_requests_share_one_call():
+    with OpenAIStub(latency=0.3) as stub:
+        ai = _service(stub)
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            replies = list(pool.map(lambda _: ai.call_api("system", "q"), range(8)))
+        assert replies == ["stub reply"] * 8
+        assert len(stub.requests) == 1
+        assert ai._inflight == {}
+
+
+def test_followers_receive_the_leaders_error():
+    with OpenAIStub(latency=0.3) as stub:
+        stub.enqueue(401)
+        ai = _service(stub)
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            futures = [pool.submit(ai.call_api, "system", "q") for _ in range(4)]
+        for future in futures:
+            with pytest.raises(APIError, match="authentication"):
+                future.result()
+        assert len(stub.requests) == 1
+
+
+@pytest.mark.skipif(src.ai_service.fcntl is None, reason="needs fcntl")
+def test_workers_coalesce_through_the_lock_file():
+    ctx = multiprocessing.get_context("fork")
+    with OpenAIStub(latency=0.5) as stub:
+        results = ctx.Queue()
+
+        def worker():
+            results.put(_service(stub).call_api("system", "q"))
+
+        procs = [ctx.Process(target=worker) for _ in range(3)]
+        for proc in procs:
+            proc.start()
+        for proc in procs:
+            proc.join(timeout=10)
+        assert [results.get(timeout=1) for _ in procs] == ["stub reply"] * 3
+        assert len(stub.requests) == 1
+
+
+def test_unrelated_requests_do_not_wait_on_each_other():
+    with OpenAIStub(latency=0.5) as stub:
+        ai = _service(stub)
+        # Two questions whose cache keys share a prefix
+        prefixes = {}
+        for i in itertools.count():
+            question = f"q{i}"
+            messages = [
+                {"role": "system", "content": "system"},
+                {"role": "user", "content": question},
+            ]
+            key = ai.cache.key(ai._payload(messages, 1500, 0.7))
+            if key[:2] in prefixes:
+                pair = [prefixes[key[:2]], question]
+                break
+            prefixes[key[:2]] = question
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            list(pool.map(lambda q: ai.call_api("system", q), pair))
+        assert len(stub.requests) == 2
+        assert stub.max_inflight == 2
+        assert not list((Path(ai.cache.directory) / "locks").glob("*.lock"))
+
+
+def test_stats_context_is_built_once_per_data_version():
+    dm = DataManager()
+    full = build_stats_context(dm)
+    compact = build_stats_context(dm, compact=True)
+    assert build_stats_context(dm) is full
+    assert len(compact) < len(full) / 2
+    assert "GAME-BY-GAME RESULTS (14 games)" in full
+
+    dm.stats_data["season_team_stats"]["win"] += 1
+    assert build_stats_context(dm) is full
+    dm.reload()
+    assert build_stats_context(dm) is not full
+
+
+def test_plan_context_uses_full_context_when_it_fits():
+    dm = DataManager()
+    assert plan_context(dm, "chat", "How are we doing?") == build_stats_context(dm)
+
+
+def test_plan_context_selects_sections_within_budget(monkeypatch, caplog):
+    dm = DataManager()
+    monkeypatch.setitem(src.ai_service.CONTEXT_TOKENS, "chat", 400)
+    assert referenced_players(dm, "Is lomber in a slump?") == ["H Lomber"]
+
+    with caplog.at_level("INFO", logger="src.ai_service"):
+        context = plan_context(dm, "chat", "Is Lomber in a slump?")
+    assert estimate_tokens(context) <= 400
+    assert "PLAYER: H Lomber" in context
+    assert "SPLITS" in context
+    assert "GAME-BY-GAME" not in context
+    assert "planned, ~" in caplog.text
+
+    # The reply budget comes out of the model's context window
+    monkeypatch.setattr(src.ai_service.Config, "AI_CONTEXT_WINDOW", 1300)
+    assert estimate_tokens(plan_context(dm, "chat", "Is Lomber in a slump?")) < 300
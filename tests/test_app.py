@@ -42,3 +42,55 @@ def test_api_season_stats():
         assert response.status_code == 200
         data = response.get_json()
         assert isinstance(data, dict)
+
+
+def test_api_bootstrap_dashboard():
+    """Test that the dashboard bootstrap returns every section in one response"""
+    with app.test_client() as client:
+        response = client.get("/api/bootstrap/dashboard")
+        assert response.status_code == 200
+        data = response.get_json()
+        for section in ("season_stats", "advanced_team", "leaderboards", "games"):
+            assert section in data
+        assert "player_stats" not in data["games"][0]
+
+
+def test_api_bootstrap_field_selection():
+    """Test that fields= limits sections and keys"""
+    with app.test_client() as client:
+        response = client.get("/api/bootstrap/dashboard?fields=games.opponent")
+        assert response.status_code == 200
+        data = response.get_json()
+        assert "season_stats" not in data
+        assert all(set(g) == {"opponent"} for g in data["games"])
+
+        assert client.get("/api/bootstrap/dashboard?fields=nope").status_code == 400
+        assert client.get("/api/bootstrap/nope").status_code == 404
+
+
+def test_api_games_projection_and_paging():
+    """Test fields=, limit=, offset= and since_game= on /api/games"""
+    with app.test_client() as client:
+        response = client.get("/api/games?fields=gameId,opponent&limit=2&offset=1")
+        assert response.status_code == 200
+        games = response.get_json()
+        assert [set(g) for g in games] == [{"gameId", "opponent"}] * 2
+        assert response.headers["X-Next-Offset"] == "3"
+
+        all_ids = [g["gameId"] for g in client.get("/api/games").get_json()]
+        newer = client.get(f"/api/games?since_game={all_ids[-3]}").get_json()
+        assert [g["gameId"] for g in newer] == all_ids[-2:]
+
+        assert client.get("/api/games?limit=abc").status_code == 400
+
+
+def test_api_players_projection():
+    """Test fields= and limit= on /api/players"""
+    with app.test_client() as client:
+        response = client.get("/api/players?fields=name,ppg&limit=3")
+        players = response.get_json()
+        assert len(players) == 3
+        assert all(set(p) == {"name", "ppg"} for p in players)
+        assert response.headers["X-Total-Count"] == str(
+            len(client.get("/api/players").get_json())
+        )
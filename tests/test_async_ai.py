@@ -0,0 +1,150 @@
+"""
+Tests and load test for the async AI client and the ASGI chat endpoints
+"""
+
+import asyncio
+import json
+import time
+
+import pytest
+
+from src.ai_service import APIError
+from src.asgi import app as asgi_app
+from src.async_ai_service import AsyncAIService, close_async_ai_service
+from src.config import Config
+from tests.openai_stub import OpenAIStub
+
+LATENCY = 0.25
+
+
+@pytest.fixture
+def configured(monkeypatch):
+    """Point new AI services at a latency-injecting stub"""
+    with OpenAIStub(latency=LATENCY) as stub:
+        monkeypatch.setattr(Config, "OPENAI_API_KEY", "test-key")
+        monkeypatch.setattr(Config, "OPENAI_API_URL", stub.url)
+        monkeypatch.setattr(Config, "OPENAI_BACKOFF_BASE", 0.01)
+        yield stub
+
+
+async def _request(method, path, body=None, query=b""):
+    """Drive the ASGI app directly and collect (status, headers, body)"""
+    raw = json.dumps(body).encode() if body is not None else b""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query,
+        "root_path": "",
+        "headers": [(b"content-type", b"application/json")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("testserver", 80),
+    }
+    sent = False
+    messages = []
+
+    async def receive():
+        nonlocal sent
+        if sent:
+            await asyncio.Event().wait()
+        sent = True
+        return {"type": "http.request", "body": raw, "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await asgi_app(scope, receive, send)
+    start = messages[0]
+    body = b"".join(m.get("body", b"") for m in messages[1:])
+    return start["status"], dict(start["headers"]), body
+
+
+def test_async_client_reuses_pooled_connections(configured):
+    async def run():
+        ai = AsyncAIService()
+        try:
+            for i in range(3):
+                assert await ai.call_api("system", f"q{i}") == "stub reply"
+            # Concurrent identical misses share one upstream call
+            replies = await asyncio.gather(
+                *(ai.call_api("system", "same") for _ in range(5))
+            )
+        finally:
+            await ai.aclose()
+        return replies
+
+    assert asyncio.run(run()) == ["stub reply"] * 5
+    assert len(configured.requests) == 4
+    assert len(configured.client_ports) == 1
+
+
+def test_async_client_maps_errors(configured):
+    configured.enqueue(503)
+    configured.enqueue(401)
+
+    async def run():
+        ai = AsyncAIService()
+        try:
+            with pytest.raises(APIError, match="authentication"):
+                await ai.call_api("system", "question")
+        finally:
+            await ai.aclose()
+
+    asyncio.run(run())
+    assert len(configured.requests) == 2
+
+
+def test_asgi_chat_and_fallthrough_to_flask(configured):
+    async def run():
+        chat = await _request("POST", "/api/ai/chat", {"message": "How are we?"})
+        invalid = await _request("POST", "/api/ai/chat", {"message": ""})
+        stream = await _request(
+            "POST", "/api/ai/analyze", {"query": "Who starts?"}, b"stream=true"
+        )
+        games = await _request("GET", "/api/games")
+        await close_async_ai_service()
+        return chat, invalid, stream, games
+
+    chat, invalid, stream, games = asyncio.run(run())
+    assert chat[0] == 200
+    assert json.loads(chat[2]) == {"response": "stub reply", "message": "How are we?"}
+    assert invalid[0] == 400
+    assert json.loads(invalid[2]) == {"error": "No message provided"}
+    assert stream[1][b"content-type"].startswith(b"text/event-stream")
+    assert stream[2].decode().endswith("event: done\ndata: {}\n\n")
+    assert games[0] == 200
+    assert len(json.loads(games[2])) == 14
+
+    # Native routes carry the same security headers as the Flask app
+    for _, headers, _ in (chat, invalid, stream, games):
+        assert headers[b"x-frame-options"] == b"DENY"
+        assert headers[b"x-content-type-options"] == b"nosniff"
+
+
+def test_concurrent_chats_scale_on_one_event_loop(configured):
+    """Load test: N concurrent chats take about one upstream latency, not N"""
+
+    async def burst(n):
+        start = time.perf_counter()
+        results = await asyncio.gather(
+            *(
+                _request("POST", "/api/ai/chat", {"message": f"load {n} {i}"})
+                for i in range(n)
+            )
+        )
+        elapsed = time.perf_counter() - start
+        assert all(status == 200 for status, _, _ in results)
+        return elapsed
+
+    async def run():
+        timings = {n: await burst(n) for n in (1, 10, 50)}
+        await close_async_ai_service()
+        return timings
+
+    timings = asyncio.run(run())
+    assert timings[50] < 50 * LATENCY / 10
+    assert len(configured.requests) == 61
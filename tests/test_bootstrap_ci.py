@@ -0,0 +1,68 @@
+"""
+Tests for bootstrap confidence intervals on player advanced stats
+"""
+
+import statistics
+
+import numpy as np
+
+from src.app import app, data
+from src.bootstrap_ci import (
+    LINE_FIELDS,
+    bootstrap_intervals,
+    game_lines,
+    player_intervals,
+    resampled_stats,
+)
+from src.config import Config
+
+LINES = np.array(
+    [
+        [18, 7, 15, 2, 6, 2, 4, 1, 5, 3, 2, 0, 2],
+        [9, 4, 12, 1, 5, 0, 0, 0, 3, 1, 1, 1, 4],
+        [27, 10, 17, 3, 7, 4, 5, 2, 6, 2, 3, 1, 1],
+        [12, 5, 9, 0, 1, 2, 2, 3, 4, 5, 0, 2, 3],
+    ],
+    dtype=float,
+)
+
+
+def test_resampled_stats_match_a_per_sample_loop():
+    stats = resampled_stats(LINES, 50, seed=1)
+    index = np.random.default_rng([Config.BOOTSTRAP_SEED, 1]).integers(
+        0, len(LINES), size=(50, len(LINES))
+    )
+    for b in (0, 17, 49):
+        rows = [dict(zip(LINE_FIELDS, LINES[i])) for i in index[b]]
+        total = {f: sum(r[f] for r in rows) for f in LINE_FIELDS}
+        pts = [r["pts"] for r in rows]
+        ts = total["pts"] / (2 * (total["fg_att"] + 0.44 * total["ft_att"])) * 100
+        assert np.isclose(stats["ppg"][b], total["pts"] / 4)
+        assert np.isclose(stats["ts_pct"][b], ts)
+        assert np.isclose(stats["consistency_score"][b], 100 - statistics.variance(pts))
+
+
+def test_intervals_are_reproducible_and_pool_independent(monkeypatch):
+    players = {"A": LINES, "B": LINES[::-1][:3], "C": game_lines([])}
+    serial = bootstrap_intervals(players, samples=400)
+    assert serial == bootstrap_intervals(players, samples=400)
+    assert set(serial["players"]) == {"A", "B"}
+    assert serial["players"]["A"] == player_intervals("A", LINES, 400, 95.0)
+
+    monkeypatch.setattr(Config, "BOOTSTRAP_POOL_MIN_SAMPLES", 100)
+    monkeypatch.setattr(Config, "BOOTSTRAP_WORKERS", 2)
+    assert bootstrap_intervals(players, samples=400) == serial
+
+
+def test_player_advanced_ci_endpoint():
+    with app.test_client() as client:
+        plain = client.get("/api/advanced/player/H Lomber").get_json()
+        with_ci = client.get("/api/advanced/player/H Lomber?ci=true").get_json()
+
+    assert "confidence_intervals" not in plain
+    ci = with_ci["confidence_intervals"]
+    assert ci["samples"] == Config.BOOTSTRAP_SAMPLES
+    ppg = data.season_player_stats["H Lomber"]["ppg"]
+    assert ci["ppg"]["low"] <= ppg <= ci["ppg"]["high"]
+    for stat in ("efg_pct", "ts_pct", "per", "consistency_score"):
+        assert ci[stat]["low"] <= ci[stat]["high"]
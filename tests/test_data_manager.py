@@ -0,0 +1,49 @@
+"""
+Tests for data loading and lazily derived player game logs
+"""
+
+import json
+
+from src.config import Config
+from src.data_manager import DataManager
+
+
+def test_game_logs_not_stored_in_stats_data():
+    """The second copy of every player row is no longer kept resident"""
+    dm = DataManager()
+    assert "player_game_logs" not in dm.stats_data
+
+
+def test_derived_logs_match_stats_file():
+    """Logs derived from the games index match the logs in the stats file"""
+    with open(Config.STATS_FILE) as f:
+        stored = json.load(f)["player_game_logs"]
+
+    dm = DataManager()
+    for name, logs in stored.items():
+        assert dm.get_player_game_logs(name) == logs
+
+
+def test_log_cache_is_bounded(monkeypatch):
+    """Only the most recently used players stay cached"""
+    monkeypatch.setattr(Config, "PLAYER_LOG_CACHE_SIZE", 2)
+    dm = DataManager()
+    names = list(dm.season_player_stats)[:3]
+    for name in names:
+        dm.get_player_game_logs(name)
+
+    assert list(dm._log_cache) == names[1:]
+
+
+def test_reload_bumps_version_and_clears_logs():
+    """Reloading invalidates derived logs"""
+    dm = DataManager()
+    name = next(iter(dm.season_player_stats))
+    dm.get_player_game_logs(name)
+    version = dm.version
+
+    dm.reload()
+
+    assert dm.version == version + 1
+    assert not dm._log_cache
+    assert dm.get_player_game_logs("Nobody") == []
@@ -0,0 +1,45 @@
+"""
+Tests for the streaming NDJSON export endpoints
+"""
+
+import json
+
+from src.app import app
+from src.export import parse_game_date, season_of
+
+
+def _lines(response):
+    return [json.loads(line) for line in response.data.decode().splitlines()]
+
+
+def test_season_of_rolls_over_in_july():
+    assert season_of({"date": "Dec 16, 2025"}) == "2025-2026"
+    assert season_of({"date": "Jan 3, 2026"}) == "2025-2026"
+    assert season_of({"date": "unknown"}) is None
+    assert parse_game_date("2026-01-03") == parse_game_date("Jan 3, 2026")
+
+
+def test_export_games_streams_one_game_per_line():
+    with app.test_client() as client:
+        response = client.get("/api/export/games.ndjson")
+        assert response.status_code == 200
+        assert response.mimetype == "application/x-ndjson"
+        games = _lines(response)
+        assert len(games) == len(client.get("/api/games").get_json())
+        assert all("player_stats" in g and g["season"] for g in games)
+
+
+def test_export_player_lines_filters():
+    with app.test_client() as client:
+        everything = _lines(client.get("/api/export/player-lines.ndjson"))
+        filtered = _lines(
+            client.get(
+                "/api/export/player-lines.ndjson?player=H%20Lomber&from=2026-01-01"
+            )
+        )
+        assert 0 < len(filtered) < len(everything)
+        assert all(line["name"] == "H Lomber" for line in filtered)
+        assert all(parse_game_date(line["date"]).year == 2026 for line in filtered)
+
+        response = client.get("/api/export/games.ndjson?to=Jan-3")
+        assert response.status_code == 400
@@ -0,0 +1,83 @@
+"""
+Tests for the background job runner
+"""
+
+import threading
+import time
+
+import pytest
+
+import src.jobs
+from src.app import app
+from src.jobs import JobRunner, UnknownJobKind, get_job_runner
+
+
+def _wait_for(runner, job_id, timeout=5):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = runner.get(job_id, include_result=True)
+        if job["status"] not in ("queued", "running"):
+            return job
+        time.sleep(0.01)
+    raise AssertionError("job did not finish")
+
+
+def test_identical_in_flight_jobs_are_shared(tmp_path):
+    release = threading.Event()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        release.wait(5)
+        return {"summary": "done"}
+
+    runner = JobRunner(str(tmp_path / "jobs.sqlite3"))
+    runner.register("slow", slow)
+
+    first = runner.submit("slow")
+    second = runner.submit("slow")
+    assert second["job_id"] == first["job_id"]
+    assert second["deduplicated"]
+
+    release.set()
+    job = _wait_for(runner, first["job_id"])
+    assert job["status"] == "done"
+    assert job["result"] == {"summary": "done"}
+    assert calls == [1]
+
+    # Finished results are kept and a new submission starts a fresh job
+    third = runner.submit("slow")
+    assert third["job_id"] != first["job_id"]
+    assert runner.get(first["job_id"], include_result=True)["result"]
+    _wait_for(runner, third["job_id"])
+
+
+def test_failed_job_records_error(tmp_path):
+    def broken():
+        raise RuntimeError("model unavailable")
+
+    runner = JobRunner(str(tmp_path / "jobs.sqlite3"))
+    runner.register("broken", broken)
+
+    job = _wait_for(runner, runner.submit("broken")["job_id"])
+    assert job["status"] == "failed"
+    assert job["error"] == "model unavailable"
+
+    with pytest.raises(UnknownJobKind):
+        runner.submit("missing")
+
+
+def test_jobs_api_rejects_unknown_kind():
+    with app.test_client() as client:
+        response = client.post("/api/jobs", json={"kind": "nope"})
+        assert response.status_code == 400
+        assert "season-analysis" in response.get_json()["kinds"]
+        assert client.get("/api/jobs/missing").status_code == 404
+
+
+def test_global_runner_is_created_on_first_use(tmp_path):
+    # Importing the app registers handlers without opening the jobs database
+    assert src.jobs.job_runner is None
+    runner = get_job_runner()
+    assert runner.db_path == str(tmp_path / "jobs.sqlite3")
+    assert {"season-analysis", "team-summary"} <= set(runner.kinds)
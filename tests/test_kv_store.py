@@ -0,0 +1,95 @@
+"""
+Tests for the SQLite key-value store behind cached AI analyses
+"""
+
+import json
+import time
+
+import src.ai_service
+from src.ai_service import AIService
+from src.app import app
+from src.kv_store import PLAYER_ANALYSIS, TEAM_SUMMARY, KVStore, get_analysis_store
+from tests.openai_stub import OpenAIStub
+
+
+def test_upsert_get_delete(tmp_path):
+    store = KVStore(str(tmp_path / "kv.sqlite3"))
+    store.set("ns", "a", {"v": 1})
+    store.set("ns", "a", {"v": 2})
+    store.set("other", "a", [1, 2])
+    assert store.get("ns", "a") == {"v": 2}
+    assert store.get("other", "a") == [1, 2]
+    assert store.get("ns", "missing") is None
+
+    assert store.delete("ns", "a") is True
+    assert store.delete("ns", "a") is False
+    assert store.clear("other") == 1
+    assert store.get("other", "a") is None
+
+
+def test_entries_expire_by_age(tmp_path, monkeypatch):
+    store = KVStore(str(tmp_path / "kv.sqlite3"), max_age=60)
+    store.set("ns", "old", 1)
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 120)
+    assert store.get("ns", "old") is None
+
+    # Writing prunes expired rows
+    store.set("ns", "new", 2)
+    monkeypatch.setattr(time, "time", lambda: now)
+    assert store.get("ns", "old") is None
+    assert store.get("ns", "new") == 2
+
+
+def test_legacy_json_is_imported_once(tmp_path):
+    legacy = tmp_path / "player_analysis_cache.json"
+    legacy.write_text(json.dumps({"H Lomber": {"analysis": "old"}}))
+    store = KVStore(str(tmp_path / "kv.sqlite3"))
+
+    store.import_json("players", str(legacy))
+    assert store.get("players", "H Lomber") == {"analysis": "old"}
+
+    store.delete("players", "H Lomber")
+    store.import_json("players", str(legacy))
+    assert store.get("players", "H Lomber") is None
+
+
+def test_player_analysis_is_cached_per_player(monkeypatch):
+    with OpenAIStub() as stub:
+        ai = AIService()
+        ai.api_key = "test-key"
+        ai.api_url = stub.url
+        monkeypatch.setattr(src.ai_service, "ai_service", ai)
+
+        with app.test_client() as client:
+            first = client.get("/api/ai/player-analysis/H Lomber").get_json()
+            again = client.get("/api/ai/player-analysis/H Lomber").get_json()
+            assert first["cached"] is False
+            assert again["cached"] is True
+            assert get_analysis_store().get(PLAYER_ANALYSIS, "H Lomber") == first
+
+            client.delete("/api/ai/player-analysis/H Lomber")
+            assert get_analysis_store().get(PLAYER_ANALYSIS, "H Lomber") is None
+
+
+def test_cleared_team_summary_is_regenerated(monkeypatch):
+    with OpenAIStub(reply=lambda payload: f"summary {len(stub.requests)}") as stub:
+        ai = AIService()
+        ai.api_key = "test-key"
+        ai.api_url = stub.url
+        monkeypatch.setattr(src.ai_service, "ai_service", ai)
+
+        with app.test_client() as client:
+            first = client.get("/api/ai/team-summary").get_json()
+            assert client.get("/api/ai/team-summary").get_json() == first
+            assert len(stub.requests) == 1
+
+            client.delete("/api/ai/team-summary")
+            second = client.get("/api/ai/team-summary").get_json()
+            assert len(stub.requests) == 2
+            assert second != first
+            assert get_analysis_store().get(TEAM_SUMMARY, "season") == second
+
+            # Once regenerated, the summary is served from the store again
+            assert client.get("/api/ai/team-summary").get_json() == second
+            assert len(stub.requests) == 2
@@ -0,0 +1,74 @@
+"""
+Tests for the leaderboard index and /api/leaderboards
+"""
+
+import copy
+import random
+
+import pytest
+
+from src.app import app, data
+from src.leaderboards import LeaderboardIndex
+
+
+def _league(n, seed=7):
+    rng = random.Random(seed)
+    players = []
+    for i in range(n):
+        fga = rng.randint(0, 300)
+        fg = rng.randint(0, fga)
+        players.append(
+            {
+                "name": f"P{i}",
+                "pts": rng.randint(0, 600),
+                "stl": rng.randint(0, 40),
+                "fga": fga,
+                "fg_pct": round(fg / fga * 100, 1) if fga else 0.0,
+                "plus_minus": rng.randint(-200, 200),
+            }
+        )
+    return players
+
+
+def test_top_k_matches_full_sort():
+    players = _league(5000)
+    snapshot = copy.deepcopy(players)
+    index = LeaderboardIndex(players, stats=("pts", "stl", "fg_pct"))
+
+    for stat in ("pts", "stl", "plus_minus"):
+        expected = sorted(players, key=lambda p: p[stat], reverse=True)[:25]
+        assert index.top(stat, 25) == expected
+
+    qualified = [p for p in players if p["fga"] >= 100]
+    expected = sorted(qualified, key=lambda p: p["fg_pct"], reverse=True)[:10]
+    assert index.top("fg_pct", 10, min_attempts=100) == expected
+    assert all(p["fga"] > 0 for p in index.top("fg_pct", len(players)))
+
+    with pytest.raises(ValueError):
+        index.top("name")
+    assert players == snapshot
+
+
+def test_leaderboards_endpoint_does_not_mutate_season_stats():
+    before = copy.deepcopy(data.season_player_stats)
+    with app.test_client() as client:
+        default = client.get("/api/leaderboards").get_json()
+        one = client.get("/api/leaderboards?stat=ft_pct&k=3&min_attempts=10")
+        bad = client.get("/api/leaderboards?stat=bogus")
+
+    assert set(default) == {
+        "pts",
+        "reb",
+        "asst",
+        "fg_pct",
+        "fg3_pct",
+        "ft_pct",
+        "stl",
+        "blk",
+    }
+    assert all("first_name" in p for p in default["pts"])
+    body = one.get_json()
+    assert len(body["leaders"]) <= 3
+    assert all(p["fta"] >= 10 for p in body["leaders"])
+    assert bad.status_code == 400
+    assert data.season_player_stats == before
@@ -0,0 +1,73 @@
+"""
+Tests for advanced-stat percentile ranks
+"""
+
+import random
+
+from src.app import app
+from src.percentiles import PercentileIndex
+
+
+def _advanced(ppg, tpg, role="Shooter"):
+    return {
+        "scoring_efficiency": {"ppg": ppg},
+        "ball_handling": {"tpg": tpg},
+        "usage_role": {"role": role, "primary_scorer": ppg >= 20},
+    }
+
+
+def test_ranks_match_brute_force_counts():
+    rng = random.Random(5)
+    advanced = {
+        f"P{i}": _advanced(rng.randint(0, 30), round(rng.uniform(0, 5), 1))
+        for i in range(200)
+    }
+    qualified = [f"P{i}" for i in range(0, 200, 2)]
+    index = PercentileIndex(advanced, qualified)
+    ppgs = [advanced[n]["scoring_efficiency"]["ppg"] for n in qualified]
+    tpgs = [advanced[n]["ball_handling"]["tpg"] for n in qualified]
+
+    for name in ("P0", "P1", "P77", "P198"):
+        ranks = index.ranks(advanced[name])
+        ppg = advanced[name]["scoring_efficiency"]["ppg"]
+        tpg = advanced[name]["ball_handling"]["tpg"]
+        assert ranks["scoring_efficiency"]["ppg"] == round(
+            sum(v <= ppg for v in ppgs) / len(ppgs) * 100
+        )
+        # Fewer turnovers rank higher
+        assert ranks["ball_handling"]["tpg"] == round(
+            sum(v >= tpg for v in tpgs) / len(tpgs) * 100
+        )
+        # Strings and flags are not ranked
+        assert "usage_role" not in ranks
+
+
+def test_best_and_worst_qualified_players():
+    advanced = {
+        "A": _advanced(25, 1.0),
+        "B": _advanced(10, 3.0),
+        "C": _advanced(4, 2.0),
+    }
+    index = PercentileIndex(advanced, ["A", "B", "C"])
+    assert index.ranks(advanced["A"]) == {
+        "scoring_efficiency": {"ppg": 100},
+        "ball_handling": {"tpg": 100},
+    }
+    assert index.ranks(advanced["B"]) == {
+        "scoring_efficiency": {"ppg": 67},
+        "ball_handling": {"tpg": 33},
+    }
+
+
+def test_percentile_endpoints():
+    with app.test_client() as client:
+        players = client.get("/api/players?with_percentiles=1").get_json()
+        plain = client.get("/api/players").get_json()
+        player = client.get("/api/player/H Lomber?with_percentiles=1").get_json()
+        advanced = client.get("/api/advanced/player/H Lomber?with_percentiles=1")
+
+    assert all("percentiles" in p for p in players)
+    assert not any("percentiles" in p for p in plain)
+    ranks = player["percentiles"]
+    assert 0 <= ranks["scoring_efficiency"]["ts_pct"] <= 100
+    assert advanced.get_json()["percentiles"] == ranks
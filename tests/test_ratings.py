@@ -0,0 +1,100 @@
+"""
+Tests for SRS/Massey ratings and /api/ratings
+"""
+
+import time
+
+import numpy as np
+import pytest
+
+from src.app import app, data
+from src.config import TEAM_NAME
+from src.ratings import massey_ratings
+
+
+def _league(teams, games, seed=2):
+    rng = np.random.default_rng(seed)
+    strength = rng.normal(0, 10, teams)
+    strength -= strength.mean()
+    results = []
+    for _ in range(games):
+        i, j = rng.choice(teams, 2, replace=False)
+        margin = int(round(strength[i] - strength[j] + rng.normal(0, 3)))
+        results.append((f"T{i}", f"T{j}", 60 + margin, 60))
+    return strength, results
+
+
+def test_ratings_match_dense_least_squares():
+    _, results = _league(30, 400)
+    table = {row["team"]: row for row in massey_ratings(results)}
+    teams = sorted(table)
+    design = np.zeros((len(results), len(teams)))
+    for g, (a, b, sa, sb) in enumerate(results):
+        design[g, teams.index(a)] = 1
+        design[g, teams.index(b)] = -1
+    margins = np.array([sa - sb for _, _, sa, sb in results], dtype=float)
+    expected = np.linalg.lstsq(
+        np.vstack([design, np.ones(len(teams))]),
+        np.append(margins, 0.0),
+        rcond=None,
+    )[0]
+    for i, team in enumerate(teams):
+        assert abs(table[team]["rating"] - expected[i]) < 0.01
+        assert (
+            abs(table[team]["mov"] + table[team]["sos"] - table[team]["rating"]) < 0.02
+        )
+
+
+def test_hundreds_of_teams_scale():
+    strength, results = _league(400, 6000)
+    start = time.perf_counter()
+    table = massey_ratings(results, margin_cap=40)
+    # Generous ceiling: guards against a dense design matrix, not a benchmark
+    assert time.perf_counter() - start < 5.0
+    ratings = {row["team"]: row["rating"] for row in table}
+    fitted = np.array([ratings[f"T{i}"] for i in range(400)])
+    assert np.corrcoef(fitted, strength)[0, 1] > 0.98
+    assert sum(ratings.values()) == pytest.approx(0, abs=0.5)
+
+
+def test_each_unconnected_group_is_centered():
+    _, east = _league(6, 40, seed=3)
+    _, west = _league(5, 30, seed=4)
+    west = [(f"W{a}", f"W{b}", sa, sb) for a, b, sa, sb in west]
+    table = {row["team"]: row for row in massey_ratings(east + west)}
+
+    groups = {}
+    for row in table.values():
+        groups.setdefault(row["component"], []).append(row)
+    assert sorted(len(rows) for rows in groups.values()) == [5, 6]
+    for rows in groups.values():
+        assert {r["team"][0] for r in rows} in ({"T"}, {"W"})
+        assert sum(r["rating"] for r in rows) == pytest.approx(0, abs=0.05)
+
+    # Each group matches its ratings when fit on its own
+    alone = {row["team"]: row["rating"] for row in massey_ratings(west)}
+    for team, rating in alone.items():
+        assert table[team]["rating"] == pytest.approx(rating, abs=0.01)
+
+
+def test_ties_are_counted_apart_from_losses():
+    results = [("A", "B", 50, 50), ("A", "C", 60, 50), ("B", "C", 40, 45)]
+    table = {row["team"]: row for row in massey_ratings(results)}
+    assert (table["A"]["record"], table["A"]["ties"]) == ("1-0-1", 1)
+    assert table["B"]["record"] == "0-1-1"
+    assert (table["C"]["record"], table["C"]["ties"]) == ("1-1", 0)
+
+
+def test_ratings_endpoint():
+    with app.test_client() as client:
+        ratings = client.get("/api/ratings").get_json()["ratings"]
+
+    ours = next(row for row in ratings if row["team"] == TEAM_NAME)
+    assert ours["games"] == len(data.games)
+    wins = sum(g["result"] == "W" for g in data.games)
+    losses = sum(g["result"] == "L" for g in data.games)
+    assert ours["record"].startswith(f"{wins}-{losses}")
+    assert ours["component"] == 0
+    assert [r["rating"] for r in ratings] == sorted(
+        (r["rating"] for r in ratings), reverse=True
+    )
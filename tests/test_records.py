@@ -0,0 +1,44 @@
+"""
+Tests for compact game and player line records
+"""
+
+import json
+
+from src.config import Config
+from src.records import GameRecord, PlayerLine, compact_games, format_pct
+
+
+def _games():
+    with open(Config.STATS_FILE) as f:
+        return json.load(f)["games"]
+
+
+def test_round_trip_matches_json_layout():
+    """Compact records reproduce the stored dicts, percentages included"""
+    games = _games()
+    assert [g.to_dict() for g in compact_games(games)] == games
+
+
+def test_strings_are_interned():
+    """Repeated names share one string object across games"""
+    records = compact_games(_games())
+    names = {}
+    for record in records:
+        for line in record.player_lines:
+            assert names.setdefault(line.name, line.name) is line.name
+
+
+def test_derived_fields():
+    line = PlayerLine.from_dict(
+        {"name": "H Lomber", "fg_made": 11, "fg_att": 24, "oreb": 1, "dreb": 3}
+    )
+    assert line.fg_pct == "46%"
+    assert line.ft_pct == "-"
+    assert line.reb == 4
+    assert not hasattr(line, "__dict__")
+    assert format_pct(0, 3) == "-"
+
+
+def test_team_stat_lookup():
+    record = GameRecord.from_dict(_games()[0])
+    assert record.team_stat("fga") == _games()[0]["team_stats"]["fga"]
@@ -0,0 +1,86 @@
+"""
+Verification of the running mean/variance accumulators against statistics
+"""
+
+import random
+import statistics
+
+import pytest
+
+from src.app import advanced_calc, app, data
+from src.records import PLAYER_LINE_FIELDS
+from src.running_stats import RunningStat, RunningStats
+
+
+def test_running_stat_matches_statistics():
+    rng = random.Random(9)
+    values = [rng.gauss(1e6, 15) for _ in range(5000)]
+    stat = RunningStat()
+    for i, value in enumerate(values, 1):
+        stat.add(value)
+        if i in (1, 2, 3, 100, 5000):
+            seen = values[:i]
+            assert stat.mean == pytest.approx(statistics.mean(seen), rel=1e-12)
+            expected = statistics.variance(seen) if i > 1 else 0.0
+            assert stat.variance == pytest.approx(expected, rel=1e-9, abs=1e-9)
+            assert (stat.min, stat.max) == (min(seen), max(seen))
+
+
+def test_every_player_and_stat_matches_game_logs():
+    running = RunningStats(data.games)
+    assert set(running.players) == set(data.player_game_logs)
+    for name, logs in data.player_game_logs.items():
+        for field in PLAYER_LINE_FIELDS + ("reb",):
+            if field == "reb":
+                values = [g["stats"]["oreb"] + g["stats"]["dreb"] for g in logs]
+            else:
+                values = [g["stats"].get(field, 0) for g in logs]
+            stat = running.player(name, field)
+            assert stat.count == len(values)
+            assert stat.mean == pytest.approx(statistics.mean(values))
+            if len(values) > 1:
+                assert stat.stdev == pytest.approx(statistics.stdev(values))
+
+    to = [g["team_stats"]["to"] for g in data.games]
+    assert running.team["to"].stdev == pytest.approx(statistics.stdev(to))
+
+
+def test_adding_a_game_updates_state_incrementally():
+    games = sorted(data.games, key=lambda g: g["gameId"])
+    running = RunningStats(games[:-1])
+    running.add_game(games[-1])
+    full = RunningStats(games)
+    for name, stats in full.players.items():
+        assert running.player(name, "pts").variance == pytest.approx(
+            stats["pts"].variance
+        )
+
+
+def test_volatility_covers_every_player():
+    volatility = advanced_calc.calculate_volatility_metrics()
+    multi_game = [n for n, logs in data.player_game_logs.items() if len(logs) > 1]
+    assert {p["name"] for p in volatility["player_volatility"]} == set(multi_game)
+    lomber = next(p for p in volatility["player_volatility"] if p["name"] == "H Lomber")
+    pts = [g["stats"]["pts"] for g in data.get_player_game_logs("H Lomber")]
+    assert lomber["std_dev"] == round(statistics.stdev(pts), 1)
+
+
+def test_volatility_endpoint_follows_a_reload(reload_stats):
+    def lomber():
+        with app.test_client() as client:
+            body = client.get("/api/advanced/volatility").get_json()
+        return next(p for p in body["player_volatility"] if p["name"] == "H Lomber")
+
+    before = lomber()
+    game_id = data.get_player_game_logs("H Lomber")[0]["gameId"]
+
+    def big_night(stats):
+        game = next(g for g in stats["games"] if g["gameId"] == game_id)
+        row = next(r for r in game["player_stats"] if r["name"] == "H Lomber")
+        row["pts"] += 40
+
+    reload_stats(big_night)
+    pts = [g["stats"]["pts"] for g in data.get_player_game_logs("H Lomber")]
+    after = lomber()
+    assert after["std_dev"] == round(statistics.stdev(pts), 1)
+    assert after["std_dev"] != before["std_dev"]
@@ -0,0 +1,42 @@
+"""
+Tests for concurrent season analysis against a latency-injecting stub
+"""
+
+import src.ai_service
+from src.ai_service import AIService
+from src.app import app, data
+from src.config import Config
+from tests.openai_stub import OpenAIStub
+
+LATENCY = 0.2
+
+
+def _first_line(payload):
+    return payload["messages"][-1]["content"].split("\n")[0]
+
+
+def test_season_analysis_runs_game_prompts_concurrently(monkeypatch):
+    monkeypatch.setattr(Config, "AI_MAX_CONCURRENCY", 4)
+
+    with OpenAIStub(latency=LATENCY, reply=_first_line) as stub:
+        ai = AIService()
+        ai.api_key = "test-key"
+        ai.api_url = stub.url
+        monkeypatch.setattr(src.ai_service, "ai_service", ai)
+
+        with app.test_client() as client:
+            response = client.get("/api/season-analysis?force=true")
+
+    assert response.status_code == 200
+    result = response.get_json()
+    calls = len(data.games) + 1
+    assert len(stub.requests) == calls
+    # Game prompts overlapped upstream, up to the configured limit
+    assert 1 < stub.max_inflight <= 4
+
+    # Per-game results come back in game order, each matched to its prompt
+    ids = sorted(g["gameId"] for g in data.games)
+    assert [g["game"] for g in result["per_game_analysis"]] == ids
+    for entry in result["per_game_analysis"]:
+        assert entry["analysis"].startswith(f"Game {entry['game']}:")
+    assert result["season_summary"].startswith("Season:")
@@ -0,0 +1,72 @@
+"""
+Tests for the player similarity index and /api/players/<name>/similar
+"""
+
+import numpy as np
+import pytest
+
+from src.app import app
+from src.similarity import SIMILARITY_FEATURES, SimilarityIndex
+
+
+def _league(n, seed=11):
+    rng = np.random.default_rng(seed)
+    advanced = {}
+    for i in range(n):
+        player = {}
+        for section, stat in SIMILARITY_FEATURES:
+            player.setdefault(section, {})[stat] = float(rng.normal(10, 4))
+        advanced[f"P{i}"] = player
+    return advanced
+
+
+def test_similar_matches_pairwise_scan():
+    advanced = _league(300)
+    index = SimilarityIndex(advanced)
+    z = index.z
+    assert np.allclose(z.mean(axis=0), 0)
+    assert np.allclose(z.std(axis=0), 1)
+
+    names = ["P0", "P42", "P299"]
+    cosine = index.similar(names, k=5)
+    euclidean = index.similar(names, k=5, metric="euclidean")
+    for name in names:
+        a = z[index.names.index(name)]
+        others = [(other, z[i]) for i, other in enumerate(index.names) if other != name]
+        by_cos = sorted(
+            others,
+            key=lambda o: -a @ o[1] / (np.linalg.norm(a) * np.linalg.norm(o[1])),
+        )
+        by_dist = sorted(others, key=lambda o: np.linalg.norm(a - o[1]))
+        assert [m["name"] for m in cosine[name]] == [o for o, _ in by_cos[:5]]
+        assert [m["name"] for m in euclidean[name]] == [o for o, _ in by_dist[:5]]
+        assert euclidean[name][0]["distance"] == pytest.approx(
+            np.linalg.norm(a - by_dist[0][1]), abs=1e-3
+        )
+
+
+def test_constant_features_and_small_indexes():
+    advanced = _league(3)
+    for player in advanced.values():
+        player["discipline"]["fpg"] = 2.0
+    index = SimilarityIndex(advanced)
+    assert not index.z[:, -1].any()
+    assert len(index.similar(["P0"], k=10)["P0"]) == 2
+    with pytest.raises(ValueError):
+        index.similar(["P0"], metric="manhattan")
+
+
+def test_similar_players_endpoint():
+    with app.test_client() as client:
+        response = client.get("/api/players/H Lomber/similar?k=3&metric=euclidean")
+        missing = client.get("/api/players/Nobody/similar")
+        bad = client.get("/api/players/H Lomber/similar?metric=manhattan")
+
+    body = response.get_json()
+    assert body["player"] == "H Lomber"
+    assert len(body["similar"]) == 3
+    assert "H Lomber" not in [m["name"] for m in body["similar"]]
+    distances = [m["distance"] for m in body["similar"]]
+    assert distances == sorted(distances)
+    assert missing.status_code == 404
+    assert bad.status_code == 400
@@ -0,0 +1,171 @@
+"""
+Tests for the split engine, the split cube and the /api/splits endpoints
+"""
+
+from datetime import date
+from itertools import combinations
+
+from src.app import app, data
+from src.records import TEAM_STAT_FIELDS
+from src.splits import (
+    CUBE_DIMENSIONS,
+    SplitCube,
+    SplitIndex,
+    game_dimensions,
+    game_order_key,
+    margin_bucket,
+)
+
+
+def _brute_team(games, field):
+    if field == "games":
+        return len(games)
+    if field == "wins":
+        return sum(g.get("result") == "W" for g in games)
+    if field in TEAM_STAT_FIELDS:
+        return sum(g.get("team_stats", {}).get(field, 0) for g in games)
+    return sum(g.get(field, 0) for g in games)
+
+
+def test_range_totals_match_brute_force_sums():
+    ordered = sorted(data.games, key=game_order_key)
+    splits = SplitIndex(data.games)
+    assert [g["gameId"] for g in splits.games] == [g["gameId"] for g in ordered]
+
+    for i in range(len(ordered) + 1):
+        for j in range(i, len(ordered) + 1):
+            totals = splits.team_totals(i, j)
+            for field in ("games", "wins", "vc_score", "opp_score", "fg", "fta"):
+                assert totals[field] == _brute_team(ordered[i:j], field)
+
+            rows = [
+                row
+                for g in ordered[i:j]
+                for row in g.get("player_stats", [])
+                if row["name"] == "H Lomber"
+            ]
+            player = splits.player_totals("H Lomber", i, j)
+            assert player["games"] == len(rows)
+            assert player["pts"] == sum(row.get("pts", 0) for row in rows)
+            assert player["fg3_made"] == sum(row.get("fg3_made", 0) for row in rows)
+
+
+def test_bounds_combine_games_dates_and_counts():
+    games = [
+        {"gameId": 1, "date": "Dec 16, 2025", "result": "W"},
+        {"gameId": 2, "date": "Dec 5, 2025", "result": "L"},
+        {"gameId": 3, "date": "Jan 3, 2026", "result": "W"},
+        {"gameId": 4, "date": "Jan 9, 2026", "result": "W"},
+    ]
+    splits = SplitIndex(games)
+    assert [g["gameId"] for g in splits.games] == [2, 1, 3, 4]
+
+    assert splits.bounds() == (0, 4)
+    assert splits.bounds(from_game=1, to_game=3) == (1, 3)
+    assert splits.bounds(start=date(2025, 12, 16), end=date(2026, 1, 3)) == (1, 3)
+    assert splits.bounds(start=date(2025, 12, 17)) == (2, 4)
+    assert splits.bounds(last=2) == (2, 4)
+    assert splits.bounds(from_game=1, first=1) == (1, 2)
+    assert splits.bounds(from_game=4, to_game=2) == (3, 3)
+    assert splits.team_split(3, 3)["per_game"]["vc_score"] == 0.0
+    assert splits.team_split(0, 2)["record"] == "1-1"
+
+
+def test_splits_endpoint():
+    with app.test_client() as client:
+        response = client.get("/api/splits?last=5")
+        player = client.get("/api/splits?from=2026-01-01&player=H%20Lomber")
+        unknown = client.get("/api/splits?from_game=999")
+        bad_date = client.get("/api/splits?from=yesterday")
+        missing = client.get("/api/splits?player=Nobody")
+        not_int = client.get("/api/splits?first=abc")
+        opponent = client.get("/api/splits?opponent=Nobody")
+
+    body = response.get_json()
+    assert body["range"]["games"] == 5
+    assert body["team"]["games"] == 5
+    last_five = sorted(data.games, key=game_order_key)[-5:]
+    assert body["range"]["to"]["gameId"] == last_five[-1]["gameId"]
+    assert body["team"]["totals"]["vc_score"] == sum(g["vc_score"] for g in last_five)
+
+    assert list(player.get_json()["players"]) == ["H Lomber"]
+    assert unknown.status_code == 400
+    assert bad_date.status_code == 400
+    assert missing.status_code == 404
+    assert not_int.status_code == 400
+    assert not_int.get_json()["error"] == "first must be an integer"
+    assert opponent.status_code == 400
+
+
+def test_comprehensive_insights_follow_a_reload(reload_stats):
+    def insights():
+        with app.test_client() as client:
+            return client.get("/api/comprehensive-insights").get_json()
+
+    before = insights()["team_trends"]["recent_performance"]["avg_score"]
+    last = sorted(data.games, key=game_order_key)[-1]["gameId"]
+
+    def add_points(stats):
+        for game in stats["games"]:
+            if game["gameId"] == last:
+                game["vc_score"] += 50
+
+    reload_stats(add_points)
+    after = insights()["team_trends"]["recent_performance"]["avg_score"]
+    assert after == round(before + 10, 1)
+
+
+def test_margin_buckets():
+    assert [margin_bucket(m) for m in (0, -5, 6, -10, 11, 20, -21, 40)] == [
+        "0-5",
+        "0-5",
+        "6-10",
+        "6-10",
+        "11-20",
+        "11-20",
+        "21+",
+        "21+",
+    ]
+
+
+def test_cube_cells_match_filtered_scans():
+    cube = SplitCube(data.games)
+    for size in range(3):
+        for by in combinations(CUBE_DIMENSIONS, size):
+            cells = cube.query(by)
+            assert sum(cell["team"]["games"] for cell in cells) == len(data.games)
+            for cell in cells:
+                games = [
+                    g
+                    for g in data.games
+                    if all(game_dimensions(g)[d] == v for d, v in cell["key"].items())
+                ]
+                for field in ("games", "wins", "vc_score", "to", "fga"):
+                    assert cell["team"]["totals"][field] == _brute_team(games, field)
+                points = sum(
+                    row.get("pts", 0)
+                    for g in games
+                    for row in g.get("player_stats", [])
+                    if row["name"] == "H Lomber"
+                )
+                lomber = cell["players"].get("H Lomber")
+                assert (lomber["totals"]["pts"] if lomber else 0) == points
+
+    # Filters select cells of the finer group-by without regrouping
+    home = cube.query(["result"], {"location": "home"})
+    home_games = [g for g in data.games if g["location"] == "home"]
+    assert sum(cell["team"]["games"] for cell in home) == len(home_games)
+    assert cube.query(filters={"opponent": "Nobody"}) == []
+
+
+def test_splits_cube_endpoint():
+    with app.test_client() as client:
+        response = client.get("/api/splits/cube?by=location&result=W&player=H Lomber")
+        bad = client.get("/api/splits/cube?by=weather")
+
+    body = response.get_json()
+    assert body["filters"] == {"result": "W"}
+    wins = [g for g in data.games if g["result"] == "W"]
+    assert sum(cell["team"]["totals"]["wins"] for cell in body["cells"]) == len(wins)
+    assert all(list(cell["players"]) == ["H Lomber"] for cell in body["cells"])
+    assert bad.status_code == 400
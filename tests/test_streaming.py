@@ -0,0 +1,85 @@
+"""
+Tests for streamed AI replies and the Server-Sent Events endpoints
+"""
+
+import json
+import time
+
+import src.ai_service
+from src.ai_service import AIService
+from src.app import app
+from tests.openai_stub import OpenAIStub
+
+REPLY = "Vegas shot 46 percent from the field over the last five games"
+CHUNK_DELAY = 0.05
+
+
+def _service(stub):
+    ai = AIService()
+    ai.api_key = "test-key"
+    ai.api_url = stub.url
+    return ai
+
+
+def _events(body):
+    """Parse an SSE body into (event, data) pairs"""
+    events = []
+    for block in body.strip().split("\n\n"):
+        event, data = "message", None
+        for line in block.split("\n"):
+            if line.startswith("event: "):
+                event = line[7:]
+            elif line.startswith("data: "):
+                data = json.loads(line[6:])
+        events.append((event, data))
+    return events
+
+
+def test_stream_yields_tokens_before_the_reply_completes():
+    with OpenAIStub(reply=lambda payload: REPLY, chunk_delay=CHUNK_DELAY) as stub:
+        ai = _service(stub)
+        start = time.perf_counter()
+        deltas = ai.stream_api("system", "question")
+        first = next(deltas)
+        first_token = time.perf_counter() - start
+        rest = list(deltas)
+        total = time.perf_counter() - start
+
+        assert stub.requests[0]["payload"]["stream"] is True
+        assert first + "".join(rest) == REPLY
+        assert len(rest) == len(REPLY.split()) - 1
+        assert first_token < total / 2
+
+        # The finished stream is cached like a normal call
+        assert ai.call_api("system", "question") == REPLY
+        assert list(ai.stream_api("system", "question")) == [REPLY]
+        assert len(stub.requests) == 1
+
+
+def test_chat_stream_endpoint_relays_deltas(monkeypatch):
+    with OpenAIStub(reply=lambda payload: REPLY) as stub:
+        monkeypatch.setattr(src.ai_service, "ai_service", _service(stub))
+        with app.test_client() as client:
+            response = client.post(
+                "/api/ai/chat?stream=true", json={"message": "How are we shooting?"}
+            )
+            body = response.get_data(as_text=True)
+
+    assert response.status_code == 200
+    assert response.mimetype == "text/event-stream"
+    events = _events(body)
+    assert events[-1] == ("done", {})
+    assert "".join(data["delta"] for _, data in events[:-1]) == REPLY
+
+
+def test_analyze_stream_reports_upstream_errors(monkeypatch):
+    with OpenAIStub() as stub:
+        stub.enqueue(401)
+        monkeypatch.setattr(src.ai_service, "ai_service", _service(stub))
+        with app.test_client() as client:
+            response = client.post(
+                "/api/ai/analyze?stream=true", json={"query": "Who should start?"}
+            )
+            body = response.get_data(as_text=True)
+
+    assert _events(body) == [("error", {"error": "AI service authentication error"})]
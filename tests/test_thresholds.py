@@ -0,0 +1,69 @@
+"""
+Tests for win/loss threshold discovery and /api/advanced/thresholds
+"""
+
+import random
+
+from src.advanced_stats import AdvancedStatsCalculator, _best_cut
+from src.app import app
+
+
+def _brute_best_impurity(samples):
+    """Weighted Gini impurity of the best cut, trying every cut directly"""
+    best = None
+    for cut in sorted({value for value, _ in samples})[:-1]:
+        sides = [
+            [won for value, won in samples if value <= cut],
+            [won for value, won in samples if value > cut],
+        ]
+        score = sum(
+            len(s) - (sum(s) ** 2 + (len(s) - sum(s)) ** 2) / len(s) for s in sides
+        )
+        best = score if best is None else min(best, score)
+    return best
+
+
+def test_sweep_matches_brute_force():
+    rng = random.Random(3)
+    for _ in range(200):
+        samples = [
+            (rng.randint(5, 25), rng.random() < 0.6) for _ in range(rng.randint(2, 30))
+        ]
+        wins = sum(won for _, won in samples)
+        result = _best_cut(samples)
+        if wins in (0, len(samples)) or len({v for v, _ in samples}) == 1:
+            assert result is None
+            continue
+        n = len(samples)
+        parent = n - (wins**2 + (n - wins) ** 2) / n
+        assert result["gain"] == round((parent - _brute_best_impurity(samples)) / n, 4)
+        assert result["win_pct"] >= result["other_win_pct"]
+
+
+def test_thresholds_describe_the_better_side():
+    games = [
+        {"result": r, "team_stats": {"to": to, "fg": 20, "fga": 40}}
+        for r, to in [("W", 8), ("W", 10), ("W", 11), ("L", 15), ("L", 18), ("W", 16)]
+    ]
+    calc = AdvancedStatsCalculator({"games": games})
+    by_stat = {t["stat"]: t for t in calc.calculate_stat_thresholds()}
+    assert by_stat["to"]["rule"] == "≤"
+    assert by_stat["to"]["cut"] == 11
+    assert by_stat["to"]["record"] == "3-0"
+    assert by_stat["to"]["other_record"] == "1-2"
+    # Constant stats cannot separate anything
+    assert "fg" not in by_stat
+    assert "Record with TO ≤ 11: 3-0 (1-2 otherwise)" in calc.generate_auto_insights()
+
+
+def test_thresholds_endpoint():
+    with app.test_client() as client:
+        thresholds = client.get("/api/advanced/thresholds").get_json()["thresholds"]
+        insights = client.get("/api/advanced/insights").get_json()["insights"]
+
+    gains = [t["gain"] for t in thresholds]
+    assert gains == sorted(gains, reverse=True)
+    top = thresholds[0]
+    assert any(
+        i.startswith(f"Record with {top['label']} {top['rule']}") for i in insights
+    )
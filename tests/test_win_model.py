@@ -0,0 +1,84 @@
+"""
+Tests for the logistic win-probability model and /api/advanced/win-model
+"""
+
+import time
+
+import numpy as np
+
+from src.app import app, data
+from src.win_model import FEATURES, _sigmoid, build_win_model, fit_logistic
+
+
+def test_fit_recovers_coefficients_and_scales():
+    rng = np.random.default_rng(4)
+    true_beta = np.array([0.5, 1.5, -2.0, 0.0, 0.7])
+    X = rng.normal(size=(50000, 4))
+    y = (rng.random(50000) < _sigmoid(true_beta[0] + X @ true_beta[1:])).astype(float)
+
+    start = time.perf_counter()
+    beta, steps = fit_logistic(X, y, l2=1.0)
+    # Generous ceiling: guards against a per-game Python loop, not a benchmark
+    assert time.perf_counter() - start < 5.0
+    assert steps < 20
+    assert np.allclose(beta, true_beta, atol=0.06)
+
+    # Stationary point of the penalized log-likelihood
+    p = _sigmoid(beta[0] + X @ beta[1:])
+    gradient = np.concatenate([[np.sum(y - p)], X.T @ (y - p) - 1.0 * beta[1:]])
+    assert np.abs(gradient).max() < 1e-6
+
+
+def test_separable_season_keeps_finite_coefficients():
+    games = [
+        {
+            "gameId": i,
+            "result": "W" if fg >= 20 else "L",
+            "team_stats": {
+                "fg": fg,
+                "fga": 50,
+                "fg3": 5,
+                "fg3a": 15,
+                "fta": 10,
+                "to": 12,
+                "oreb": 8,
+                "dreb": 20,
+                "asst": 12,
+                "stl": 6,
+            },
+        }
+        for i, fg in enumerate([14, 16, 18, 21, 22, 24, 25, 27])
+    ]
+    model = build_win_model(games)
+    assert model["training"]["accuracy"] == 100.0
+    assert all(np.isfinite(c["per_std"]) for c in model["coefficients"].values())
+    assert model["coefficients"]["fg_pct"]["per_std"] > 0
+    assert build_win_model([g for g in games if g["result"] == "W"]) is None
+
+
+def test_games_without_threes_are_imputed_not_dropped():
+    games = [
+        {
+            "gameId": i,
+            "result": "W" if i % 2 else "L",
+            "team_stats": {"fg": 20 + i, "fga": 50, "fg3": fg3, "fg3a": fg3a},
+        }
+        for i, (fg3, fg3a) in enumerate([(4, 10), (0, 0), (6, 12), (3, 10)])
+    ]
+    model = build_win_model(games)
+    assert model["training"]["games"] == 4
+    assert model["training"]["imputed_games"] == 1
+    assert [g["imputed"] for g in model["games"]] == [[], ["fg3_pct"], [], []]
+    assert model["coefficients"]["fg3_pct"]["mean"] == 40.0
+
+
+def test_win_model_endpoint():
+    with app.test_client() as client:
+        body = client.get("/api/advanced/win-model").get_json()
+
+    assert body["features"] == [name for name, _ in FEATURES]
+    assert body["training"]["games"] == len(body["games"])
+    assert body["training"]["games"] == sum(
+        g["result"] in ("W", "L") for g in data.games
+    )
+    assert all(0 <= g["win_probability"] <= 1 for g in body["games"])